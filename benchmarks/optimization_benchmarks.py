@@ -0,0 +1,164 @@
+"""Times optimization and simulation on seeded synthetic portfolios.
+
+    python -m benchmarks.optimization_benchmarks --sizes small medium --output out.json
+
+Runs fully in memory, no Postgres or Redis needed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Sequence
+
+from benchmarks.synthetic_portfolio import (
+    SIZES,
+    PortfolioSize,
+    SyntheticPortfolio,
+    SyntheticPortfolioGenerator,
+)
+from smartschedule.optimization.optimization_facade import OptimizationFacade
+from smartschedule.optimization.solver_engine import SolverEngine
+from smartschedule.simulation.simulation_facade import SimulationFacade
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    benchmark: str
+    size: str
+    projects: int
+    capacities: int
+    engine: str
+    repeats: int
+    min_seconds: float
+    median_seconds: float
+    profit: float
+
+
+def _measure(
+    benchmark: str,
+    size: PortfolioSize,
+    portfolio: SyntheticPortfolio,
+    engine: SolverEngine,
+    repeats: int,
+    run: Callable[[], float],
+) -> BenchmarkResult:
+    timings = []
+    profit = 0.0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        profit = run()
+        timings.append(time.perf_counter() - start)
+    return BenchmarkResult(
+        benchmark,
+        size.name,
+        len(portfolio.projects),
+        len(portfolio.capabilities.capabilities),
+        str(engine),
+        repeats,
+        min(timings),
+        statistics.median(timings),
+        profit,
+    )
+
+
+def run_benchmarks(
+    sizes: Sequence[PortfolioSize],
+    engines: Sequence[SolverEngine],
+    seed: int,
+    repeats: int,
+) -> list[BenchmarkResult]:
+    optimization_facade = OptimizationFacade()
+    simulation_facade = SimulationFacade(optimization_facade)
+    results = []
+    for size in sizes:
+        portfolio = SyntheticPortfolioGenerator(seed).generate(size)
+        items = portfolio.to_items()
+        total_capacity = portfolio.to_total_capacity()
+        candidate = portfolio.candidates[0]
+        for engine in engines:
+            results.append(
+                _measure(
+                    "calculate",
+                    size,
+                    portfolio,
+                    engine,
+                    repeats,
+                    lambda: (
+                        optimization_facade.calculate(
+                            items, total_capacity, engine=engine
+                        ).profit
+                    ),
+                )
+            )
+            results.append(
+                _measure(
+                    "what_is_the_optimal_setup",
+                    size,
+                    portfolio,
+                    engine,
+                    repeats,
+                    lambda: (
+                        simulation_facade.what_is_the_optimal_setup(
+                            portfolio.projects, portfolio.capabilities, engine
+                        ).profit
+                    ),
+                )
+            )
+            results.append(
+                _measure(
+                    "profit_after_buying_new_capability",
+                    size,
+                    portfolio,
+                    engine,
+                    repeats,
+                    lambda: simulation_facade.profit_after_buying_new_capability(
+                        portfolio.projects, portfolio.capabilities, candidate, engine
+                    ),
+                )
+            )
+    return results
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=["small"])
+    parser.add_argument(
+        "--engines",
+        nargs="+",
+        choices=[str(engine) for engine in SolverEngine],
+        default=[str(SolverEngine.PURE_PYTHON)],
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", help="file to write JSON results to")
+    arguments = parser.parse_args(argv)
+
+    results = run_benchmarks(
+        [SIZES[name] for name in arguments.sizes],
+        [SolverEngine(engine) for engine in arguments.engines],
+        arguments.seed,
+        arguments.repeats,
+    )
+    report = json.dumps(
+        {
+            "seed": arguments.seed,
+            "python": platform.python_version(),
+            "results": [asdict(result) for result in results],
+        },
+        indent=2,
+    )
+    if arguments.output:
+        with open(arguments.output, "w") as output:
+            output.write(report)
+    else:
+        sys.stdout.write(report + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import UUID
+
+from smartschedule.optimization.item import Item
+from smartschedule.optimization.total_capacity import TotalCapacity
+from smartschedule.optimization.total_weight import TotalWeight
+from smartschedule.shared.capability.capability import Capability
+from smartschedule.shared.capability_selector import CapabilitySelector
+from smartschedule.shared.timeslot.time_slot import TimeSlot
+from smartschedule.simulation.additional_priced_capability import (
+    AdditionalPricedCapability,
+)
+from smartschedule.simulation.available_resource_capability import (
+    AvailableResourceCapability,
+)
+from smartschedule.simulation.demand import Demand
+from smartschedule.simulation.demands import Demands
+from smartschedule.simulation.project_id import ProjectId
+from smartschedule.simulation.simulated_capabilities import SimulatedCapabilities
+from smartschedule.simulation.simulated_project import SimulatedProject
+
+SKILLS = ["JAVA", "PYTHON", "KOTLIN", "RUST", "GO", "SQL", "REACT", "DEVOPS"]
+PERMISSIONS = ["ADMIN", "COURT", "MEDICAL", "SECURITY"]
+ASSETS = ["EXCAVATOR", "CRANE", "TRUCK", "SERVER-RACK"]
+HORIZON_START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass(frozen=True)
+class PortfolioSize:
+    name: str
+    projects: int
+    resources: int
+    weeks: int
+    max_demands_per_project: int = 4
+    max_capabilities_per_resource: int = 3
+
+
+SIZES = {
+    size.name: size
+    for size in [
+        PortfolioSize("tiny", projects=10, resources=5, weeks=2),
+        PortfolioSize("small", projects=50, resources=20, weeks=4),
+        PortfolioSize("medium", projects=200, resources=60, weeks=8),
+        PortfolioSize("large", projects=800, resources=150, weeks=13),
+    ]
+}
+
+
+@dataclass(frozen=True)
+class SyntheticPortfolio:
+    projects: list[SimulatedProject]
+    capabilities: SimulatedCapabilities
+    candidates: list[AdditionalPricedCapability]
+
+    def to_items(self) -> list[Item[AvailableResourceCapability]]:
+        return [
+            Item(
+                str(project.project_id),
+                float(project.value),
+                TotalWeight(list(project.missing_demands.all)),
+            )
+            for project in self.projects
+        ]
+
+    def to_total_capacity(self) -> TotalCapacity:
+        return TotalCapacity(list(self.capabilities.capabilities))
+
+
+class SyntheticPortfolioGenerator:
+    def __init__(self, seed: int) -> None:
+        self._random = random.Random(seed)
+
+    def generate(self, size: PortfolioSize, candidates: int = 10) -> SyntheticPortfolio:
+        return SyntheticPortfolio(
+            [self._project(size) for _ in range(size.projects)],
+            SimulatedCapabilities(
+                [
+                    capability
+                    for _ in range(size.resources)
+                    for capability in self._resource(size)
+                ]
+            ),
+            [self._candidate(size) for _ in range(candidates)],
+        )
+
+    def _project(self, size: PortfolioSize) -> SimulatedProject:
+        demands = [
+            Demand(self._capability(), self._day_within(size))
+            for _ in range(self._random.randint(1, size.max_demands_per_project))
+        ]
+        value = Decimal(round(self._random.lognormvariate(9, 1)))
+        return SimulatedProject(
+            ProjectId(self._uuid()), lambda: value, Demands.of(demands)
+        )
+
+    def _resource(self, size: PortfolioSize) -> list[AvailableResourceCapability]:
+        resource_id = self._uuid()
+        brings = {
+            self._capability()
+            for _ in range(self._random.randint(1, size.max_capabilities_per_resource))
+        }
+        if self._random.random() < 0.3:
+            selector = CapabilitySelector.can_perform_all_at_the_time(brings)
+        else:
+            selector = CapabilitySelector.can_perform_one_of(brings)
+        # resources are available in weekly slots, with some weeks off
+        return [
+            AvailableResourceCapability(resource_id, selector, self._week(week))
+            for week in range(size.weeks)
+            if self._random.random() < 0.8
+        ]
+
+    def _candidate(self, size: PortfolioSize) -> AdditionalPricedCapability:
+        return AdditionalPricedCapability(
+            Decimal(self._random.randint(100, 5_000)),
+            AvailableResourceCapability.with_capability(
+                self._uuid(),
+                self._capability(),
+                self._week(self._random.randrange(size.weeks)),
+            ),
+        )
+
+    def _capability(self) -> Capability:
+        kind = self._random.choices(["skill", "permission", "asset"], [6, 2, 2])[0]
+        if kind == "skill":
+            return Capability.skill(self._random.choice(SKILLS))
+        if kind == "permission":
+            return Capability.permission(self._random.choice(PERMISSIONS))
+        return Capability.asset(self._random.choice(ASSETS))
+
+    def _week(self, week: int) -> TimeSlot:
+        from_ = HORIZON_START + timedelta(weeks=week)
+        return TimeSlot(from_, from_ + timedelta(weeks=1))
+
+    def _day_within(self, size: PortfolioSize) -> TimeSlot:
+        from_ = HORIZON_START + timedelta(days=self._random.randrange(size.weeks * 7))
+        return TimeSlot(from_, from_ + timedelta(days=1))
+
+    def _uuid(self) -> UUID:
+        return UUID(int=self._random.getrandbits(128))
@@ -36,9 +36,13 @@ class CapabilityScheduler:
         allocatable_resource_ids = self._create_allocatable_resources(
             resource_id, capabilities, time_slot
         )
-        for allocatable_resource_id in allocatable_resource_ids:
-            availability_id = allocatable_resource_id.to_availability_resource_id()
-            self._availability_facade.create_resource_slots(availability_id, time_slot)
+        self._availability_facade.create_resource_slots_in_bulk(
+            (
+                allocatable_resource_id.to_availability_resource_id(),
+                time_slot,
+            )
+            for allocatable_resource_id in allocatable_resource_ids
+        )
         return allocatable_resource_ids
 
     def schedule_multiple_resources_for_period(
@@ -54,9 +58,10 @@ class CapabilityScheduler:
             for resource in resources
         ]
         self._repository.add_all(allocatable_capabilities)
-        for allocatable_capability in allocatable_capabilities:
-            resource_id = allocatable_capability.id.to_availability_resource_id()
-            self._availability_facade.create_resource_slots(resource_id, time_slot)
+        self._availability_facade.create_resource_slots_in_bulk(
+            (allocatable_capability.id.to_availability_resource_id(), time_slot)
+            for allocatable_capability in allocatable_capabilities
+        )
 
         return [
             allocatable_capability.id
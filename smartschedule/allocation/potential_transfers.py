@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import functools
 from dataclasses import dataclass
 
 from smartschedule.allocation.allocated_capability import AllocatedCapability
@@ -90,12 +89,10 @@ class PotentialTransfers:
 
     def to_simulated_projects(self) -> list[SimulatedProject]:
         return [
-            SimulatedProject(
-                project_id=ProjectId(project_id.id),
-                value_getter=functools.partial(
-                    lambda value: value, self.earnings[project_id].to_decimal()
-                ),
-                missing_demands=self._missing_demands(project_id),
+            SimulatedProject.with_fixed_value(
+                ProjectId(project_id.id),
+                self.earnings[project_id].to_decimal(),
+                self._missing_demands(project_id),
             )
             for project_id in self.summary.project_allocations.keys()
         ]
@@ -51,18 +51,18 @@ class PotentialTransfersService:
         capability_to_move: AllocatableCapabilitySummary,
         time_slot: TimeSlot,
     ) -> float:
-        result_before = self._simulation_facade.what_is_the_optimal_setup(
-            transfers.to_simulated_projects(), SimulatedCapabilities.none()
-        )
+        # transfers change the summary in place, so projects before are read first
+        projects_before = transfers.to_simulated_projects()
         after_transfer = transfers.transfer_capabilities(
             project_to=project_to,
             capability_to_transfer=capability_to_move,
             for_slot=time_slot,
         )
-        result_after = self._simulation_facade.what_is_the_optimal_setup(
-            after_transfer.to_simulated_projects(), SimulatedCapabilities.none()
+        return self._simulation_facade.profit_after_changing_projects(
+            projects_before,
+            after_transfer.to_simulated_projects(),
+            SimulatedCapabilities.none(),
         )
-        return result_after.profit - result_before.profit
 
     def check_potential_transfer(
         self,
@@ -72,13 +72,12 @@ class PotentialTransfersService:
         capability: AllocatedCapability,
         for_slot: TimeSlot,
     ) -> float:
-        result_before = self._simulation_facade.what_is_the_optimal_setup(
-            transfers.to_simulated_projects(), SimulatedCapabilities.none()
-        )
+        projects_before = transfers.to_simulated_projects()
         after_transfer = transfers.transfer(
             project_from, project_to, capability, for_slot
         )
-        result_after = self._simulation_facade.what_is_the_optimal_setup(
-            after_transfer.to_simulated_projects(), SimulatedCapabilities.none()
+        return self._simulation_facade.profit_after_changing_projects(
+            projects_before,
+            after_transfer.to_simulated_projects(),
+            SimulatedCapabilities.none(),
         )
-        return result_after.profit - result_before.profit
@@ -1,5 +1,8 @@
+import functools
 from datetime import datetime
+from typing import Iterable
 
+from smartschedule.availability.availability_index import AvailabilityIndex
 from smartschedule.availability.calendar import Calendar
 from smartschedule.availability.calendars import Calendars
 from smartschedule.availability.owner import Owner
@@ -16,6 +19,7 @@ from smartschedule.availability.resource_id import ResourceId
 from smartschedule.availability.resource_taken_over import ResourceTakenOver
 from smartschedule.availability.segment import segments
 from smartschedule.availability.segment.segment_in_minutes import SegmentInMinutes
+from smartschedule.availability.session_changes import SessionChanges
 from smartschedule.shared.events_publisher import EventsPublisher
 from smartschedule.shared.timeslot.time_slot import TimeSlot
 
@@ -26,21 +30,61 @@ class AvailabilityFacade:
         repository: ResourceAvailabilityRepository,
         read_model: ResourceAvailabilityReadModel,
         events_publisher: EventsPublisher,
+        index: AvailabilityIndex,
+        changes: SessionChanges,
     ) -> None:
         self._repository = repository
         self._read_model = read_model
         self._events_publisher = events_publisher
+        self._segments: dict[ResourceId, SegmentInMinutes] = {}
+        self._index = index
+        self._changes = changes
+        changes.on_end(index.forget)
 
     def create_resource_slots(
         self,
         resource_id: ResourceId,
         time_slot: TimeSlot,
         parent_id: ResourceId | None = None,
+        segment: SegmentInMinutes | None = None,
     ) -> None:
-        grouped_availability = ResourceGroupedAvailability.of(
-            resource_id, time_slot, parent_id
+        self.create_resource_slots_in_bulk(
+            [(resource_id, time_slot)], parent_id, segment
         )
-        self._repository.save_new(grouped_availability)
+
+    def create_resource_slots_in_bulk(
+        self,
+        resource_slots: Iterable[tuple[ResourceId, TimeSlot]],
+        parent_id: ResourceId | None = None,
+        segment: SegmentInMinutes | None = None,
+    ) -> None:
+        resource_slots = list(resource_slots)
+        if segment is not None:
+            resource_ids = {resource_id for resource_id, _ in resource_slots}
+            if parent_id is not None:
+                resource_ids.add(parent_id)
+            self._repository.save_segments(resource_ids, segment)
+            for resource_id in resource_ids:
+                self._segments[resource_id] = segment
+
+        segments_of = self._segments_of(
+            {resource_id for resource_id, _ in resource_slots}
+        )
+        by_segment: dict[SegmentInMinutes, list[tuple[ResourceId, TimeSlot]]] = {}
+        for resource_id, time_slot in resource_slots:
+            resource_segment = segments_of[resource_id]
+            by_segment.setdefault(resource_segment, []).append(
+                (
+                    resource_id,
+                    segments.normalize_to_segment_boundaries(
+                        time_slot, resource_segment
+                    ),
+                )
+            )
+        for resource_segment, normalized in by_segment.items():
+            self._repository.save_new_slots(normalized, parent_id, resource_segment)
+            for resource_id, time_slot in normalized:
+                self._changes.add(resource_id, time_slot)
 
     def block(
         self, resource_id: ResourceId, time_slot: TimeSlot, requester: Owner
@@ -54,7 +98,7 @@ class AvailabilityFacade:
 
         result = to_block.block(requester)
         if result:
-            return self._repository.save_checking_version(to_block)
+            return self._save_checking_version(to_block)
         else:
             return False
 
@@ -66,7 +110,7 @@ class AvailabilityFacade:
             return False
         result = to_release.release(requester)
         if result:
-            return self._repository.save_checking_version(to_release)
+            return self._save_checking_version(to_release)
         else:
             return False
 
@@ -79,7 +123,7 @@ class AvailabilityFacade:
 
         previous_owners = to_disable.owners
         if result := to_disable.disable(requester):
-            if result := self._repository.save_checking_version(to_disable):
+            if result := self._save_checking_version(to_disable):
                 event = ResourceTakenOver(
                     resource_id, previous_owners, time_slot, datetime.now()
                 )
@@ -87,15 +131,35 @@ class AvailabilityFacade:
 
         return result
 
+    def _save_checking_version(self, grouped: ResourceGroupedAvailability) -> bool:
+        changed_slots = _changed_slots(grouped)
+        if saved := self._repository.save_checking_version(grouped):
+            for resource_id, changed in changed_slots.items():
+                self._changes.add(resource_id, changed)
+        else:
+            # someone else changed them, what is known about them may be outdated
+            self._index.forget(
+                {
+                    resource_id: [changed]
+                    for resource_id, changed in changed_slots.items()
+                }
+            )
+            for resource_availability in grouped.resource_availabilities:
+                self._read_model.invalidate_all_of(resource_availability.resource_id)
+        return saved
+
     def block_random_available(
         self, resource_ids: set[ResourceId], within: TimeSlot, owner: Owner
     ) -> ResourceId | None:
-        normalized = segments.normalize_to_segment_boundaries(
-            within, SegmentInMinutes.default_segment()
-        )
+        segments_of = self._segments_of(resource_ids)
         grouped_availability = (
-            self._repository.load_availabilities_of_random_resources_within(
-                normalized, *resource_ids
+            self._repository.load_availabilities_of_random_resources_within_windows(
+                {
+                    resource_id: segments.normalize_to_segment_boundaries(
+                        within, segments_of[resource_id]
+                    )
+                    for resource_id in resource_ids
+                }
             )
         )
         if self._block(grouped_availability, owner):
@@ -106,42 +170,92 @@ class AvailabilityFacade:
     def _find_grouped(
         self, resource_id: ResourceId, within: TimeSlot
     ) -> ResourceGroupedAvailability:
-        normalized = segments.normalize_to_segment_boundaries(
-            within, SegmentInMinutes.default_segment()
-        )
+        normalized = self._normalized(resource_id, within)
         availabilities = self._repository.load_all_within_slot(resource_id, normalized)
         return ResourceGroupedAvailability(availabilities)
 
     def find(
         self, resource_id: ResourceId, within: TimeSlot
     ) -> ResourceGroupedAvailability:
-        normalized = segments.normalize_to_segment_boundaries(
-            within, SegmentInMinutes.default_segment()
-        )
+        normalized = self._normalized(resource_id, within)
         availabilities = self._repository.load_all_within_slot(resource_id, normalized)
         return ResourceGroupedAvailability(availabilities)
 
+    def is_entirely_available(self, resource_id: ResourceId, within: TimeSlot) -> bool:
+        segment = self._segment_of(resource_id)
+        normalized = segments.normalize_to_segment_boundaries(within, segment)
+        load = functools.partial(self._repository.load_all_within_slot, resource_id)
+        if self._changes.touches(resource_id):
+            # not committed yet, so it stays out of the shared index
+            return self._index.uncached(normalized, segment, load(normalized)).is_free(
+                normalized
+            )
+        return self._index.is_entirely_available(resource_id, normalized, segment, load)
+
+    def find_owners(self, resource_id: ResourceId, within: TimeSlot) -> set[Owner]:
+        segment = self._segment_of(resource_id)
+        normalized = segments.normalize_to_segment_boundaries(within, segment)
+        load = functools.partial(self._repository.load_all_within_slot, resource_id)
+        if self._changes.touches(resource_id):
+            return self._index.uncached(normalized, segment, load(normalized)).owners(
+                normalized
+            )
+        return self._index.owners(resource_id, normalized, segment, load)
+
     def find_by_parent_id(
         self, parent_id: ResourceId, within: TimeSlot
     ) -> ResourceGroupedAvailability:
-        normalized = segments.normalize_to_segment_boundaries(
-            within, SegmentInMinutes.default_segment()
-        )
+        normalized = self._normalized(parent_id, within)
         availabilities = self._repository.load_all_by_parent_id_within_slot(
             parent_id, normalized
         )
         return ResourceGroupedAvailability(availabilities)
 
     def load_calendar(self, resource_id: ResourceId, within: TimeSlot) -> Calendar:
-        normalized = segments.normalize_to_segment_boundaries(
-            within, SegmentInMinutes.default_segment()
-        )
+        normalized = self._normalized(resource_id, within)
         return self._read_model.load(resource_id, normalized)
 
     def load_calendars(
         self, resource_ids: set[ResourceId], within: TimeSlot
     ) -> Calendars:
-        normalized = segments.normalize_to_segment_boundaries(
-            within, SegmentInMinutes.default_segment()
+        # resources of different granularities are normalized, and loaded, apart
+        segments_of = self._segments_of(resource_ids)
+        by_window: dict[TimeSlot, set[ResourceId]] = {}
+        for resource_id in resource_ids:
+            normalized = segments.normalize_to_segment_boundaries(
+                within, segments_of[resource_id]
+            )
+            by_window.setdefault(normalized, set()).add(resource_id)
+        calendars: dict[ResourceId, Calendar] = {}
+        for normalized, resource_ids_within in by_window.items():
+            calendars.update(
+                self._read_model.load_all(resource_ids_within, normalized).calendars
+            )
+        return Calendars(calendars)
+
+    def _normalized(self, resource_id: ResourceId, within: TimeSlot) -> TimeSlot:
+        return segments.normalize_to_segment_boundaries(
+            within, self._segment_of(resource_id)
         )
-        return self._read_model.load_all(resource_ids, normalized)
+
+    def _segment_of(self, resource_id: ResourceId) -> SegmentInMinutes:
+        return self._segments_of({resource_id})[resource_id]
+
+    def _segments_of(
+        self, resource_ids: set[ResourceId]
+    ) -> dict[ResourceId, SegmentInMinutes]:
+        if missing := resource_ids - self._segments.keys():
+            self._segments.update(self._repository.load_segments(missing))
+        return {
+            resource_id: self._segments[resource_id] for resource_id in resource_ids
+        }
+
+
+def _changed_slots(grouped: ResourceGroupedAvailability) -> dict[ResourceId, TimeSlot]:
+    changed: dict[ResourceId, TimeSlot] = {}
+    for resource_availability in grouped.resource_availabilities:
+        segment = resource_availability.segment
+        if (span := changed.get(resource_availability.resource_id)) is not None:
+            segment = TimeSlot(min(span.from_, segment.from_), max(span.to, segment.to))
+        changed[resource_availability.resource_id] = segment
+    return changed
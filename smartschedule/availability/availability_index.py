@@ -0,0 +1,146 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Iterable
+
+from smartschedule.availability.invalidation_clock import InvalidationClock
+from smartschedule.availability.owner import Owner
+from smartschedule.availability.resource_availability import ResourceAvailability
+from smartschedule.availability.resource_availability_index import (
+    ResourceAvailabilityIndex,
+)
+from smartschedule.availability.resource_id import ResourceId
+from smartschedule.availability.segment.segment_in_minutes import SegmentInMinutes
+from smartschedule.availability.session_changes import Changes
+from smartschedule.shared.timeslot.time_slot import TimeSlot
+
+Loader = Callable[[TimeSlot], list[ResourceAvailability]]
+
+
+class AvailabilityIndex:
+    """Per resource indexes shared by all facades, loaded lazily.
+
+    Windows are loaded the first time they are asked about and forgotten once
+    a transaction that changed them ends. Loads which raced with such a change
+    answer the query but are not kept. Least recently used resources are
+    dropped, and so are windows which would make one resource too long.
+
+    Only transactions of this process are seen, changes committed by other
+    processes are not. So nothing is kept unless ``max_resources`` is given.
+    """
+
+    def __init__(
+        self, max_resources: int = 0, max_segments_per_resource: int = 1 << 18
+    ) -> None:
+        self._max_resources = max_resources
+        self._max_segments_per_resource = max_segments_per_resource
+        self._indexes: OrderedDict[ResourceId, ResourceAvailabilityIndex] = (
+            OrderedDict()
+        )
+        self._clock = InvalidationClock(max_resources * 4)
+        self._lock = threading.Lock()
+
+    def is_entirely_available(
+        self,
+        resource_id: ResourceId,
+        normalized: TimeSlot,
+        segment: SegmentInMinutes,
+        load: Loader,
+    ) -> bool:
+        return self._answer(
+            resource_id,
+            normalized,
+            segment,
+            load,
+            lambda index: index.is_free(normalized),
+        )
+
+    def owners(
+        self,
+        resource_id: ResourceId,
+        normalized: TimeSlot,
+        segment: SegmentInMinutes,
+        load: Loader,
+    ) -> set[Owner]:
+        return self._answer(
+            resource_id,
+            normalized,
+            segment,
+            load,
+            lambda index: index.owners(normalized),
+        )
+
+    def uncached(
+        self,
+        normalized: TimeSlot,
+        segment: SegmentInMinutes,
+        resource_availabilities: Iterable[ResourceAvailability],
+    ) -> ResourceAvailabilityIndex:
+        index = ResourceAvailabilityIndex(normalized.from_, segment.value)
+        _put(index, resource_availabilities)
+        index.mark_known(normalized)
+        return index
+
+    def forget(self, changes: Changes) -> None:
+        with self._lock:
+            for resource_id, slots in changes.items():
+                self._clock.invalidate(resource_id)
+                if (index := self._indexes.get(resource_id)) is not None:
+                    for slot in slots:
+                        index.forget(slot)
+
+    def _answer[R](
+        self,
+        resource_id: ResourceId,
+        normalized: TimeSlot,
+        segment: SegmentInMinutes,
+        load: Loader,
+        question: Callable[[ResourceAvailabilityIndex], R],
+    ) -> R:
+        if not self._max_resources:
+            return question(self.uncached(normalized, segment, load(normalized)))
+        with self._lock:
+            index = self._index_of(resource_id, normalized, segment)
+            unknown = None if index is None else index.unknown_within(normalized)
+            if index is not None and unknown is None:
+                return question(index)
+            read_at = self._clock.now()
+        if index is None or unknown is None:
+            return question(self.uncached(normalized, segment, load(normalized)))
+
+        loaded = load(unknown)
+        with self._lock:
+            if (
+                not self._clock.is_stale(resource_id, read_at)
+                and self._indexes.get(resource_id) is index
+            ):
+                _put(index, loaded)
+                index.mark_known(unknown)
+                return question(index)
+        # changed while it was loaded, the answer is read again and not kept
+        return question(self.uncached(normalized, segment, load(normalized)))
+
+    def _index_of(
+        self, resource_id: ResourceId, normalized: TimeSlot, segment: SegmentInMinutes
+    ) -> ResourceAvailabilityIndex | None:
+        index = self._indexes.get(resource_id)
+        if index is None or index.segment != segment.value:
+            index = ResourceAvailabilityIndex(normalized.from_, segment.value)
+            self._indexes[resource_id] = index
+            while len(self._indexes) > self._max_resources:
+                self._indexes.popitem(last=False)
+        self._indexes.move_to_end(resource_id)
+        if index.length_covering(normalized) > self._max_segments_per_resource:
+            return None
+        return index
+
+
+def _put(
+    index: ResourceAvailabilityIndex,
+    resource_availabilities: Iterable[ResourceAvailability],
+) -> None:
+    for resource_availability in resource_availabilities:
+        index.put(
+            resource_availability.segment,
+            resource_availability.blocked_by(),
+            resource_availability.is_disabled(),
+        )
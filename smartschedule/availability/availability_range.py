@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+
+from smartschedule.availability.blockade import Blockade
+from smartschedule.availability.resource_availability import ResourceAvailability
+from smartschedule.availability.resource_availability_id import ResourceAvailabilityId
+from smartschedule.availability.resource_id import ResourceId
+from smartschedule.availability.segment import segments
+from smartschedule.availability.segment.segment_in_minutes import SegmentInMinutes
+from smartschedule.shared.timeslot.time_slot import TimeSlot
+
+# segments of a range share its id apart from the lowest bits holding their offset
+_OFFSET_MASK = (1 << 32) - 1
+
+
+@dataclass(frozen=True)
+class AvailabilityRange:
+    """Contiguous segments sharing state, stored as one row.
+
+    Ids of the segments are derived from the id of the range and their offset
+    in it, so they stay the same between loads and when the range gets split.
+    """
+
+    id: ResourceAvailabilityId
+    resource_id: ResourceId
+    parent_id: ResourceId
+    slot: TimeSlot
+    blockade: Blockade
+    version: int = 0
+
+    def continues_with(self, other: AvailabilityRange) -> bool:
+        return (
+            self.slot.to == other.slot.from_
+            and self.resource_id == other.resource_id
+            and self.parent_id == other.parent_id
+            and self.blockade == other.blockade
+        )
+
+    def id_at(
+        self, moment: datetime, segment: SegmentInMinutes
+    ) -> ResourceAvailabilityId:
+        offset = (moment - self.slot.from_) // segment.value
+        value = self.id.id.int
+        return ResourceAvailabilityId(
+            UUID(int=(value & ~_OFFSET_MASK) | ((value + offset) & _OFFSET_MASK))
+        )
+
+    def to_resource_availability(self) -> ResourceAvailability:
+        return ResourceAvailability(
+            self.id,
+            self.resource_id,
+            self.slot,
+            self.parent_id,
+            self.blockade,
+            self.version,
+        )
+
+    def to_segments(
+        self, within: TimeSlot, segment: SegmentInMinutes
+    ) -> list[ResourceAvailability]:
+        common = self.slot.common_part_with(within)
+        if common.is_empty():
+            return []
+        return [
+            self._segment(from_, to, segment)
+            for from_, to in segments.split_to_bounds(common, segment)
+        ]
+
+    def segment_with_id(
+        self,
+        resource_availability_id: ResourceAvailabilityId,
+        segment: SegmentInMinutes,
+    ) -> ResourceAvailability | None:
+        value = resource_availability_id.id.int
+        if value & ~_OFFSET_MASK != self.id.id.int & ~_OFFSET_MASK:
+            return None
+        offset = (value - self.id.id.int) & _OFFSET_MASK
+        from_ = self.slot.from_ + offset * segment.value
+        if from_ >= self.slot.to:
+            return None
+        return self._segment(from_, min(from_ + segment.value, self.slot.to), segment)
+
+    def _segment(
+        self, from_: datetime, to: datetime, segment: SegmentInMinutes
+    ) -> ResourceAvailability:
+        return ResourceAvailability(
+            self.id_at(from_, segment),
+            self.resource_id,
+            TimeSlot(from_, to),
+            self.parent_id,
+            self.blockade,
+            self.version,
+        )
+
+
+def ids_of_ranges_holding(
+    resource_availability_id: ResourceAvailabilityId,
+) -> tuple[UUID, UUID]:
+    value = resource_availability_id.id.int
+    return UUID(int=value & ~_OFFSET_MASK), UUID(int=value | _OFFSET_MASK)
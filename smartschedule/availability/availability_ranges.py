@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import bisect
+from dataclasses import dataclass
+from datetime import datetime
+
+from smartschedule.availability.availability_range import AvailabilityRange
+from smartschedule.availability.resource_availability import ResourceAvailability
+from smartschedule.availability.segment.segment_in_minutes import SegmentInMinutes
+from smartschedule.shared.timeslot.time_slot import TimeSlot
+
+
+@dataclass(frozen=True)
+class AvailabilityRanges:
+    """Non overlapping ranges of one resource, ordered by start.
+
+    Segments handed out by ranges carry the version of the range they come from.
+    A write gives the span it changes a version higher than any range overlapping
+    it, so versions of a moment only grow and stale segments are detected, while
+    writes to disjoint parts of one range don't conflict.
+    """
+
+    ranges: list[AvailabilityRange]
+
+    @staticmethod
+    def of(resource_availabilities: list[ResourceAvailability]) -> AvailabilityRanges:
+        return AvailabilityRanges(
+            _merged(
+                [
+                    _to_range(resource_availability, resource_availability.version)
+                    for resource_availability in sorted(
+                        resource_availabilities,
+                        key=lambda resource_availability: (
+                            resource_availability.segment.from_
+                        ),
+                    )
+                ]
+            )
+        )
+
+    def to_segments(
+        self,
+        within: TimeSlot,
+        segment: SegmentInMinutes = SegmentInMinutes.default_segment(),
+    ) -> list[ResourceAvailability]:
+        return [
+            resource_availability
+            for availability_range in self.ranges
+            for resource_availability in availability_range.to_segments(within, segment)
+        ]
+
+    def is_stale(self, changed: list[ResourceAvailability]) -> bool:
+        starts = [availability_range.slot.from_ for availability_range in self.ranges]
+        for resource_availability in changed:
+            segment = resource_availability.segment
+            position = bisect.bisect_right(starts, segment.from_) - 1
+            covered_until = segment.from_
+            while covered_until < segment.to:
+                if position < 0 or position >= len(self.ranges):
+                    return True
+                availability_range = self.ranges[position]
+                if (
+                    availability_range.slot.from_ > covered_until
+                    or availability_range.slot.to <= covered_until
+                    or availability_range.version != resource_availability.version
+                ):
+                    return True
+                covered_until = availability_range.slot.to
+                position += 1
+        return False
+
+    def overwritten_with(
+        self,
+        changed: list[ResourceAvailability],
+        segment: SegmentInMinutes = SegmentInMinutes.default_segment(),
+    ) -> AvailabilityRanges:
+        changed_ranges = sorted(
+            (_to_range(resource_availability, 0) for resource_availability in changed),
+            key=lambda availability_range: availability_range.slot.from_,
+        )
+        # only the changed span gets a new version, disjoint writes don't conflict
+        version = (
+            max(
+                (
+                    availability_range.version
+                    for availability_range in self.ranges
+                    if any(
+                        _overlap(availability_range, changed_range)
+                        for changed_range in changed_ranges
+                    )
+                ),
+                default=-1,
+            )
+            + 1
+        )
+        boundaries = sorted(
+            {
+                moment
+                for availability_range in self.ranges + changed_ranges
+                for moment in (
+                    availability_range.slot.from_,
+                    availability_range.slot.to,
+                )
+            }
+        )
+        pieces = []
+        for from_, to in zip(boundaries, boundaries[1:]):
+            if (covering := _covering(changed_ranges, from_)) is not None:
+                piece_version = version
+            elif (covering := _covering(self.ranges, from_)) is not None:
+                piece_version = covering.version
+            else:
+                continue
+            pieces.append(
+                AvailabilityRange(
+                    covering.id_at(from_, segment),
+                    covering.resource_id,
+                    covering.parent_id,
+                    TimeSlot(from_, to),
+                    covering.blockade,
+                    piece_version,
+                )
+            )
+        return AvailabilityRanges(_merged(pieces, segment))
+
+
+def _to_range(
+    resource_availability: ResourceAvailability, version: int
+) -> AvailabilityRange:
+    return AvailabilityRange(
+        resource_availability.id,
+        resource_availability.resource_id,
+        resource_availability.parent_id,
+        resource_availability.segment,
+        resource_availability.blockade,
+        version,
+    )
+
+
+def _covering(
+    ordered_ranges: list[AvailabilityRange], moment: datetime
+) -> AvailabilityRange | None:
+    position = (
+        bisect.bisect_right(
+            ordered_ranges,
+            moment,
+            key=lambda availability_range: availability_range.slot.from_,
+        )
+        - 1
+    )
+    if position >= 0 and ordered_ranges[position].slot.to > moment:
+        return ordered_ranges[position]
+    return None
+
+
+def _overlap(first: AvailabilityRange, second: AvailabilityRange) -> bool:
+    return first.slot.from_ < second.slot.to and second.slot.from_ < first.slot.to
+
+
+def _merged(
+    ordered_ranges: list[AvailabilityRange], segment: SegmentInMinutes | None = None
+) -> list[AvailabilityRange]:
+    # once stored, ranges are merged only when ids of their segments stay the same
+    merged: list[AvailabilityRange] = []
+    for availability_range in ordered_ranges:
+        if (
+            merged
+            and merged[-1].continues_with(availability_range)
+            and (
+                segment is None
+                or merged[-1].id_at(availability_range.slot.from_, segment)
+                == availability_range.id
+            )
+        ):
+            last = merged.pop()
+            availability_range = AvailabilityRange(
+                last.id,
+                last.resource_id,
+                last.parent_id,
+                TimeSlot(last.slot.from_, availability_range.slot.to),
+                last.blockade,
+                max(last.version, availability_range.version),
+            )
+        merged.append(availability_range)
+    return merged
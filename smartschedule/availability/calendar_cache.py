@@ -0,0 +1,125 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from smartschedule.availability.calendar import Calendar
+from smartschedule.availability.invalidation_clock import InvalidationClock
+from smartschedule.availability.resource_id import ResourceId
+from smartschedule.availability.session_changes import Changes
+from smartschedule.shared.timeslot.time_slot import TimeSlot
+
+
+@dataclass(frozen=True)
+class CalendarCacheStatistics:
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class CalendarCache:
+    """Calendars keyed by resource and normalized window, least recently used go first.
+
+    Windows cached for a resource are tracked separately, so a change drops only
+    the entries of that resource whose window overlaps it. Calendars read before
+    the last change of their resource are not kept.
+
+    Only transactions of this process are seen, changes committed by other
+    processes are not. So nothing is kept unless ``max_size`` is given.
+    """
+
+    def __init__(self, max_size: int = 0) -> None:
+        self._max_size = max_size
+        self._entries: OrderedDict[tuple[ResourceId, TimeSlot], Calendar] = (
+            OrderedDict()
+        )
+        self._windows: dict[ResourceId, set[TimeSlot]] = {}
+        self._clock = InvalidationClock(max_size * 4)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def now(self) -> int:
+        with self._lock:
+            return self._clock.now()
+
+    def get(self, resource_id: ResourceId, window: TimeSlot) -> Calendar | None:
+        if not self._max_size:
+            return None
+        key = (resource_id, window)
+        with self._lock:
+            try:
+                calendar = self._entries[key]
+            except KeyError:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return calendar
+
+    def put(self, window: TimeSlot, calendar: Calendar, read_at: int) -> None:
+        if not self._max_size:
+            return
+        key = (calendar.resource_id, window)
+        with self._lock:
+            if self._clock.is_stale(calendar.resource_id, read_at):
+                return
+            self._entries[key] = calendar
+            self._entries.move_to_end(key)
+            self._windows.setdefault(calendar.resource_id, set()).add(window)
+            while len(self._entries) > self._max_size:
+                self._forget(*self._entries.popitem(last=False)[0])
+                self._evictions += 1
+
+    def forget(self, changes: Changes) -> None:
+        for resource_id, slots in changes.items():
+            for slot in slots:
+                self.invalidate(resource_id, slot)
+
+    def invalidate(self, resource_id: ResourceId, changed: TimeSlot) -> None:
+        with self._lock:
+            self._clock.invalidate(resource_id)
+            for window in [
+                window
+                for window in self._windows.get(resource_id, ())
+                if window.from_ < changed.to and changed.from_ < window.to
+            ]:
+                del self._entries[(resource_id, window)]
+                self._forget(resource_id, window)
+                self._invalidations += 1
+
+    def invalidate_all_of(self, resource_id: ResourceId) -> None:
+        with self._lock:
+            self._clock.invalidate(resource_id)
+            for window in self._windows.pop(resource_id, set()):
+                del self._entries[(resource_id, window)]
+                self._invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._windows.clear()
+
+    def statistics(self) -> CalendarCacheStatistics:
+        with self._lock:
+            return CalendarCacheStatistics(
+                self._hits,
+                self._misses,
+                self._evictions,
+                self._invalidations,
+                len(self._entries),
+            )
+
+    def _forget(self, resource_id: ResourceId, window: TimeSlot) -> None:
+        windows = self._windows[resource_id]
+        windows.discard(window)
+        if not windows:
+            del self._windows[resource_id]
@@ -0,0 +1,31 @@
+from collections import OrderedDict
+
+from smartschedule.availability.resource_id import ResourceId
+
+
+class InvalidationClock:
+    """Tells whether a resource was invalidated after a read of it had started.
+
+    Only the latest invalidations of a bounded number of resources are kept.
+    Reads started before the oldest forgotten one are all treated as stale.
+    """
+
+    def __init__(self, max_resources: int = 4096) -> None:
+        self._max_resources = max_resources
+        self._now = 0
+        self._floor = 0
+        self._invalidated_at: OrderedDict[ResourceId, int] = OrderedDict()
+
+    def now(self) -> int:
+        return self._now
+
+    def invalidate(self, resource_id: ResourceId) -> None:
+        self._now += 1
+        self._invalidated_at[resource_id] = self._now
+        self._invalidated_at.move_to_end(resource_id)
+        while len(self._invalidated_at) > self._max_resources:
+            _, forgotten = self._invalidated_at.popitem(last=False)
+            self._floor = max(self._floor, forgotten)
+
+    def is_stale(self, resource_id: ResourceId, read_at: int) -> bool:
+        return read_at < max(self._floor, self._invalidated_at.get(resource_id, 0))
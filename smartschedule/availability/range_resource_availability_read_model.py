@@ -0,0 +1,33 @@
+from sqlalchemy import Subquery, func, select
+
+from smartschedule.availability.range_resource_availability_repository import (
+    availability_ranges,
+)
+from smartschedule.availability.resource_availability_read_model import (
+    ResourceAvailabilityReadModel,
+)
+from smartschedule.availability.resource_id import ResourceId
+from smartschedule.shared.timeslot.time_slot import TimeSlot
+
+
+class RangeResourceAvailabilityReadModel(ResourceAvailabilityReadModel):
+    def _rows_within(self, resource_ids: set[ResourceId], within: TimeSlot) -> Subquery:
+        # ranges may stick out of the window, calendars only show what is inside
+        return (
+            select(
+                availability_ranges.c.resource_id,
+                availability_ranges.c.taken_by,
+                func.greatest(availability_ranges.c.from_date, within.from_).label(
+                    "from_date"
+                ),
+                func.least(availability_ranges.c.to_date, within.to).label("to_date"),
+            )
+            .filter(
+                availability_ranges.c.resource_id.in_(
+                    [resource_id.id for resource_id in resource_ids]
+                ),
+                availability_ranges.c.from_date < within.to,
+                availability_ranges.c.to_date > within.from_,
+            )
+            .subquery("rows_within")
+        )
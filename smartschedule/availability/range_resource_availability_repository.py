@@ -0,0 +1,292 @@
+import itertools
+from itertools import groupby
+from typing import Any, Callable, Iterable, Sequence
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Integer,
+    Table,
+    UniqueConstraint,
+    and_,
+    delete,
+    func,
+    insert,
+    or_,
+    select,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.exc import NoResultFound
+
+from smartschedule.availability.availability_range import (
+    AvailabilityRange,
+    ids_of_ranges_holding,
+)
+from smartschedule.availability.availability_ranges import AvailabilityRanges
+from smartschedule.availability.blockade import Blockade
+from smartschedule.availability.owner import Owner
+from smartschedule.availability.resource_availability import ResourceAvailability
+from smartschedule.availability.resource_availability_id import ResourceAvailabilityId
+from smartschedule.availability.resource_availability_repository import (
+    ResourceAvailabilityRepository,
+)
+from smartschedule.availability.resource_grouped_availability import (
+    ResourceGroupedAvailability,
+)
+from smartschedule.availability.resource_id import ResourceId
+from smartschedule.availability.segment.segment_in_minutes import SegmentInMinutes
+from smartschedule.shared.sqlalchemy_extensions import registry
+from smartschedule.shared.timeslot.time_slot import TimeSlot
+
+
+class RangeResourceAvailabilityRepository(ResourceAvailabilityRepository):
+    """Stores contiguous segments sharing owner and state as a single range row.
+
+    Segments are still what gets loaded and saved, ranges are split into them
+    on load and segments are merged back into ranges on save.
+    """
+
+    def save_new(
+        self, resource_availability: ResourceAvailability | ResourceGroupedAvailability
+    ) -> None:
+        match resource_availability:
+            case ResourceAvailability():
+                self._insert(AvailabilityRanges.of([resource_availability]).ranges)
+            case ResourceGroupedAvailability():
+                self._insert(
+                    AvailabilityRanges.of(
+                        resource_availability.resource_availabilities
+                    ).ranges
+                )
+
+    def save_new_slots(
+        self,
+        resource_slots: Iterable[tuple[ResourceId, TimeSlot]],
+        parent_id: ResourceId | None,
+        segment: SegmentInMinutes,
+    ) -> None:
+        # a new slot is free as a whole, so it is one range already
+        for chunk in itertools.batched(resource_slots, self.BULK_CHUNK_SIZE):
+            self._insert(
+                [
+                    AvailabilityRange(
+                        ResourceAvailabilityId.new_one(),
+                        resource_id,
+                        parent_id or ResourceId.new_one(),
+                        slot,
+                        Blockade.none(),
+                    )
+                    for resource_id, slot in chunk
+                ]
+            )
+
+    def load_by_id(
+        self, resource_availability_id: ResourceAvailabilityId
+    ) -> ResourceAvailability:
+        lowest, highest = ids_of_ranges_holding(resource_availability_id)
+        stmt = select(availability_ranges).filter(
+            availability_ranges.c.id.between(lowest, highest)
+        )
+        ranges = [_to_availability_range(row) for row in self._session.execute(stmt)]
+        segments_of = self.load_segments(
+            {availability_range.resource_id for availability_range in ranges}
+        )
+        for availability_range in ranges:
+            resource_availability = availability_range.segment_with_id(
+                resource_availability_id, segments_of[availability_range.resource_id]
+            )
+            if resource_availability is not None:
+                return resource_availability
+        raise NoResultFound(f"No availability with id {resource_availability_id.id}")
+
+    def load_all_within_slot(
+        self, resource_id: ResourceId, slot: TimeSlot
+    ) -> list[ResourceAvailability]:
+        stmt = (
+            select(availability_ranges)
+            .filter(
+                availability_ranges.c.resource_id == resource_id.id,
+                availability_ranges.c.from_date < slot.to,
+                availability_ranges.c.to_date > slot.from_,
+            )
+            .order_by(availability_ranges.c.from_date)
+        )
+        return self._segments_within(stmt, lambda _: slot)
+
+    def load_all_by_parent_id_within_slot(
+        self, parent_id: ResourceId, slot: TimeSlot
+    ) -> list[ResourceAvailability]:
+        stmt = (
+            select(availability_ranges)
+            .filter(
+                availability_ranges.c.resource_parent_id == parent_id.id,
+                availability_ranges.c.from_date < slot.to,
+                availability_ranges.c.to_date > slot.from_,
+            )
+            .order_by(availability_ranges.c.from_date)
+        )
+        return self._segments_within(stmt, lambda _: slot)
+
+    def save_checking_version(
+        self,
+        resource_availability: ResourceAvailability
+        | ResourceGroupedAvailability
+        | list[ResourceAvailability],
+    ) -> bool:
+        resource_availabilities: list[ResourceAvailability]
+
+        match resource_availability:
+            case ResourceAvailability():
+                resource_availabilities = [resource_availability]
+            case ResourceGroupedAvailability():
+                resource_availabilities = resource_availability.resource_availabilities
+            case list():
+                resource_availabilities = resource_availability
+
+        # every resource is locked and checked before anything gets written
+        changes = []
+        for _, changed_of_resource in groupby(
+            sorted(resource_availabilities, key=lambda ra: str(ra.resource_id.id)),
+            key=lambda ra: ra.resource_id,
+        ):
+            changed = list(changed_of_resource)
+            stored = self._lock_touching(changed)
+            if stored.is_stale(changed):
+                # ranges a concurrent writer inserted while we waited for its
+                # locks are seen only by a new statement
+                stored = self._lock_touching(changed)
+                if stored.is_stale(changed):
+                    return False
+            segment = self.load_segments({changed[0].resource_id})[
+                changed[0].resource_id
+            ]
+            changes.append((stored, stored.overwritten_with(changed, segment)))
+
+        for stored, overwritten in changes:
+            self._session.execute(
+                delete(availability_ranges).where(
+                    availability_ranges.c.id.in_(
+                        [
+                            availability_range.id.id
+                            for availability_range in stored.ranges
+                        ]
+                    )
+                )
+            )
+            self._insert(overwritten.ranges)
+        return True
+
+    def load_availabilities_of_random_resources_within_windows(
+        self, windows: dict[ResourceId, TimeSlot]
+    ) -> ResourceGroupedAvailability:
+        random_resource = (
+            select(availability_ranges.c.resource_id)
+            .filter(
+                availability_ranges.c.taken_by == Owner.none().id,
+                or_(
+                    *(
+                        and_(
+                            availability_ranges.c.resource_id == resource_id.id,
+                            availability_ranges.c.from_date < normalized.to,
+                            availability_ranges.c.to_date > normalized.from_,
+                        )
+                        for resource_id, normalized in windows.items()
+                    )
+                ),
+            )
+            .group_by(availability_ranges.c.resource_id)
+            .order_by(func.random())
+            .limit(1)
+            .cte("random_resource")
+        )
+        stmt = (
+            select(availability_ranges)
+            .join(
+                random_resource,
+                availability_ranges.c.resource_id == random_resource.c.resource_id,
+            )
+            .order_by(availability_ranges.c.from_date)
+        )
+        return ResourceGroupedAvailability(
+            self._segments_within(stmt, lambda resource_id: windows[resource_id])
+        )
+
+    def _segments_within(
+        self, stmt: Any, window_of: Callable[[ResourceId], TimeSlot]
+    ) -> list[ResourceAvailability]:
+        ranges = [_to_availability_range(row) for row in self._session.execute(stmt)]
+        segments_of = self.load_segments(
+            {availability_range.resource_id for availability_range in ranges}
+        )
+        return [
+            resource_availability
+            for availability_range in ranges
+            for resource_availability in availability_range.to_segments(
+                window_of(availability_range.resource_id),
+                segments_of[availability_range.resource_id],
+            )
+        ]
+
+    def _lock_touching(self, changed: list[ResourceAvailability]) -> AvailabilityRanges:
+        # touching neighbours are locked too, they may get merged
+        stmt = (
+            select(availability_ranges)
+            .filter(
+                availability_ranges.c.resource_id == changed[0].resource_id.id,
+                availability_ranges.c.from_date <= max(ra.segment.to for ra in changed),
+                availability_ranges.c.to_date
+                >= min(ra.segment.from_ for ra in changed),
+            )
+            .order_by(availability_ranges.c.from_date)
+            .with_for_update()
+        )
+        return AvailabilityRanges(
+            [_to_availability_range(row) for row in self._session.execute(stmt)]
+        )
+
+    def _insert(self, ranges: Sequence[AvailabilityRange]) -> None:
+        if not ranges:
+            return
+        self._session.execute(
+            insert(availability_ranges),
+            [
+                {
+                    "id": availability_range.id.id,
+                    "resource_id": availability_range.resource_id.id,
+                    "resource_parent_id": availability_range.parent_id.id,
+                    "version": availability_range.version,
+                    "from_date": availability_range.slot.from_,
+                    "to_date": availability_range.slot.to,
+                    "taken_by": availability_range.blockade.taken_by.id,
+                    "disabled": availability_range.blockade.disabled,
+                }
+                for availability_range in ranges
+            ],
+        )
+
+
+availability_ranges = Table(
+    "availability_ranges",
+    registry.metadata,
+    Column("id", UUID(as_uuid=True), primary_key=True),
+    Column("resource_id", UUID(as_uuid=True), nullable=False),
+    Column("resource_parent_id", UUID(as_uuid=True)),
+    Column("version", Integer, nullable=False),
+    Column("from_date", DateTime(timezone=True), nullable=False),
+    Column("to_date", DateTime(timezone=True), nullable=False),
+    Column("taken_by", UUID(as_uuid=True), nullable=False),
+    Column("disabled", Boolean, nullable=False),
+    UniqueConstraint("resource_id", "from_date"),
+)
+
+
+def _to_availability_range(row: Any) -> AvailabilityRange:
+    return AvailabilityRange(
+        id=ResourceAvailabilityId(row[0]),
+        resource_id=ResourceId(row[1]),
+        parent_id=ResourceId(row[2]),
+        slot=TimeSlot(row[4], row[5]),
+        blockade=Blockade(Owner(row[6]), row[7]),
+        version=row[3],
+    )
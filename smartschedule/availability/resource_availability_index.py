@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import itertools
+from array import array
+from datetime import datetime, timedelta, timezone
+
+from smartschedule.availability.owner import Owner
+from smartschedule.shared.timeslot.time_slot import TimeSlot
+
+
+class ResourceAvailabilityIndex:
+    """Availability of one resource kept as flat arrays indexed by segment offset.
+
+    Byte arrays mark segments which are known, present, blocked and disabled,
+    an int array keeps codes of owners, so window queries scan them in C.
+    Naive moments are taken as UTC, like the database stores them.
+    """
+
+    def __init__(self, origin: datetime, segment: timedelta) -> None:
+        self._origin = _utc(origin)
+        self._segment = segment
+        self._known = bytearray()
+        self._present = bytearray()
+        self._blocked = bytearray()
+        self._disabled = bytearray()
+        self._owners = array("I")
+        self._owner_of_code: list[Owner] = [Owner.none()]
+        self._code_of_owner: dict[Owner, int] = {Owner.none(): 0}
+
+    @property
+    def segment(self) -> timedelta:
+        return self._segment
+
+    def unknown_within(self, slot: TimeSlot) -> TimeSlot | None:
+        start, end = self._cover(slot)
+        first = self._known.find(0, start, end)
+        if first == -1:
+            return None
+        last = self._known.rfind(0, start, end)
+        return TimeSlot(self._moment(first), self._moment(last + 1))
+
+    def mark_known(self, slot: TimeSlot) -> None:
+        start, end = self._cover(slot)
+        self._known[start:end] = b"\x01" * (end - start)
+
+    def forget(self, slot: TimeSlot) -> None:
+        start, end = self._offsets(slot)
+        start, end = max(start, 0), min(end, len(self._known))
+        if start < end:
+            self._known[start:end] = bytes(end - start)
+
+    def length_covering(self, slot: TimeSlot) -> int:
+        start, end = self._offsets(slot)
+        return max(end, len(self._known)) - min(start, 0)
+
+    def put(self, segment: TimeSlot, owner: Owner, disabled: bool) -> None:
+        code = self._code(owner)
+        start, end = self._cover(segment)
+        length = end - start
+        self._known[start:end] = b"\x01" * length
+        self._present[start:end] = b"\x01" * length
+        self._blocked[start:end] = (b"\x01" if code else b"\x00") * length
+        self._disabled[start:end] = (b"\x01" if disabled else b"\x00") * length
+        self._owners[start:end] = array("I", [code]) * length
+
+    def is_free(self, slot: TimeSlot) -> bool:
+        start, end = self._cover(slot)
+        return (
+            start < end
+            and self._present.find(0, start, end) == -1
+            and self._blocked.find(1, start, end) == -1
+            and self._disabled.find(1, start, end) == -1
+        )
+
+    def owners(self, slot: TimeSlot) -> set[Owner]:
+        start, end = self._cover(slot)
+        return {
+            self._owner_of_code[code]
+            for code in set(
+                itertools.compress(self._owners[start:end], self._present[start:end])
+            )
+        }
+
+    def _offsets(self, slot: TimeSlot) -> tuple[int, int]:
+        start = (_utc(slot.from_) - self._origin) // self._segment
+        end = -((self._origin - _utc(slot.to)) // self._segment)
+        return start, end
+
+    def _cover(self, slot: TimeSlot) -> tuple[int, int]:
+        start, end = self._offsets(slot)
+        if start < 0:
+            # at least doubled, so walking back in time costs amortized O(1)
+            grown = max(-start, len(self._known))
+            self._grow_before(grown)
+            start, end = start + grown, end + grown
+        if end > len(self._known):
+            self._grow_after(end - len(self._known))
+        return start, end
+
+    def _grow_before(self, segments: int) -> None:
+        self._origin -= self._segment * segments
+        for flags in (self._known, self._present, self._blocked, self._disabled):
+            flags[0:0] = bytes(segments)
+        self._owners[0:0] = array("I", [0]) * segments
+
+    def _grow_after(self, segments: int) -> None:
+        for flags in (self._known, self._present, self._blocked, self._disabled):
+            flags.extend(bytes(segments))
+        self._owners.extend(array("I", [0]) * segments)
+
+    def _code(self, owner: Owner) -> int:
+        if owner not in self._code_of_owner:
+            self._code_of_owner[owner] = len(self._owner_of_code)
+            self._owner_of_code.append(owner)
+        return self._code_of_owner[owner]
+
+    def _moment(self, offset: int) -> datetime:
+        return self._origin + self._segment * offset
+
+
+def _utc(moment: datetime) -> datetime:
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc)
@@ -4,26 +4,64 @@ from collections import defaultdict
 from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import Select, case, func, select
+from sqlalchemy import Select, Subquery, case, func, select
 from sqlalchemy.orm import Session
 
 from smartschedule.availability.calendar import Calendar
+from smartschedule.availability.calendar_cache import CalendarCache
 from smartschedule.availability.calendars import Calendars
 from smartschedule.availability.owner import Owner
 from smartschedule.availability.resource_availability_repository import availabilities
 from smartschedule.availability.resource_id import ResourceId
+from smartschedule.availability.session_changes import SessionChanges
 from smartschedule.shared.timeslot.time_slot import TimeSlot
 
 
 class ResourceAvailabilityReadModel:
-    def __init__(self, session: Session) -> None:
+    def __init__(self, session: Session, cache: CalendarCache) -> None:
         self._session = session
+        self._cache = cache
+        self._changes = SessionChanges(session)
+        # others see changes only once committed, the shared cache follows that
+        self._changes.on_end(cache.forget)
 
     def load(self, resource_id: ResourceId, within: TimeSlot) -> Calendar:
         calendars = self.load_all({resource_id}, within)
         return calendars.get(resource_id)
 
     def load_all(self, resource_ids: set[ResourceId], within: TimeSlot) -> Calendars:
+        # changes of the open transaction are not visible to others yet
+        changed = {
+            resource_id
+            for resource_id in resource_ids
+            if self._changes.touches(resource_id)
+        }
+        cached: dict[ResourceId, Calendar] = {}
+        for resource_id in resource_ids - changed:
+            if (calendar := self._cache.get(resource_id, within)) is not None:
+                cached[resource_id] = calendar
+        if missing := resource_ids - cached.keys():
+            read_at = self._cache.now()
+            loaded = self._load_all(missing, within)
+            for resource_id in missing:
+                # empty calendars are cached too, there is nothing to load for them
+                calendar = loaded.get(resource_id)
+                if resource_id not in changed:
+                    self._cache.put(within, calendar, read_at)
+                cached[resource_id] = calendar
+
+        return Calendars(
+            {
+                resource_id: calendar
+                for resource_id, calendar in cached.items()
+                if calendar.calendar
+            }
+        )
+
+    def invalidate_all_of(self, resource_id: ResourceId) -> None:
+        self._cache.invalidate_all_of(resource_id)
+
+    def _load_all(self, resource_ids: set[ResourceId], within: TimeSlot) -> Calendars:
         calendars: dict[ResourceId, dict[Owner, list[TimeSlot]]] = defaultdict(
             lambda: defaultdict(list)
         )
@@ -47,32 +85,23 @@ class ResourceAvailabilityReadModel:
     def _stmt(
         self, resource_ids: set[ResourceId], within: TimeSlot
     ) -> Select[ReadModelRow]:
-        availability_with_lag = (
-            select(
-                availabilities.c.resource_id,
-                availabilities.c.taken_by,
-                availabilities.c.from_date,
-                availabilities.c.to_date,
-                func.coalesce(
-                    func.lag(availabilities.c.to_date).over(
-                        partition_by=[
-                            availabilities.c.resource_id,
-                            availabilities.c.taken_by,
-                        ],
-                        order_by=availabilities.c.from_date,
-                    ),
-                    availabilities.c.from_date,
-                ).label("prev_to_date"),
-            )
-            .filter(
-                availabilities.c.resource_id.in_(
-                    [resource_id.id for resource_id in resource_ids]
+        rows = self._rows_within(resource_ids, within)
+        availability_with_lag = select(
+            rows.c.resource_id,
+            rows.c.taken_by,
+            rows.c.from_date,
+            rows.c.to_date,
+            func.coalesce(
+                func.lag(rows.c.to_date).over(
+                    partition_by=[
+                        rows.c.resource_id,
+                        rows.c.taken_by,
+                    ],
+                    order_by=rows.c.from_date,
                 ),
-                availabilities.c.from_date >= within.from_,
-                availabilities.c.to_date <= within.to,
-            )
-            .cte("availability_with_lag")
-        )
+                rows.c.from_date,
+            ).label("prev_to_date"),
+        ).cte("availability_with_lag")
 
         grouped_availability = select(
             availability_with_lag.c.resource_id,
@@ -125,6 +154,24 @@ class ResourceAvailabilityReadModel:
 
         return stmt
 
+    def _rows_within(self, resource_ids: set[ResourceId], within: TimeSlot) -> Subquery:
+        return (
+            select(
+                availabilities.c.resource_id,
+                availabilities.c.taken_by,
+                availabilities.c.from_date,
+                availabilities.c.to_date,
+            )
+            .filter(
+                availabilities.c.resource_id.in_(
+                    [resource_id.id for resource_id in resource_ids]
+                ),
+                availabilities.c.from_date >= within.from_,
+                availabilities.c.to_date <= within.to,
+            )
+            .subquery("rows_within")
+        )
+
 
 class ReadModelRow(tuple[UUID, UUID, datetime, datetime]):
     resource_id: UUID
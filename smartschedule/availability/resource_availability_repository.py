@@ -1,5 +1,7 @@
-from collections import deque
-from typing import Any, Sequence
+import itertools
+import uuid
+from datetime import datetime
+from typing import Any, Final, Iterable, Iterator, Sequence
 
 from sqlalchemy import (
     Boolean,
@@ -8,11 +10,16 @@ from sqlalchemy import (
     Integer,
     Table,
     UniqueConstraint,
+    and_,
+    column,
     func,
     insert,
+    or_,
     select,
     update,
+    values,
 )
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Session
 
@@ -24,11 +31,15 @@ from smartschedule.availability.resource_grouped_availability import (
     ResourceGroupedAvailability,
 )
 from smartschedule.availability.resource_id import ResourceId
+from smartschedule.availability.segment import segments
+from smartschedule.availability.segment.segment_in_minutes import SegmentInMinutes
 from smartschedule.shared.sqlalchemy_extensions import registry
 from smartschedule.shared.timeslot.time_slot import TimeSlot
 
 
 class ResourceAvailabilityRepository:
+    BULK_CHUNK_SIZE: Final = 5000
+
     def __init__(self, session: Session) -> None:
         self._session = session
 
@@ -59,6 +70,49 @@ class ResourceAvailabilityRepository:
             ],
         )
 
+    def save_new_slots(
+        self,
+        resource_slots: Iterable[tuple[ResourceId, TimeSlot]],
+        parent_id: ResourceId | None,
+        segment: SegmentInMinutes,
+    ) -> None:
+        """Segments of the slots are streamed, no objects are built for them."""
+        rows = _new_segment_rows(resource_slots, parent_id, segment)
+        connection = self._session.connection()
+        if connection.dialect.driver == "psycopg2":
+            cursor = connection.connection.cursor()
+            try:
+                cursor.copy_expert(
+                    "COPY availabilities (id, resource_id, resource_parent_id,"
+                    " version, from_date, to_date, taken_by, disabled) FROM STDIN",
+                    _CopyRows(
+                        f"{availability_id}\t{resource_id}\t{parent_id}\t0"
+                        f"\t{from_.isoformat()}\t{to.isoformat()}"
+                        f"\t{Owner.none().id}\tf\n"
+                        for availability_id, resource_id, parent_id, from_, to in rows
+                    ),
+                )
+            finally:
+                cursor.close()
+            return
+        for chunk in itertools.batched(rows, self.BULK_CHUNK_SIZE):
+            connection.execute(
+                insert(availabilities),
+                [
+                    {
+                        "id": availability_id,
+                        "resource_id": resource_id,
+                        "resource_parent_id": parent_id,
+                        "version": 0,
+                        "from_date": from_,
+                        "to_date": to,
+                        "taken_by": Owner.none().id,
+                        "disabled": False,
+                    }
+                    for availability_id, resource_id, parent_id, from_, to in chunk
+                ],
+            )
+
     def load_by_id(
         self, resource_availability_id: ResourceAvailabilityId
     ) -> ResourceAvailability:
@@ -104,36 +158,78 @@ class ResourceAvailabilityRepository:
             case list():
                 resource_availabilities = resource_availability
 
-        results: deque[bool] = deque()
-        for ra in resource_availabilities:
-            id = ra.id.id
-            version = ra.version
-            stmt = (
-                update(availabilities)
-                .where(availabilities.c.id == id, availabilities.c.version == version)
-                .values(
-                    version=version + 1,
-                    taken_by=ra.blocked_by().id,
-                    disabled=ra.is_disabled(),
-                )
-            )
-            result = self._session.execute(stmt)
-            results.append(result.rowcount == 1)
+        if not resource_availabilities:
+            return True
 
-        return all(results)
+        changes = select(
+            values(
+                column("id", UUID(as_uuid=True)),
+                column("version", Integer),
+                column("taken_by", UUID(as_uuid=True)),
+                column("disabled", Boolean),
+                name="new_values",
+            ).data(
+                [
+                    (ra.id.id, ra.version, ra.blocked_by().id, ra.is_disabled())
+                    for ra in resource_availabilities
+                ]
+            )
+        ).cte("changes")
+        # rows with matching versions are locked first, so the update below
+        # either applies to all of them or to none
+        matching = (
+            select(availabilities.c.id)
+            .join(
+                changes,
+                (availabilities.c.id == changes.c.id)
+                & (availabilities.c.version == changes.c.version),
+            )
+            .with_for_update(of=availabilities)
+            .cte("matching")
+        )
+        stmt = (
+            update(availabilities)
+            .where(
+                availabilities.c.id == changes.c.id,
+                availabilities.c.version == changes.c.version,
+                select(func.count()).select_from(matching).scalar_subquery()
+                == len(resource_availabilities),
+            )
+            .values(
+                version=changes.c.version + 1,
+                taken_by=changes.c.taken_by,
+                disabled=changes.c.disabled,
+            )
+        )
+        result = self._session.execute(stmt)
+        return bool(result.rowcount == len(resource_availabilities))
 
     def load_availabilities_of_random_resources_within(
         self, normalized: TimeSlot, *resource_ids: ResourceId
+    ) -> ResourceGroupedAvailability:
+        return self.load_availabilities_of_random_resources_within_windows(
+            {resource_id: normalized for resource_id in resource_ids}
+        )
+
+    def load_availabilities_of_random_resources_within_windows(
+        self, windows: dict[ResourceId, TimeSlot]
     ) -> ResourceGroupedAvailability:
         available_resources = (
             select(availabilities.c.resource_id)
             .filter(
-                availabilities.c.resource_id.in_(
-                    [resouce_id.id for resouce_id in resource_ids]
-                ),
                 availabilities.c.taken_by == Owner.none().id,
-                availabilities.c.from_date >= normalized.from_,
-                availabilities.c.to_date <= normalized.to,
+                or_(
+                    *(
+                        and_(
+                            availabilities.c.resource_id.in_(
+                                [resouce_id.id for resouce_id in resource_ids]
+                            ),
+                            availabilities.c.from_date >= normalized.from_,
+                            availabilities.c.to_date <= normalized.to,
+                        )
+                        for normalized, resource_ids in _by_window(windows).items()
+                    )
+                ),
             )
             .group_by(availabilities.c.resource_id)
             .cte()
@@ -153,6 +249,41 @@ class ResourceAvailabilityRepository:
             [_to_resource_availability(row) for row in rows]
         )
 
+    def save_segments(
+        self, resource_ids: Iterable[ResourceId], segment: SegmentInMinutes
+    ) -> None:
+        rows = [
+            {"resource_id": resource_id.id, "minutes": segment.minutes}
+            for resource_id in resource_ids
+        ]
+        if not rows:
+            return
+        stmt = postgresql.insert(resource_segments).values(rows)
+        self._session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[resource_segments.c.resource_id],
+                set_={"minutes": stmt.excluded.minutes},
+            )
+        )
+
+    def load_segments(
+        self, resource_ids: Iterable[ResourceId]
+    ) -> dict[ResourceId, SegmentInMinutes]:
+        resource_ids = set(resource_ids)
+        stmt = select(resource_segments).filter(
+            resource_segments.c.resource_id.in_(
+                [resource_id.id for resource_id in resource_ids]
+            )
+        )
+        stored = {
+            ResourceId(row.resource_id): SegmentInMinutes(row.minutes, row.minutes)
+            for row in self._session.execute(stmt)
+        }
+        return {
+            resource_id: stored.get(resource_id, SegmentInMinutes.default_segment())
+            for resource_id in resource_ids
+        }
+
 
 availabilities = Table(
     "availabilities",
@@ -168,6 +299,55 @@ availabilities = Table(
     UniqueConstraint("resource_id", "from_date", "to_date"),
 )
 
+# only resources, or parents, not split into default segments have a row here
+resource_segments = Table(
+    "resource_segments",
+    registry.metadata,
+    Column("resource_id", UUID(as_uuid=True), primary_key=True),
+    Column("minutes", Integer, nullable=False),
+)
+
+
+class _CopyRows:
+    """File-like view of lines, so COPY reads rows as they are generated."""
+
+    def __init__(self, lines: Iterator[str]) -> None:
+        self._lines = lines
+        self._buffer = ""
+
+    def read(self, size: int = -1) -> str:
+        chunks = [self._buffer]
+        length = len(self._buffer)
+        while size < 0 or length < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            chunks.append(line)
+            length += len(line)
+        data = "".join(chunks)
+        if size < 0:
+            size = len(data)
+        self._buffer = data[size:]
+        return data[:size]
+
+
+def _new_segment_rows(
+    resource_slots: Iterable[tuple[ResourceId, TimeSlot]],
+    parent_id: ResourceId | None,
+    segment: SegmentInMinutes,
+) -> Iterator[tuple[uuid.UUID, uuid.UUID, uuid.UUID, datetime, datetime]]:
+    for resource_id, slot in resource_slots:
+        slot_parent_id = (parent_id or ResourceId.new_one()).id
+        for from_, to in segments.split_to_bounds(slot, segment):
+            yield uuid.uuid4(), resource_id.id, slot_parent_id, from_, to
+
+
+def _by_window(windows: dict[ResourceId, TimeSlot]) -> dict[TimeSlot, list[ResourceId]]:
+    by_window: dict[TimeSlot, list[ResourceId]] = {}
+    for resource_id, window in windows.items():
+        by_window.setdefault(window, []).append(resource_id)
+    return by_window
+
 
 def _to_resource_availability(row: Any) -> ResourceAvailability:
     owner = Owner(row[6])
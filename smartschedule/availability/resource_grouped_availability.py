@@ -21,6 +21,8 @@ class ResourceGroupedAvailability:
         timeslot: TimeSlot,
         parent_id: ResourceId | None = None,
     ) -> ResourceGroupedAvailability:
+        # one parent for all segments, so they can be stored as ranges
+        parent_id = parent_id or ResourceId.new_one()
         resource_availabilities = [
             ResourceAvailability(
                 id=ResourceAvailabilityId.new_one(),
@@ -36,6 +36,16 @@ class SegmentInMinutes:
     def value(self) -> timedelta:
         return self._value
 
+    @property
+    def minutes(self) -> int:
+        return self._value // timedelta(minutes=1)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, SegmentInMinutes) and self._value == other._value
+
+    def __hash__(self) -> int:
+        return hash(self._value)
+
     @classmethod
     def default_segment(cls) -> SegmentInMinutes:
         return SegmentInMinutes(
@@ -1,8 +1,14 @@
+from datetime import datetime
+from typing import Iterator
+
 from smartschedule.availability.segment.segment_in_minutes import SegmentInMinutes
 from smartschedule.availability.segment.slot_to_normalized_slot import (
     slot_to_normalized_slot,
 )
-from smartschedule.availability.segment.slot_to_segments import slot_to_segments
+from smartschedule.availability.segment.slot_to_segments import (
+    slot_to_segment_bounds,
+    slot_to_segments,
+)
 from smartschedule.shared.timeslot.time_slot import TimeSlot
 
 
@@ -11,6 +17,13 @@ def split(time_slot: TimeSlot, unit: SegmentInMinutes) -> list[TimeSlot]:
     return slot_to_segments(normalized_slot, unit)
 
 
+def split_to_bounds(
+    time_slot: TimeSlot, unit: SegmentInMinutes
+) -> Iterator[tuple[datetime, datetime]]:
+    normalized_slot = normalize_to_segment_boundaries(time_slot, unit)
+    return slot_to_segment_bounds(normalized_slot, unit)
+
+
 def normalize_to_segment_boundaries(
     time_slot: TimeSlot, unit: SegmentInMinutes
 ) -> TimeSlot:
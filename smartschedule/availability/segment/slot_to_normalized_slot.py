@@ -1,4 +1,5 @@
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from typing import Final
 
 from smartschedule.availability.segment.segment_in_minutes import SegmentInMinutes
 from smartschedule.shared.timeslot.time_slot import TimeSlot
@@ -16,21 +17,29 @@ def slot_to_normalized_slot(
     return normalized
 
 
+# segments are counted from the epoch, so a resource has one grid whatever the
+# hour a request starts at, and both ends take constant time
+_EPOCH: Final = datetime(1970, 1, 1)
+_UTC_EPOCH: Final = _EPOCH.replace(tzinfo=timezone.utc)
+
+
 def _normalize_start(
     initial_start: datetime, segment_in_minutes: SegmentInMinutes
 ) -> datetime:
-    closest_segment_start = initial_start.replace(minute=0, second=0, microsecond=0)
-    if closest_segment_start + segment_in_minutes.value > initial_start:
-        return closest_segment_start
-    while closest_segment_start < initial_start:
-        closest_segment_start += segment_in_minutes.value
-    return closest_segment_start
+    return initial_start - _since_segment_start(initial_start, segment_in_minutes)
 
 
 def _normalize_end(
     initial_end: datetime, segment_in_minutes: SegmentInMinutes
 ) -> datetime:
-    closest_segment_end = initial_end.replace(minute=0, second=0, microsecond=0)
-    while initial_end > closest_segment_end:
-        closest_segment_end += segment_in_minutes.value
-    return closest_segment_end
+    since_segment_start = _since_segment_start(initial_end, segment_in_minutes)
+    if not since_segment_start:
+        return initial_end
+    return initial_end - since_segment_start + segment_in_minutes.value
+
+
+def _since_segment_start(
+    moment: datetime, segment_in_minutes: SegmentInMinutes
+) -> timedelta:
+    epoch = _EPOCH if moment.tzinfo is None else _UTC_EPOCH
+    return (moment - epoch) % segment_in_minutes.value
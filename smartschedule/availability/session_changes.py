@@ -0,0 +1,54 @@
+from typing import Any, Callable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, SessionTransaction
+
+from smartschedule.availability.resource_id import ResourceId
+from smartschedule.shared.timeslot.time_slot import TimeSlot
+
+Changes = dict[ResourceId, list[TimeSlot]]
+
+
+class SessionChanges:
+    """Availability slots written in the open transaction of a session.
+
+    Other transactions must not see them before commit, so shared caches are
+    bypassed for changed resources and told about the changes only once the
+    transaction ends, whether it was committed or rolled back.
+    """
+
+    def __init__(self, session: Session) -> None:
+        if _STATE not in session.info:
+            session.info[_STATE] = _State()
+            event.listen(session, "after_transaction_end", _transaction_ended)
+        self._state: _State = session.info[_STATE]
+
+    def add(self, resource_id: ResourceId, slot: TimeSlot) -> None:
+        self._state.changes.setdefault(resource_id, []).append(slot)
+
+    def touches(self, resource_id: ResourceId) -> bool:
+        return resource_id in self._state.changes
+
+    def on_end(self, listener: Callable[[Changes], None]) -> None:
+        # shared caches subscribe from every facade, each of them is told once
+        if listener not in self._state.listeners:
+            self._state.listeners.append(listener)
+
+
+class _State:
+    def __init__(self) -> None:
+        self.changes: Changes = {}
+        self.listeners: list[Callable[[Changes], None]] = []
+
+
+_STATE = "availability_changes"
+
+
+def _transaction_ended(session: Session, transaction: SessionTransaction) -> Any:
+    if transaction.parent is not None:
+        return
+    state: _State = session.info[_STATE]
+    changes, state.changes = state.changes, {}
+    if changes:
+        for listener in state.listeners:
+            listener(changes)
@@ -11,6 +11,16 @@ from smartschedule.allocation.project_allocations_repository import (
 from smartschedule.allocation.sqlalchemy_project_allocations_repository import (
     SqlAlchemyProjectAllocationsRepository,
 )
+from smartschedule.availability.availability_index import AvailabilityIndex
+from smartschedule.availability.calendar_cache import CalendarCache
+from smartschedule.optimization.caching_optimization_facade import (
+    CachingOptimizationFacade,
+)
+from smartschedule.optimization.optimization_facade import OptimizationFacade
+from smartschedule.optimization.optimization_result_cache import (
+    OptimizationResultCache,
+)
+from smartschedule.optimization.solver_statistics import SolverStatisticsListeners
 from smartschedule.planning.project_repository import ProjectRepository
 from smartschedule.planning.redis_project_repository import (
     RedisProjectRepository,
@@ -19,7 +29,11 @@ from smartschedule.shared.event_bus import EventBus, SyncExecutor
 from smartschedule.shared.events_publisher import EventsPublisher
 
 
-def build() -> Container:
+def build(
+    optimization_cache_size: int | None = None,
+    availability_index_size: int = 0,
+    calendar_cache_size: int = 0,
+) -> Container:
     container = Container()
     executor = SyncExecutor()
     container[EventsPublisher] = lambda c: EventBus(c, executor)  # type: ignore[type-abstract]
@@ -27,4 +41,22 @@ def build() -> Container:
     container[CashflowRepository] = SqlAlchemyCashflowRepository  # type: ignore[type-abstract]
     container[ProjectRepository] = lambda c: RedisProjectRepository(c[Redis])  # type: ignore[type-abstract]
     container[ProjectAllocationsRepository] = SqlAlchemyProjectAllocationsRepository  # type: ignore[type-abstract]
+    # shared by every facade, they are told about changes once transactions end;
+    # commits of other processes never reach them, so they are empty unless sized
+    container[AvailabilityIndex] = AvailabilityIndex(
+        max_resources=availability_index_size
+    )
+    container[CalendarCache] = CalendarCache(max_size=calendar_cache_size)
+    # one set of listeners, so metrics can follow every facade handed out
+    statistics_listeners = SolverStatisticsListeners()
+    container[SolverStatisticsListeners] = statistics_listeners
+    if optimization_cache_size is not None:
+        container[OptimizationFacade] = CachingOptimizationFacade(
+            OptimizationResultCache(max_size=optimization_cache_size),
+            statistics_listeners,
+        )
+    else:
+        container[OptimizationFacade] = lambda c: OptimizationFacade(
+            statistics_listeners
+        )
     return container
@@ -0,0 +1,132 @@
+from collections import deque
+from typing import Final, Sequence
+
+from smartschedule.optimization.capacity_dimension import CapacityDimension
+from smartschedule.optimization.capacity_index import CapacityIndex
+from smartschedule.optimization.total_weight import TotalWeight
+
+_UNREACHABLE: Final = -1
+
+
+class BipartiteCapacityMatching[T: CapacityDimension]:
+    """Keeps a maximum matching of weight components (demands) to capacities.
+
+    Every new total weight is matched with Hopcroft-Karp phases started from its
+    own components, so demands matched before may move to other capacities.
+    A weight that cannot be fully matched is rolled back and leaves no trace.
+    """
+
+    def __init__(self, capacities: Sequence[T]) -> None:
+        self._index = CapacityIndex(capacities)
+        self._neighbours: list[list[int]] = []
+        self._capacity_of: list[int | None] = []
+        self._demand_of: dict[int, int] = {}
+        self._journal: list[tuple[int, int, int | None, int | None]] = []
+
+    @property
+    def comparisons(self) -> int:
+        return self._index.comparisons
+
+    def try_to_match(self, total_weight: TotalWeight[T]) -> list[int] | None:
+        if not total_weight.components:
+            return None
+        demands = []
+        for weight_component in total_weight.components:
+            demands.append(len(self._neighbours))
+            self._neighbours.append(self._index.positions_satisfying(weight_component))
+            self._capacity_of.append(None)
+        self._journal.clear()
+        if all(self._neighbours[demand] for demand in demands):
+            while self._augment(demands):
+                pass
+        if any(self._capacity_of[demand] is None for demand in demands):
+            self._rollback(demands)
+            return None
+        return demands
+
+    def release(self, demands: list[int]) -> None:
+        assert demands[-1] == len(self._capacity_of) - 1, "only last match releasable"
+        for demand in demands:
+            capacity = self._capacity_of[demand]
+            if capacity is not None:
+                del self._demand_of[capacity]
+        del self._neighbours[demands[0] :]
+        del self._capacity_of[demands[0] :]
+
+    def capacities_of(self, demands: list[int]) -> list[T]:
+        return [
+            self._index.capacity_at(capacity)
+            for demand in demands
+            if (capacity := self._capacity_of[demand]) is not None
+        ]
+
+    def _augment(self, demands: list[int]) -> bool:
+        free = [demand for demand in demands if self._capacity_of[demand] is None]
+        distance = {demand: 0 for demand in free}
+        queue = deque(free)
+        shortest_path: int | None = None
+        while queue:
+            demand = queue.popleft()
+            if shortest_path is not None and distance[demand] >= shortest_path:
+                continue
+            for capacity in self._neighbours[demand]:
+                owner = self._demand_of.get(capacity)
+                if owner is None:
+                    if shortest_path is None:
+                        shortest_path = distance[demand] + 1
+                elif owner not in distance:
+                    distance[owner] = distance[demand] + 1
+                    queue.append(owner)
+        if shortest_path is None:
+            return False
+
+        augmented = False
+        for demand in free:
+            augmented |= self._augment_from(demand, distance, shortest_path)
+        return augmented
+
+    def _augment_from(
+        self, root: int, distance: dict[int, int], shortest_path: int
+    ) -> bool:
+        stack = [(root, iter(self._neighbours[root]))]
+        path: list[tuple[int, int]] = []
+        while stack:
+            demand, candidates = stack[-1]
+            for capacity in candidates:
+                owner = self._demand_of.get(capacity)
+                if owner is None:
+                    if distance[demand] + 1 == shortest_path:
+                        path.append((demand, capacity))
+                        for matched_demand, matched_capacity in path:
+                            self._assign(matched_demand, matched_capacity)
+                        return True
+                elif distance.get(owner) == distance[demand] + 1:
+                    path.append((demand, capacity))
+                    stack.append((owner, iter(self._neighbours[owner])))
+                    break
+            else:
+                distance[demand] = _UNREACHABLE
+                stack.pop()
+                if path:
+                    path.pop()
+        return False
+
+    def _assign(self, demand: int, capacity: int) -> None:
+        self._journal.append(
+            (demand, capacity, self._capacity_of[demand], self._demand_of.get(capacity))
+        )
+        self._capacity_of[demand] = capacity
+        self._demand_of[capacity] = demand
+
+    def _rollback(self, demands: list[int]) -> None:
+        for demand, capacity, previous_capacity, previous_owner in reversed(
+            self._journal
+        ):
+            self._capacity_of[demand] = previous_capacity
+            if previous_owner is None:
+                del self._demand_of[capacity]
+            else:
+                self._demand_of[capacity] = previous_owner
+        self._journal.clear()
+        del self._neighbours[demands[0] :]
+        del self._capacity_of[demands[0] :]
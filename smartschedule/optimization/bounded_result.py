@@ -0,0 +1,19 @@
+from dataclasses import dataclass
+
+from smartschedule.optimization.capacity_dimension import CapacityDimension
+from smartschedule.optimization.result import Result
+
+
+@dataclass(frozen=True)
+class BoundedResult[T: CapacityDimension]:
+    result: Result[T]
+    upper_bound: float
+
+    @property
+    def optimality_gap(self) -> float:
+        if self.upper_bound <= 0:
+            return 0.0
+        return max(self.upper_bound - self.result.profit, 0) / self.upper_bound
+
+    def is_optimal(self) -> bool:
+        return self.result.profit >= self.upper_bound
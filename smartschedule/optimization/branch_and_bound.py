@@ -0,0 +1,156 @@
+import bisect
+import itertools
+import time
+from dataclasses import dataclass, field
+from enum import Enum, auto
+from typing import Sequence
+
+from smartschedule.optimization.bipartite_capacity_matching import (
+    BipartiteCapacityMatching,
+)
+from smartschedule.optimization.capacity_dimension import CapacityDimension
+from smartschedule.optimization.item import Item
+
+
+class _Branch(Enum):
+    NOT_VISITED = auto()
+    INCLUDED = auto()
+    EXCLUDED = auto()
+
+
+@dataclass
+class _Node:
+    index: int
+    value: int
+    capacity_left: int
+    branch: _Branch = _Branch.NOT_VISITED
+    demands: list[int] | None = field(default=None)
+
+
+@dataclass(frozen=True)
+class Incumbent[T: CapacityDimension]:
+    profit: int
+    item_to_capacities: dict[Item[T], set[CapacityDimension]]
+
+
+class BranchAndBound[T: CapacityDimension]:
+    """Depth-first search over include/exclude decisions, best value density first.
+
+    Nodes are pruned with the fractional knapsack bound over capacity counts and
+    items are only included when all their demands can be matched at once.
+    The search stops at the deadline and reports the best upper bound of
+    branches it did not manage to explore.
+    """
+
+    def __init__(self, items: Sequence[Item[T]], capacities: Sequence[T]) -> None:
+        self._items = sorted(
+            (
+                item
+                for item in items
+                if int(item.value) > 0 and not item.is_weight_zero()
+            ),
+            key=lambda item: -int(item.value) / len(item.total_weight.components),
+        )
+        self._weights = [len(item.total_weight.components) for item in self._items]
+        self._values = [int(item.value) for item in self._items]
+        self._prefix_weights = [0, *itertools.accumulate(self._weights)]
+        self._prefix_values = [0, *itertools.accumulate(self._values)]
+        self._capacities = capacities
+        self._matching = BipartiteCapacityMatching(capacities)
+        self._peak_nodes = 0
+
+    @property
+    def items(self) -> int:
+        return len(self._items)
+
+    @property
+    def comparisons(self) -> int:
+        return self._matching.comparisons
+
+    @property
+    def peak_nodes(self) -> int:
+        return self._peak_nodes
+
+    def search(
+        self, incumbent: Incumbent[T], deadline: float
+    ) -> tuple[Incumbent[T], float]:
+        matching = self._matching = BipartiteCapacityMatching(self._capacities)
+        chosen: list[tuple[Item[T], list[int]]] = []
+        stack = [_Node(0, 0, len(self._capacities))]
+        while stack:
+            self._peak_nodes = max(self._peak_nodes, len(stack))
+            if time.monotonic() >= deadline:
+                return incumbent, max(
+                    incumbent.profit, *(self._open_bound(node) for node in stack)
+                )
+            node = stack[-1]
+            if node.branch == _Branch.NOT_VISITED:
+                if node.index == len(self._items):
+                    if node.value > incumbent.profit:
+                        incumbent = self._to_incumbent(node.value, chosen, matching)
+                    stack.pop()
+                    continue
+                if self._bound(node.index, node.value, node.capacity_left) <= (
+                    incumbent.profit
+                ):
+                    stack.pop()
+                    continue
+                node.branch = _Branch.INCLUDED
+                item = self._items[node.index]
+                if self._weights[node.index] <= node.capacity_left:
+                    node.demands = matching.try_to_match(item.total_weight)
+                if node.demands is not None:
+                    chosen.append((item, node.demands))
+                    stack.append(
+                        _Node(
+                            node.index + 1,
+                            node.value + self._values[node.index],
+                            node.capacity_left - self._weights[node.index],
+                        )
+                    )
+                    continue
+            if node.branch == _Branch.INCLUDED:
+                if node.demands is not None:
+                    matching.release(node.demands)
+                    chosen.pop()
+                    node.demands = None
+                node.branch = _Branch.EXCLUDED
+                if self._bound(node.index + 1, node.value, node.capacity_left) > (
+                    incumbent.profit
+                ):
+                    stack.append(_Node(node.index + 1, node.value, node.capacity_left))
+                    continue
+            stack.pop()
+        return incumbent, incumbent.profit
+
+    def _open_bound(self, node: _Node) -> float:
+        if node.branch == _Branch.NOT_VISITED:
+            return self._bound(node.index, node.value, node.capacity_left)
+        if node.branch == _Branch.INCLUDED:
+            # the included branch is represented by the nodes above this one
+            return self._bound(node.index + 1, node.value, node.capacity_left)
+        return 0
+
+    def _bound(self, index: int, value: int, capacity_left: int) -> float:
+        if index >= len(self._items):
+            return value
+        limit = self._prefix_weights[index] + capacity_left
+        last_fitting = bisect.bisect_right(self._prefix_weights, limit) - 1
+        bound: float = value + (
+            self._prefix_values[last_fitting] - self._prefix_values[index]
+        )
+        if last_fitting < len(self._items):
+            room = limit - self._prefix_weights[last_fitting]
+            bound += self._values[last_fitting] * room / self._weights[last_fitting]
+        return bound
+
+    def _to_incumbent(
+        self,
+        value: int,
+        chosen: list[tuple[Item[T], list[int]]],
+        matching: BipartiteCapacityMatching[T],
+    ) -> Incumbent[T]:
+        return Incumbent(
+            value,
+            {item: set(matching.capacities_of(demands)) for item, demands in chosen},
+        )
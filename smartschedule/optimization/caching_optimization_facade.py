@@ -0,0 +1,113 @@
+from typing import Any, Callable, Hashable, TypeVar
+
+from smartschedule.optimization.capacity_dimension import CapacityDimension
+from smartschedule.optimization.compact_problem import CompactProblem
+from smartschedule.optimization.compact_solution import CompactSolution
+from smartschedule.optimization.item import Item
+from smartschedule.optimization.matching_strategy import MatchingStrategy
+from smartschedule.optimization.optimization_facade import OptimizationFacade
+from smartschedule.optimization.optimization_result_cache import (
+    OptimizationResultCache,
+)
+from smartschedule.optimization.result import Result
+from smartschedule.optimization.solver_engine import SolverEngine
+from smartschedule.optimization.solver_statistics import SolverStatisticsListeners
+from smartschedule.optimization.total_capacity import TotalCapacity
+from smartschedule.shared.typing_extensions import Comparable
+
+T = TypeVar("T", bound=CapacityDimension)
+
+
+class CachingOptimizationFacade(OptimizationFacade):
+    def __init__(
+        self,
+        cache: OptimizationResultCache,
+        statistics_listeners: SolverStatisticsListeners | None = None,
+    ) -> None:
+        super().__init__(statistics_listeners)
+        self._cache = cache
+
+    @property
+    def cache(self) -> OptimizationResultCache:
+        return self._cache
+
+    def calculate(
+        self,
+        items: list[Item[T]],
+        total_capacity: TotalCapacity,
+        sort_key_getter: Callable[[Item[T]], Comparable] | None = None,
+        engine: SolverEngine = SolverEngine.PURE_PYTHON,
+        matching: MatchingStrategy = MatchingStrategy.FIRST_FIT,
+    ) -> Result[T]:
+        sort_key_getter = sort_key_getter or (lambda x: -x.value)
+        described = self._described(items, sort_key_getter)
+        try:
+            key = self._fingerprint(described, total_capacity, matching)
+        except TypeError:  # some dimension is not hashable, so it can't be cached
+            return super().calculate(
+                items, total_capacity, sort_key_getter, engine, matching
+            )
+
+        cached: Result[T] | None = self._cache.get(key)
+        if cached is None:
+            cached = super().calculate(
+                items, total_capacity, sort_key_getter, engine, matching
+            )
+            self._cache.put(key, cached)
+        # every caller gets its own containers, the cached ones stay untouched
+        return Result(
+            cached.profit,
+            list(cached.chosen_items),
+            {
+                item: set(capacities)
+                for item, capacities in cached.item_to_capacities.items()
+            },
+        )
+
+    def calculate_compact(
+        self,
+        problem: CompactProblem,
+        engine: SolverEngine = SolverEngine.PURE_PYTHON,
+    ) -> CompactSolution:
+        # solutions refer to items and capacities by position, so order matters here
+        key = (CompactProblem, problem.fingerprint())
+        cached: CompactSolution | None = self._cache.get(key)
+        if cached is None:
+            cached = super().calculate_compact(problem, engine)
+            self._cache.put(key, cached)
+        return CompactSolution(
+            cached.profit,
+            list(cached.chosen_items),
+            {
+                item: list(capacities)
+                for item, capacities in cached.item_to_capacities.items()
+            },
+        )
+
+    def _described(
+        self,
+        items: list[Item[T]],
+        sort_key_getter: Callable[[Item[T]], Comparable],
+    ) -> list[tuple[Any, ...]]:
+        return [
+            (
+                item.name,
+                item.value,
+                tuple(item.total_weight.components),
+                sort_key_getter(item),
+            )
+            for item in items
+        ]
+
+    def _fingerprint(
+        self,
+        described_items: list[tuple[Any, ...]],
+        total_capacity: TotalCapacity,
+        matching: MatchingStrategy,
+    ) -> Hashable:
+        # first-fit depends on the order of capacities and of items with equal keys
+        return (
+            tuple(described_items),
+            tuple(total_capacity.capacities),
+            matching,
+        )
@@ -1,2 +1,7 @@
+from typing import Hashable, Iterable
+
+
 class CapacityDimension:
-    pass
+    def index_keys(self) -> Iterable[Hashable] | None:
+        # None means the capacity is offered to every weight, indexed or not
+        return None
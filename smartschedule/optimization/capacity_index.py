@@ -0,0 +1,104 @@
+import heapq
+from collections import defaultdict
+from typing import Hashable, Sequence
+
+from smartschedule.optimization.capacity_dimension import CapacityDimension
+from smartschedule.optimization.total_weight import TotalWeight
+from smartschedule.optimization.weight_dimension import WeightDimension
+
+
+class _Bucket:
+    def __init__(self) -> None:
+        self.positions: list[int] = []
+        self.first_not_consumed = 0
+
+
+class CapacityIndex[T: CapacityDimension]:
+    def __init__(self, capacities: Sequence[T]) -> None:
+        self._capacities = capacities
+        self._consumed = [False] * len(capacities)
+        self._positions_of: dict[T, list[int]] = defaultdict(list)
+        self._all = _Bucket()
+        self._not_keyed = _Bucket()
+        self._keyed: dict[Hashable, _Bucket] = defaultdict(_Bucket)
+        self._comparisons = 0
+        for position, capacity in enumerate(capacities):
+            self._positions_of[capacity].append(position)
+            self._all.positions.append(position)
+            keys = capacity.index_keys()
+            if keys is None:
+                self._not_keyed.positions.append(position)
+                continue
+            for key in set(keys):
+                self._keyed[key].positions.append(position)
+
+    @property
+    def comparisons(self) -> int:
+        return self._comparisons
+
+    def match(self, total_weight: TotalWeight[T]) -> list[T]:
+        result = []
+        for weight_component in total_weight.components:
+            matching_capacity = self._first_satisfying(weight_component)
+            if matching_capacity is None:
+                return []
+            result.append(matching_capacity)
+        return result
+
+    def positions_satisfying(self, weight: WeightDimension[T]) -> list[int]:
+        positions = heapq.merge(
+            *(bucket.positions for bucket in self._buckets_for(weight))
+        )
+        not_consumed = [
+            position for position in positions if not self._consumed[position]
+        ]
+        self._comparisons += len(not_consumed)
+        return [
+            position
+            for position in not_consumed
+            if weight.is_satisfied_by(self._capacities[position])
+        ]
+
+    def can_satisfy(self, weight: WeightDimension[T]) -> bool:
+        return self._first_satisfying(weight) is not None
+
+    def capacity_at(self, position: int) -> T:
+        return self._capacities[position]
+
+    def remove(self, capacities: list[T]) -> None:
+        for capacity in capacities:
+            for position in self._positions_of.pop(capacity, []):
+                self._consumed[position] = True
+
+    def _first_satisfying(self, weight: WeightDimension[T]) -> T | None:
+        buckets = self._buckets_for(weight)
+        # capacities are offered in their original order, as if scanned one by one
+        positions = (self._first_satisfying_in(bucket, weight) for bucket in buckets)
+        first = min((p for p in positions if p is not None), default=None)
+        return None if first is None else self._capacities[first]
+
+    def _buckets_for(self, weight: WeightDimension[T]) -> list[_Bucket]:
+        key = weight.index_key()
+        if key is None:
+            return [self._all]
+        if key in self._keyed:
+            return [self._keyed[key], self._not_keyed]
+        return [self._not_keyed]
+
+    def _first_satisfying_in(
+        self, bucket: _Bucket, weight: WeightDimension[T]
+    ) -> int | None:
+        positions = bucket.positions
+        while (
+            bucket.first_not_consumed < len(positions)
+            and self._consumed[positions[bucket.first_not_consumed]]
+        ):
+            bucket.first_not_consumed += 1
+        for index in range(bucket.first_not_consumed, len(positions)):
+            position = positions[index]
+            if self._consumed[position]:
+                continue
+            self._comparisons += 1
+            if weight.is_satisfied_by(self._capacities[position]):
+                return position
+        return None
@@ -0,0 +1,64 @@
+from collections import defaultdict
+
+from smartschedule.optimization.compact_problem import CompactProblem
+
+
+class CompactFirstFit:
+    """First-fit matching of a compact problem, same as ``CapacityIndex`` does."""
+
+    def __init__(self, problem: CompactProblem) -> None:
+        self._demand_offsets = problem.demand_offsets.tolist()
+        self._demand_keys = problem.demand_keys.tolist()
+        self._demand_starts = problem.demand_starts.tolist()
+        self._demand_ends = problem.demand_ends.tolist()
+        self._identities = problem.capacity_identities.tolist()
+        self._starts = problem.capacity_starts.tolist()
+        self._ends = problem.capacity_ends.tolist()
+        self._consumed = [False] * (max(self._identities, default=-1) + 1)
+        self._buckets: dict[int, list[int]] = defaultdict(list)
+        key_offsets = problem.capacity_key_offsets.tolist()
+        keys = problem.capacity_keys.tolist()
+        for position in range(problem.capacities_count):
+            for key in keys[key_offsets[position] : key_offsets[position + 1]]:
+                self._buckets[key].append(position)
+        self._first_not_consumed = dict.fromkeys(self._buckets, 0)
+        self._comparisons = 0
+
+    @property
+    def comparisons(self) -> int:
+        return self._comparisons
+
+    def match(self, item: int) -> list[int]:
+        result = []
+        for demand in range(self._demand_offsets[item], self._demand_offsets[item + 1]):
+            position = self._first_satisfying(demand)
+            if position is None:
+                return []
+            result.append(position)
+        return result
+
+    def remove(self, positions: list[int]) -> None:
+        for position in positions:
+            self._consumed[self._identities[position]] = True
+
+    def _first_satisfying(self, demand: int) -> int | None:
+        key = self._demand_keys[demand]
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return None
+        consumed, identities = self._consumed, self._identities
+        first = self._first_not_consumed[key]
+        while first < len(bucket) and consumed[identities[bucket[first]]]:
+            first += 1
+        self._first_not_consumed[key] = first
+
+        start, end = self._demand_starts[demand], self._demand_ends[demand]
+        starts, ends = self._starts, self._ends
+        for index in range(first, len(bucket)):
+            position = bucket[index]
+            if consumed[identities[position]]:
+                continue
+            self._comparisons += 1
+            if starts[position] <= start and end <= ends[position]:
+                return position
+        return None
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from typing import Hashable
+
+
+@dataclass(frozen=True)
+class CompactProblem:
+    """Items and capacities as parallel arrays of interned keys and integer bounds.
+
+    Item ``i`` demands ``demand_offsets[i]`` up to ``demand_offsets[i + 1]``,
+    capacity ``p`` performs ``capacity_key_offsets[p]`` up to
+    ``capacity_key_offsets[p + 1]``. A demand is satisfied by a capacity that
+    performs its key and whose bounds contain the demand's bounds. Capacities
+    with the same identity are consumed together.
+    """
+
+    item_names: list[str]
+    item_values: array[float]
+    demand_offsets: array[int]
+    demand_keys: array[int]
+    demand_starts: array[int]
+    demand_ends: array[int]
+    capacity_identities: array[int]
+    capacity_key_offsets: array[int]
+    capacity_keys: array[int]
+    capacity_starts: array[int]
+    capacity_ends: array[int]
+
+    @property
+    def items_count(self) -> int:
+        return len(self.item_names)
+
+    @property
+    def capacities_count(self) -> int:
+        return len(self.capacity_identities)
+
+    def fingerprint(self) -> Hashable:
+        return (
+            tuple(self.item_names),
+            *(
+                values.tobytes()
+                for values in (
+                    self.item_values,
+                    self.demand_offsets,
+                    self.demand_keys,
+                    self.demand_starts,
+                    self.demand_ends,
+                    self.capacity_identities,
+                    self.capacity_key_offsets,
+                    self.capacity_keys,
+                    self.capacity_starts,
+                    self.capacity_ends,
+                )
+            ),
+        )
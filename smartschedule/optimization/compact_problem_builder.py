@@ -0,0 +1,65 @@
+from array import array
+from typing import Hashable, Iterable
+
+from smartschedule.optimization.compact_problem import CompactProblem
+
+
+class CompactProblemBuilder:
+    def __init__(self) -> None:
+        self._keys: dict[Hashable, int] = {}
+        self._identities: dict[Hashable, int] = {}
+        self._item_names: list[str] = []
+        self._item_values = array("d")
+        self._demand_offsets = array("q", [0])
+        self._demand_keys = array("q")
+        self._demand_starts = array("q")
+        self._demand_ends = array("q")
+        self._capacity_identities = array("q")
+        self._capacity_key_offsets = array("q", [0])
+        self._capacity_keys = array("q")
+        self._capacity_starts = array("q")
+        self._capacity_ends = array("q")
+
+    def add_item(
+        self,
+        name: str,
+        value: float,
+        demands: Iterable[tuple[Hashable, int, int]],
+    ) -> None:
+        self._item_names.append(name)
+        self._item_values.append(value)
+        for key, start, end in demands:
+            self._demand_keys.append(self._intern(key))
+            self._demand_starts.append(start)
+            self._demand_ends.append(end)
+        self._demand_offsets.append(len(self._demand_keys))
+
+    def add_capacity(
+        self, identity: Hashable, keys: Iterable[Hashable], start: int, end: int
+    ) -> None:
+        self._capacity_identities.append(
+            self._identities.setdefault(identity, len(self._identities))
+        )
+        self._capacity_keys.extend(self._intern(key) for key in set(keys))
+        self._capacity_key_offsets.append(len(self._capacity_keys))
+        self._capacity_starts.append(start)
+        self._capacity_ends.append(end)
+
+    def build(self) -> CompactProblem:
+        # copies, so the builder can keep growing without changing built problems
+        return CompactProblem(
+            list(self._item_names),
+            array("d", self._item_values),
+            array("q", self._demand_offsets),
+            array("q", self._demand_keys),
+            array("q", self._demand_starts),
+            array("q", self._demand_ends),
+            array("q", self._capacity_identities),
+            array("q", self._capacity_key_offsets),
+            array("q", self._capacity_keys),
+            array("q", self._capacity_starts),
+            array("q", self._capacity_ends),
+        )
+
+    def _intern(self, key: Hashable) -> int:
+        return self._keys.setdefault(key, len(self._keys))
@@ -0,0 +1,8 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class CompactSolution:
+    profit: float
+    chosen_items: list[int]
+    item_to_capacities: dict[int, list[int]]
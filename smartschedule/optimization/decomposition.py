@@ -0,0 +1,58 @@
+from dataclasses import dataclass
+from typing import Sequence
+
+from smartschedule.optimization.capacity_dimension import CapacityDimension
+from smartschedule.optimization.capacity_index import CapacityIndex
+from smartschedule.optimization.item import Item
+
+
+@dataclass(frozen=True)
+class Component:
+    item_indices: list[int]
+    capacity_positions: list[int]
+
+
+class _DisjointSets:
+    def __init__(self, size: int) -> None:
+        self._parent = list(range(size))
+
+    def find(self, element: int) -> int:
+        root = element
+        while self._parent[root] != root:
+            root = self._parent[root]
+        while self._parent[element] != root:
+            self._parent[element], element = root, self._parent[element]
+        return root
+
+    def union(self, first: int, second: int) -> None:
+        self._parent[self.find(first)] = self.find(second)
+
+
+def split_into_components[T: CapacityDimension](
+    items: Sequence[Item[T]], capacities: Sequence[T]
+) -> list[Component]:
+    # items are nodes 0..len(items)-1, capacities follow them
+    capacity_index = CapacityIndex(capacities)
+    sets = _DisjointSets(len(items) + len(capacities))
+    connected_items = []
+    for item_index, item in enumerate(items):
+        positions = [
+            position
+            for weight_component in item.total_weight.components
+            for position in capacity_index.positions_satisfying(weight_component)
+        ]
+        if not positions:
+            continue
+        connected_items.append(item_index)
+        for position in positions:
+            sets.union(item_index, len(items) + position)
+
+    components: dict[int, Component] = {}
+    for item_index in connected_items:
+        root = sets.find(item_index)
+        components.setdefault(root, Component([], [])).item_indices.append(item_index)
+    for position in range(len(capacities)):
+        component = components.get(sets.find(len(items) + position))
+        if component is not None:
+            component.capacity_positions.append(position)
+    return list(components.values())
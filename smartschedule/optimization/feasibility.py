@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+
+from smartschedule.optimization.capacity_dimension import CapacityDimension
+from smartschedule.optimization.item import Item
+
+
+@dataclass(frozen=True)
+class Feasibility[T: CapacityDimension]:
+    unsatisfiable_items: list[Item[T]]
+
+    def is_feasible(self) -> bool:
+        return len(self.unsatisfiable_items) == 0
@@ -0,0 +1,271 @@
+import bisect
+import itertools
+import math
+import time
+from datetime import timedelta
+from typing import Callable, Sequence
+
+from smartschedule.optimization import knapsack
+from smartschedule.optimization.capacity_dimension import CapacityDimension
+from smartschedule.optimization.capacity_index import CapacityIndex
+from smartschedule.optimization.item import Item
+from smartschedule.optimization.result import Result
+from smartschedule.optimization.solver_engine import SolverEngine
+from smartschedule.optimization.solver_statistics import (
+    SolverStatistics,
+    SolverStatisticsListeners,
+)
+from smartschedule.shared.typing_extensions import Comparable
+
+
+class IncrementalOptimization[T: CapacityDimension]:
+    """First-fit solve that is kept up to date as capacities and items change.
+
+    Items matched before the first item a change can affect keep their capacities,
+    so only the items after it are matched again and the DP resumes from the
+    closest checkpoint row. Rows are kept a bit wider than needed, so capacities
+    can be added without rebuilding them. Each change returns the profit delta.
+    """
+
+    def __init__(
+        self,
+        items: Sequence[Item[T]],
+        capacities: Sequence[T],
+        sort_key_getter: Callable[[Item[T]], Comparable],
+        engine: SolverEngine = SolverEngine.PURE_PYTHON,
+        statistics_listeners: SolverStatisticsListeners | None = None,
+    ) -> None:
+        started = time.perf_counter()
+        self._statistics_listeners = (
+            SolverStatisticsListeners()
+            if statistics_listeners is None
+            else statistics_listeners
+        )
+        self._sort_key_getter = sort_key_getter
+        self._vectorized = (
+            engine == SolverEngine.NUMPY and knapsack.is_vectorization_available()
+        )
+        self._arrivals = itertools.count()
+        self._capacities = list(capacities)
+        self._automatically_included_items = [
+            item for item in items if item.is_weight_zero()
+        ]
+        # ties are broken by arrival, as the stable sort of calculate does
+        entries = sorted(
+            (sort_key_getter(item), next(self._arrivals), item)
+            for item in items
+            if not item.is_weight_zero()
+        )
+        self._keys: list[tuple[Comparable, int]] = [
+            (key, arrival) for key, arrival, _ in entries
+        ]
+        self._items: list[Item[T]] = [item for _, _, item in entries]
+        self._matched: list[list[T]] = []
+        self._values: list[int] = []
+        self._weights: list[int] = []
+        self._checkpoints: list[list[int]] = []
+        self._final_row: list[int] = []
+        self._result: Result[T] | None = None
+        self._rebuild(started)
+
+    @property
+    def profit(self) -> float:
+        return self._final_row[len(self._capacities)] + sum(
+            item.value for item in self._automatically_included_items
+        )
+
+    @property
+    def result(self) -> Result[T]:
+        if self._result is None:
+            considered_items = [
+                item
+                for item, chosen_capacities in zip(self._items, self._matched)
+                if chosen_capacities
+            ]
+            if self._vectorized:
+                _, chosen_indices = knapsack.solve_vectorized(
+                    self._values, self._weights, len(self._capacities)
+                )
+            else:
+                _, chosen_indices = knapsack.solve(
+                    self._values, self._weights, len(self._capacities)
+                )
+            item_to_capacities: dict[Item[T], set[CapacityDimension]] = {
+                item: set(chosen_capacities)
+                for item, chosen_capacities in zip(self._items, self._matched)
+                if chosen_capacities
+            }
+            self._result = Result(
+                self.profit,
+                [considered_items[index] for index in chosen_indices]
+                + self._automatically_included_items,
+                item_to_capacities,
+            )
+        return self._result
+
+    def add_capacity(self, capacity: T) -> float:
+        started = time.perf_counter()
+        profit_before = self.profit
+        self._capacities.append(capacity)
+        if len(self._capacities) >= len(self._final_row):
+            self._rebuild(started)
+        else:
+            # appended last, so only items that failed without it can change
+            self._resolve_from(self._first_failed_helped_by(capacity), started)
+        return self.profit - profit_before
+
+    def remove_capacity(self, capacity: T) -> float:
+        started = time.perf_counter()
+        profit_before = self.profit
+        # the last equal one, so adding and removing a capacity restores the order
+        position = len(self._capacities) - 1 - self._capacities[::-1].index(capacity)
+        del self._capacities[position]
+        first_user = next(
+            (
+                position
+                for position, chosen_capacities in enumerate(self._matched)
+                if capacity in chosen_capacities
+            ),
+            None,
+        )
+        self._resolve_from(first_user, started)
+        return self.profit - profit_before
+
+    def add_item(self, item: Item[T]) -> float:
+        started = time.perf_counter()
+        profit_before = self.profit
+        self._resolve_from(self._insert(item, next(self._arrivals)), started)
+        return self.profit - profit_before
+
+    def remove_item(self, item: Item[T]) -> float:
+        started = time.perf_counter()
+        profit_before = self.profit
+        self._resolve_from(self._remove(item)[0], started)
+        return self.profit - profit_before
+
+    def replace_item(self, old_item: Item[T], new_item: Item[T]) -> float:
+        started = time.perf_counter()
+        profit_before = self.profit
+        removed_at, arrival = self._remove(old_item)
+        # keeps the place of the replaced item among equal sort keys
+        inserted_at = self._insert(new_item, arrival)
+        changed_at = [
+            position for position in (removed_at, inserted_at) if position is not None
+        ]
+        self._resolve_from(min(changed_at, default=None), started)
+        return self.profit - profit_before
+
+    def _insert(self, item: Item[T], arrival: int) -> int | None:
+        if item.is_weight_zero():
+            self._automatically_included_items.append(item)
+            return None
+        key = (self._sort_key_getter(item), arrival)
+        position = bisect.bisect_right(self._keys, key)
+        self._keys.insert(position, key)
+        self._items.insert(position, item)
+        self._matched.insert(position, [])
+        return position
+
+    def _remove(self, item: Item[T]) -> tuple[int | None, int]:
+        if item.is_weight_zero():
+            self._automatically_included_items.remove(item)
+            return None, next(self._arrivals)
+        position = self._items.index(item)
+        _, arrival = self._keys.pop(position)
+        del self._items[position]
+        chosen_capacities = self._matched.pop(position)
+        if not chosen_capacities:
+            # it consumed nothing, so nothing after it changes
+            return None, arrival
+        # the considered items change even when it was the last one
+        return position, arrival
+
+    def _first_failed_helped_by(self, capacity: T) -> int | None:
+        for position, (item, chosen_capacities) in enumerate(
+            zip(self._items, self._matched)
+        ):
+            if not chosen_capacities and any(
+                weight_component.is_satisfied_by(capacity)
+                for weight_component in item.total_weight.components
+            ):
+                return position
+        return None
+
+    def _rebuild(self, started: float) -> None:
+        self._final_row = []
+        self._matched = []
+        self._values = []
+        self._weights = []
+        width = len(self._capacities) + 1
+        self._checkpoints = [[0] * (width + max(8, width // 8))]
+        self._checkpoint_every = max(1, math.isqrt(len(self._items)))
+        self._resolve_from(0, started)
+
+    def _resolve_from(self, position: int | None, started: float) -> None:
+        self._result = None
+        # None when no item has to be matched again
+        if position is None:
+            return
+        matching_started = time.perf_counter()
+        capacity_index = CapacityIndex(self._capacities)
+        for chosen_capacities in self._matched[:position]:
+            capacity_index.remove(chosen_capacities)
+        del self._matched[position:]
+        for item in self._items[position:]:
+            chosen_capacities = capacity_index.match(item.total_weight)
+            capacity_index.remove(chosen_capacities)
+            self._matched.append(chosen_capacities)
+        matched_at = time.perf_counter()
+
+        considered_before = sum(
+            1 for chosen_capacities in self._matched[:position] if chosen_capacities
+        )
+        self._values = [
+            int(item.value)
+            for item, chosen_capacities in zip(self._items, self._matched)
+            if chosen_capacities
+        ]
+        self._weights = [
+            len(chosen_capacities)
+            for chosen_capacities in self._matched
+            if chosen_capacities
+        ]
+
+        checkpoint = considered_before // self._checkpoint_every
+        del self._checkpoints[checkpoint + 1 :]
+        row = self._checkpoints[checkpoint]
+        start = advanced_from = checkpoint * self._checkpoint_every
+        while start + self._checkpoint_every <= len(self._values):
+            end = start + self._checkpoint_every
+            row = self._advance(row, self._values[start:end], self._weights[start:end])
+            self._checkpoints.append(row)
+            start = end
+        self._final_row = self._advance(
+            row, self._values[start:], self._weights[start:]
+        )
+        if self._statistics_listeners.listening:
+            self._statistics_listeners.emit(
+                SolverStatistics(
+                    timedelta(seconds=matching_started - started),
+                    timedelta(seconds=matched_at - matching_started),
+                    timedelta(seconds=time.perf_counter() - matched_at),
+                    len(self._items) + len(self._automatically_included_items),
+                    len(self._capacities),
+                    len(self._values),
+                    len(self._items) - len(self._values),
+                    capacity_index.comparisons,
+                    sum(
+                        len(row) - weight
+                        for weight in self._weights[advanced_from:]
+                        if weight < len(row)
+                    ),
+                    max(len(self._items), len(row), len(self._checkpoints)),
+                )
+            )
+
+    def _advance(
+        self, dp: list[int], values: list[int], weights: list[int]
+    ) -> list[int]:
+        if self._vectorized:
+            return knapsack.advance_vectorized(dp, values, weights)
+        return knapsack.advance(dp, values, weights)
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None  # type: ignore[assignment]
+
+
+@dataclass(frozen=True, slots=True)
+class _Choice:
+    index: int
+    previous: _Choice | None
+
+
+def is_vectorization_available() -> bool:
+    return numpy is not None
+
+
+def solve(
+    values: list[int], weights: list[int], capacity: int
+) -> tuple[int, list[int]]:
+    dp = [0] * (capacity + 1)
+    # Every cell only points at the last item chosen for it, which in turn points
+    # at the cell it extended. Chosen items are rebuilt once, at the very end.
+    last_choice: list[_Choice | None] = [None] * (capacity + 1)
+    for index, (value, weight) in enumerate(zip(values, weights)):
+        for j in range(capacity, weight - 1, -1):
+            if dp[j] < value + dp[j - weight]:
+                dp[j] = value + dp[j - weight]
+                last_choice[j] = _Choice(index, last_choice[j - weight])
+
+    chosen = []
+    choice = last_choice[capacity]
+    while choice is not None:
+        chosen.append(choice.index)
+        choice = choice.previous
+    chosen.reverse()
+    return dp[capacity], chosen
+
+
+def solve_vectorized(
+    values: list[int], weights: list[int], capacity: int
+) -> tuple[int, list[int]]:
+    assert numpy is not None
+    dp = numpy.zeros(capacity + 1, dtype=numpy.int64)
+    # One boolean row per item marking cells it improved - enough to walk back.
+    improved_rows: list[numpy.typing.NDArray[numpy.bool_] | None] = []
+    for value, weight in zip(values, weights):
+        if weight > capacity:
+            improved_rows.append(None)
+            continue
+        candidates = dp[: capacity + 1 - weight] + value
+        improved = candidates > dp[weight:]
+        numpy.copyto(dp[weight:], candidates, where=improved)
+        improved_rows.append(improved)
+
+    chosen = []
+    j = capacity
+    for index in range(len(values) - 1, -1, -1):
+        improved_row = improved_rows[index]
+        weight = weights[index]
+        if improved_row is not None and j >= weight and improved_row[j - weight]:
+            chosen.append(index)
+            j -= weight
+    chosen.reverse()
+    return int(dp[capacity]), chosen
+
+
+def advance(dp: list[int], values: list[int], weights: list[int]) -> list[int]:
+    dp = dp.copy()
+    for value, weight in zip(values, weights):
+        for j in range(len(dp) - 1, weight - 1, -1):
+            if dp[j] < value + dp[j - weight]:
+                dp[j] = value + dp[j - weight]
+    return dp
+
+
+def advance_vectorized(
+    dp: list[int], values: list[int], weights: list[int]
+) -> list[int]:
+    assert numpy is not None
+    row = numpy.array(dp, dtype=numpy.int64)
+    for value, weight in zip(values, weights):
+        if weight >= len(row):
+            continue
+        candidates = row[: len(row) - weight] + value
+        numpy.maximum(row[weight:], candidates, out=row[weight:])
+    return [int(cell) for cell in row]
@@ -0,0 +1,111 @@
+import math
+from typing import Sequence
+
+from smartschedule.optimization import knapsack
+from smartschedule.optimization.capacity_dimension import CapacityDimension
+from smartschedule.optimization.capacity_index import CapacityIndex
+from smartschedule.optimization.item import Item
+from smartschedule.optimization.solver_engine import SolverEngine
+
+
+class MarginalCapacityAnalysis[T: CapacityDimension]:
+    """Baseline first-fit solve that answers "what if one more capacity was there".
+
+    An additional capacity is appended after all others, so items matched before
+    the first failed item it could help are matched exactly as in the baseline.
+    Only the remaining items are matched again, and the DP continues from the
+    closest checkpoint of baseline rows, which are kept one cell wider for it.
+    """
+
+    def __init__(
+        self,
+        sorted_items: Sequence[Item[T]],
+        capacities: Sequence[T],
+        engine: SolverEngine = SolverEngine.PURE_PYTHON,
+    ) -> None:
+        self._vectorized = (
+            engine == SolverEngine.NUMPY and knapsack.is_vectorization_available()
+        )
+        self._items = [item for item in sorted_items if not item.is_weight_zero()]
+        self._capacities = list(capacities)
+        self._guaranteed_value = sum(
+            item.value for item in sorted_items if item.is_weight_zero()
+        )
+
+        capacity_index = CapacityIndex(self._capacities)
+        self._matched: list[list[T]] = []
+        self._failed: list[int] = []
+        self._values: list[int] = []
+        self._weights: list[int] = []
+        self._matched_before: list[int] = []
+        for index, item in enumerate(self._items):
+            self._matched_before.append(len(self._values))
+            chosen_capacities = capacity_index.match(item.total_weight)
+            capacity_index.remove(chosen_capacities)
+            self._matched.append(chosen_capacities)
+            if not chosen_capacities:
+                self._failed.append(index)
+                continue
+            self._values.append(int(item.value))
+            self._weights.append(len(chosen_capacities))
+
+        self._checkpoint_every = max(1, math.isqrt(len(self._values)))
+        self._checkpoints = [[0] * (len(self._capacities) + 2)]
+        for start in range(0, len(self._values), self._checkpoint_every):
+            end = start + self._checkpoint_every
+            self._checkpoints.append(
+                self._advance(
+                    self._checkpoints[-1],
+                    self._values[start:end],
+                    self._weights[start:end],
+                )
+            )
+        self._final_row = self._checkpoints[-1]
+
+    @property
+    def profit(self) -> float:
+        return self._final_row[len(self._capacities)] + self._guaranteed_value
+
+    def profit_with(self, additional_capacity: T) -> float:
+        resume_at = self._first_item_helped_by(additional_capacity)
+        if resume_at is None:
+            best_value = self._final_row[len(self._capacities) + 1]
+            return best_value + self._guaranteed_value
+
+        capacity_index = CapacityIndex([*self._capacities, additional_capacity])
+        for chosen_capacities in self._matched[:resume_at]:
+            capacity_index.remove(chosen_capacities)
+        values = []
+        weights = []
+        for item in self._items[resume_at:]:
+            chosen_capacities = capacity_index.match(item.total_weight)
+            capacity_index.remove(chosen_capacities)
+            if chosen_capacities:
+                values.append(int(item.value))
+                weights.append(len(chosen_capacities))
+
+        matched_before = self._matched_before[resume_at]
+        checkpoint = matched_before // self._checkpoint_every
+        replayed_from = checkpoint * self._checkpoint_every
+        row = self._advance(
+            self._checkpoints[checkpoint],
+            self._values[replayed_from:matched_before] + values,
+            self._weights[replayed_from:matched_before] + weights,
+        )
+        return row[len(self._capacities) + 1] + self._guaranteed_value
+
+    def _first_item_helped_by(self, additional_capacity: T) -> int | None:
+        for index in self._failed:
+            if any(
+                weight_component.is_satisfied_by(additional_capacity)
+                for weight_component in self._items[index].total_weight.components
+            ):
+                return index
+        return None
+
+    def _advance(
+        self, dp: list[int], values: list[int], weights: list[int]
+    ) -> list[int]:
+        if self._vectorized:
+            return knapsack.advance_vectorized(dp, values, weights)
+        return knapsack.advance(dp, values, weights)
@@ -0,0 +1,6 @@
+from enum import StrEnum, auto
+
+
+class MatchingStrategy(StrEnum):
+    FIRST_FIT = auto()
+    BIPARTITE = auto()
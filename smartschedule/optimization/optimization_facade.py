@@ -1,96 +1,523 @@
-from typing import Callable, TypeVar
+import itertools
+import time
+from concurrent.futures import Executor
+from datetime import timedelta
+from typing import Callable, Iterable, Sequence, TypeVar
 
+from smartschedule.optimization import decomposition, knapsack
+from smartschedule.optimization.bipartite_capacity_matching import (
+    BipartiteCapacityMatching,
+)
+from smartschedule.optimization.bounded_result import BoundedResult
+from smartschedule.optimization.branch_and_bound import BranchAndBound, Incumbent
 from smartschedule.optimization.capacity_dimension import CapacityDimension
+from smartschedule.optimization.capacity_index import CapacityIndex
+from smartschedule.optimization.compact_first_fit import CompactFirstFit
+from smartschedule.optimization.compact_problem import CompactProblem
+from smartschedule.optimization.compact_solution import CompactSolution
+from smartschedule.optimization.feasibility import Feasibility
+from smartschedule.optimization.incremental_optimization import (
+    IncrementalOptimization,
+)
 from smartschedule.optimization.item import Item
+from smartschedule.optimization.marginal_capacity_analysis import (
+    MarginalCapacityAnalysis,
+)
+from smartschedule.optimization.matching_strategy import MatchingStrategy
 from smartschedule.optimization.result import Result
+from smartschedule.optimization.solver_engine import SolverEngine
+from smartschedule.optimization.solver_statistics import (
+    SolverStatistics,
+    SolverStatisticsListener,
+    SolverStatisticsListeners,
+)
+from smartschedule.optimization.top_items import TopItems
 from smartschedule.optimization.total_capacity import TotalCapacity
-from smartschedule.optimization.total_weight import TotalWeight
+from smartschedule.optimization.weight_dimension import WeightDimension
 from smartschedule.shared.typing_extensions import Comparable
 
 T = TypeVar("T", bound=CapacityDimension)
 
+_ComponentSolution = tuple[
+    float, list[int], dict[int, list[int]], list[SolverStatistics]
+]
+
 
 class OptimizationFacade:
+    def __init__(
+        self, statistics_listeners: SolverStatisticsListeners | None = None
+    ) -> None:
+        # facades given the same listeners report to all of them
+        self._statistics_listeners = (
+            SolverStatisticsListeners()
+            if statistics_listeners is None
+            else statistics_listeners
+        )
+
+    def add_statistics_listener(self, listener: SolverStatisticsListener) -> None:
+        self._statistics_listeners.add(listener)
+
     def calculate(
         self,
         items: list[Item[T]],
         total_capacity: TotalCapacity,
         sort_key_getter: Callable[[Item[T]], Comparable] | None = None,
+        engine: SolverEngine = SolverEngine.PURE_PYTHON,
+        matching: MatchingStrategy = MatchingStrategy.FIRST_FIT,
     ) -> Result[T]:
+        started = time.perf_counter()
         sort_key_getter = sort_key_getter or (lambda x: -x.value)
 
-        capacities_size = len(total_capacity)
-        dp = [0] * (capacities_size + 1)
-        chosen_items_list: list[list[Item[T]]] = [
-            [] for _ in range(capacities_size + 1)
-        ]
-        allocated_capacities_list: list[set[CapacityDimension]] = [
-            set() for _ in range(capacities_size + 1)
+        automatically_included_items = [item for item in items if item.is_weight_zero()]
+        guaranteed_value = sum(item.value for item in automatically_included_items)
+
+        sorted_items = sorted(items, key=sort_key_getter)
+        sorted_at = time.perf_counter()
+        capacities: list[T] = total_capacity.capacities  # type: ignore
+        if matching == MatchingStrategy.BIPARTITE:
+            matched_items, comparisons = self._match_bipartite(sorted_items, capacities)
+        else:
+            matched_items, comparisons = self._match_first_fit(sorted_items, capacities)
+        matched_at = time.perf_counter()
+
+        considered_items = [item for item, _ in matched_items]
+        values = [int(item.value) for item in considered_items]
+        weights = [len(chosen_capacities) for _, chosen_capacities in matched_items]
+        item_to_capacities_map: dict[Item[T], set[CapacityDimension]] = {
+            item: set(chosen_capacities) for item, chosen_capacities in matched_items
+        }
+
+        profit, chosen_indices = self._solve(
+            values, weights, len(total_capacity), engine
+        )
+        chosen_items = [considered_items[index] for index in chosen_indices]
+        chosen_items.extend(automatically_included_items)
+        if self._statistics_listeners.listening:
+            self._emit(
+                SolverStatistics(
+                    timedelta(seconds=sorted_at - started),
+                    timedelta(seconds=matched_at - sorted_at),
+                    timedelta(seconds=time.perf_counter() - matched_at),
+                    len(items),
+                    len(capacities),
+                    len(considered_items),
+                    len(items) - len(automatically_included_items) - len(matched_items),
+                    comparisons,
+                    _dp_cells(weights, len(capacities)),
+                    max(len(items), len(capacities) + 1),
+                )
+            )
+        return Result(
+            profit + guaranteed_value,
+            chosen_items,
+            item_to_capacities_map,
+        )
+
+    def calculate_streaming(
+        self,
+        items: Iterable[Item[T]],
+        total_capacity: TotalCapacity,
+        sort_key_getter: Callable[[Item[T]], Comparable] | None = None,
+        engine: SolverEngine = SolverEngine.PURE_PYTHON,
+        matching: MatchingStrategy = MatchingStrategy.FIRST_FIT,
+        max_items: int | None = None,
+    ) -> Result[T]:
+        """Solves the ``max_items`` items that sort first, reading ``items`` once.
+
+        Items with a demand no capacity could ever satisfy are never matched, so
+        they are dropped as they arrive. Without ``max_items`` the result is the
+        same as ``calculate`` gives for all items.
+        """
+        sort_key_getter = sort_key_getter or (lambda x: -x.value)
+        capacities: list[T] = total_capacity.capacities  # type: ignore
+        capacity_index = CapacityIndex(capacities)
+        satisfiable: dict[WeightDimension[T], bool] = {}
+
+        def can_ever_be_matched(item: Item[T]) -> bool:
+            for weight_component in item.total_weight.components:
+                try:
+                    can_satisfy = satisfiable[weight_component]
+                except KeyError:
+                    can_satisfy = satisfiable[weight_component] = (
+                        capacity_index.can_satisfy(weight_component)
+                    )
+                except TypeError:  # not hashable, so it is checked every time
+                    can_satisfy = capacity_index.can_satisfy(weight_component)
+                if not can_satisfy:
+                    return False
+            return True
+
+        automatically_included_items = []
+        top_items: TopItems[T] = TopItems(max_items)
+        for item in items:
+            if item.is_weight_zero():
+                automatically_included_items.append(item)
+            elif can_ever_be_matched(item):
+                top_items.offer(item, sort_key_getter(item))
+        return self.calculate(
+            [*automatically_included_items, *top_items.in_order()],
+            total_capacity,
+            _keep_given_order,
+            engine,
+            matching,
+        )
+
+    def calculate_compact(
+        self,
+        problem: CompactProblem,
+        engine: SolverEngine = SolverEngine.PURE_PYTHON,
+    ) -> CompactSolution:
+        started = time.perf_counter()
+        values = problem.item_values.tolist()
+        demand_offsets = problem.demand_offsets.tolist()
+        automatically_included_items = [
+            item
+            for item in range(problem.items_count)
+            if demand_offsets[item] == demand_offsets[item + 1]
         ]
+        guaranteed_value = sum(values[item] for item in automatically_included_items)
+
+        sorted_items = sorted(range(problem.items_count), key=lambda x: -values[x])
+        sorted_at = time.perf_counter()
+        matched_items, comparisons = self._match_compact_first_fit(
+            sorted_items, problem
+        )
+        matched_at = time.perf_counter()
+
+        considered_items = [item for item, _ in matched_items]
+        weights = [len(positions) for _, positions in matched_items]
+        profit, chosen_indices = self._solve(
+            [int(values[item]) for item in considered_items],
+            weights,
+            problem.capacities_count,
+            engine,
+        )
+        chosen_items = [considered_items[index] for index in chosen_indices]
+        chosen_items.extend(automatically_included_items)
+        if self._statistics_listeners.listening:
+            self._emit(
+                SolverStatistics(
+                    timedelta(seconds=sorted_at - started),
+                    timedelta(seconds=matched_at - sorted_at),
+                    timedelta(seconds=time.perf_counter() - matched_at),
+                    problem.items_count,
+                    problem.capacities_count,
+                    len(considered_items),
+                    problem.items_count
+                    - len(automatically_included_items)
+                    - len(matched_items),
+                    comparisons,
+                    _dp_cells(weights, problem.capacities_count),
+                    max(problem.items_count, problem.capacities_count + 1),
+                )
+            )
+        return CompactSolution(
+            profit + guaranteed_value,
+            chosen_items,
+            {item: sorted(set(positions)) for item, positions in matched_items},
+        )
 
+    def calculate_within(
+        self,
+        items: list[Item[T]],
+        total_capacity: TotalCapacity,
+        time_budget: timedelta,
+        sort_key_getter: Callable[[Item[T]], Comparable] | None = None,
+    ) -> BoundedResult[T]:
+        started = time.perf_counter()
+        deadline = time.monotonic() + time_budget.total_seconds()
+        sort_key_getter = sort_key_getter or (lambda x: -x.value)
         automatically_included_items = [item for item in items if item.is_weight_zero()]
         guaranteed_value = sum(item.value for item in automatically_included_items)
+        sorted_items = sorted(items, key=sort_key_getter)
+        sorted_at = time.perf_counter()
+        capacities: list[T] = total_capacity.capacities  # type: ignore
+        # the greedy pass shares the budget, so it is cut short on large inputs
+        initial_incumbent, comparisons = self._greedy_incumbent(
+            sorted_items, capacities, deadline
+        )
+        matched_at = time.perf_counter()
+
+        branch_and_bound = BranchAndBound(items, capacities)
+        incumbent, upper_bound = branch_and_bound.search(initial_incumbent, deadline)
+        if self._statistics_listeners.listening:
+            self._emit(
+                SolverStatistics(
+                    timedelta(seconds=sorted_at - started),
+                    timedelta(seconds=matched_at - sorted_at),
+                    timedelta(seconds=time.perf_counter() - matched_at),
+                    len(items),
+                    len(capacities),
+                    branch_and_bound.items,
+                    len(items)
+                    - len(automatically_included_items)
+                    - branch_and_bound.items,
+                    comparisons + branch_and_bound.comparisons,
+                    0,
+                    max(len(items), branch_and_bound.peak_nodes),
+                )
+            )
+        result = Result(
+            incumbent.profit + guaranteed_value,
+            [*incumbent.item_to_capacities, *automatically_included_items],
+            incumbent.item_to_capacities,
+        )
+        return BoundedResult(result, upper_bound + guaranteed_value)
+
+    def calculate_decomposed(
+        self,
+        items: list[Item[T]],
+        total_capacity: TotalCapacity,
+        sort_key_getter: Callable[[Item[T]], Comparable] | None = None,
+        engine: SolverEngine = SolverEngine.PURE_PYTHON,
+        matching: MatchingStrategy = MatchingStrategy.FIRST_FIT,
+        executor: Executor | None = None,
+    ) -> Result[T]:
+        """Solves every connected component of items and capacities on its own.
 
-        for i in range(capacities_size + 1):
-            chosen_items_list[i] = []
-            allocated_capacities_list[i] = set()
+        With bipartite matching the result is the same as ``calculate`` gives.
+        With first-fit it may differ: first-fit can match one capacity to several
+        demands of an item, and ``calculate`` then lets that item use the capacity
+        count of the whole portfolio, while here it only gets its component's.
+        """
+        sort_key_getter = sort_key_getter or (lambda x: -x.value)
+        sorted_items = sorted(items, key=sort_key_getter)
+        capacities: list[T] = total_capacity.capacities  # type: ignore
+        components = decomposition.split_into_components(sorted_items, capacities)
 
-        all_capacities = total_capacity.capacities
-        item_to_capacities_map = {}
+        component_items = [
+            [sorted_items[index] for index in component.item_indices]
+            for component in components
+        ]
+        component_capacities = [
+            [capacities[position] for position in component.capacity_positions]
+            for component in components
+        ]
+        engines = [engine] * len(components)
+        matchings = [matching] * len(components)
+        reports = [self._statistics_listeners.listening] * len(components)
+        solutions: Iterable[_ComponentSolution]
+        if executor is None:
+            solutions = map(
+                _solve_component,
+                component_items,
+                component_capacities,
+                engines,
+                matchings,
+                reports,
+            )
+        else:
+            solutions = executor.map(
+                _solve_component,
+                component_items,
+                component_capacities,
+                engines,
+                matchings,
+                reports,
+            )
 
-        for item in sorted(items, key=sort_key_getter):
-            chosen_capacities = self._match_capacities(  # type: ignore
-                item.total_weight,
-                all_capacities,
+        automatically_included_items = [item for item in items if item.is_weight_zero()]
+        profit: float = sum(item.value for item in automatically_included_items)
+        chosen_items: list[Item[T]] = []
+        item_to_capacities_map: dict[Item[T], set[CapacityDimension]] = {}
+        for component_solution, component_item, component_capacity in zip(
+            solutions, component_items, component_capacities
+        ):
+            component_profit, chosen_indices, capacities_of_items, statistics = (
+                component_solution
             )
-            all_capacities = [
-                capacity
-                for capacity in all_capacities
-                if capacity not in chosen_capacities
-            ]
+            # components may be solved in other processes, they report from here
+            for component_statistics in statistics:
+                self._emit(component_statistics)
+            profit += component_profit
+            chosen_items.extend(component_item[index] for index in chosen_indices)
+            for index, positions in capacities_of_items.items():
+                item_to_capacities_map[component_item[index]] = {
+                    component_capacity[position] for position in positions
+                }
+        chosen_items.extend(automatically_included_items)
+        return Result(profit, chosen_items, item_to_capacities_map)
 
-            if not chosen_capacities:
+    def calculate_marginal_profits(
+        self,
+        items: list[Item[T]],
+        total_capacity: TotalCapacity,
+        additional_capacities: list[T],
+        sort_key_getter: Callable[[Item[T]], Comparable] | None = None,
+        engine: SolverEngine = SolverEngine.PURE_PYTHON,
+        executor: Executor | None = None,
+        chunk_size: int = 50,
+    ) -> list[float]:
+        sort_key_getter = sort_key_getter or (lambda x: -x.value)
+        analysis = MarginalCapacityAnalysis(
+            sorted(items, key=sort_key_getter),
+            total_capacity.capacities,  # type: ignore
+            engine,
+        )
+        chunks = [
+            additional_capacities[start : start + chunk_size]
+            for start in range(0, len(additional_capacities), chunk_size)
+        ]
+        profits: Iterable[list[float]]
+        if executor is None:
+            profits = map(_profits_with, itertools.repeat(analysis), chunks)
+        else:
+            profits = executor.map(_profits_with, itertools.repeat(analysis), chunks)
+        return [
+            profit - analysis.profit
+            for profit in itertools.chain.from_iterable(profits)
+        ]
+
+    def start_incremental(
+        self,
+        items: list[Item[T]],
+        total_capacity: TotalCapacity,
+        sort_key_getter: Callable[[Item[T]], Comparable] | None = None,
+        engine: SolverEngine = SolverEngine.PURE_PYTHON,
+    ) -> IncrementalOptimization[T]:
+        return IncrementalOptimization(
+            items,
+            total_capacity.capacities,  # type: ignore
+            sort_key_getter or (lambda x: -x.value),
+            engine,
+            self._statistics_listeners,
+        )
+
+    def check_feasibility(
+        self,
+        items: list[Item[T]],
+        total_capacity: TotalCapacity,
+        fail_fast: bool = False,
+    ) -> Feasibility[T]:
+        capacities: list[T] = total_capacity.capacities  # type: ignore
+        bipartite_matching = BipartiteCapacityMatching(capacities)
+        unsatisfiable_items = []
+        for item in items:
+            if item.is_weight_zero():
                 continue
+            if bipartite_matching.try_to_match(item.total_weight) is None:
+                unsatisfiable_items.append(item)
+                if fail_fast:
+                    break
+        return Feasibility(unsatisfiable_items)
 
-            sum_value = int(item.value)
-            chosen_capacities_count = len(chosen_capacities)
+    def _match_first_fit(
+        self, sorted_items: list[Item[T]], capacities: list[T]
+    ) -> tuple[list[tuple[Item[T], list[T]]], int]:
+        capacity_index = CapacityIndex(capacities)
+        matched_items = []
+        for item in sorted_items:
+            chosen_capacities = capacity_index.match(item.total_weight)
+            capacity_index.remove(chosen_capacities)
+            if chosen_capacities:
+                matched_items.append((item, chosen_capacities))
+        return matched_items, capacity_index.comparisons
 
-            for j in range(capacities_size, chosen_capacities_count - 1, -1):
-                if dp[j] < sum_value + dp[j - chosen_capacities_count]:
-                    dp[j] = sum_value + dp[j - chosen_capacities_count]
+    def _greedy_incumbent(
+        self, sorted_items: list[Item[T]], capacities: list[T], deadline: float
+    ) -> tuple[Incumbent[T], int]:
+        bipartite_matching = BipartiteCapacityMatching(capacities)
+        matched_demands = []
+        for item in sorted_items:
+            if time.monotonic() >= deadline:
+                break
+            if int(item.value) <= 0 or item.is_weight_zero():
+                continue
+            demands = bipartite_matching.try_to_match(item.total_weight)
+            if demands is not None:
+                matched_demands.append((item, demands))
+        return Incumbent(
+            sum(int(item.value) for item, _ in matched_demands),
+            {
+                item: set(bipartite_matching.capacities_of(demands))
+                for item, demands in matched_demands
+            },
+        ), bipartite_matching.comparisons
 
-                    chosen_items_list[j] = chosen_items_list[
-                        j - chosen_capacities_count
-                    ].copy()
-                    chosen_items_list[j].append(item)
+    def _match_compact_first_fit(
+        self, sorted_items: list[int], problem: CompactProblem
+    ) -> tuple[list[tuple[int, list[int]]], int]:
+        first_fit = CompactFirstFit(problem)
+        matched_items = []
+        for item in sorted_items:
+            positions = first_fit.match(item)
+            first_fit.remove(positions)
+            if positions:
+                matched_items.append((item, positions))
+        return matched_items, first_fit.comparisons
 
-                    allocated_capacities_list[j].update(chosen_capacities)
+    def _match_bipartite(
+        self, sorted_items: list[Item[T]], capacities: list[T]
+    ) -> tuple[list[tuple[Item[T], list[T]]], int]:
+        bipartite_matching = BipartiteCapacityMatching(capacities)
+        matched_demands = []
+        for item in sorted_items:
+            demands = bipartite_matching.try_to_match(item.total_weight)
+            if demands is not None:
+                matched_demands.append((item, demands))
+        # demands move between capacities while later items are matched,
+        # so the final assignment is read only once everything is in place
+        return [
+            (item, bipartite_matching.capacities_of(demands))
+            for item, demands in matched_demands
+        ], bipartite_matching.comparisons
 
-            item_to_capacities_map[item] = set(chosen_capacities)
+    def _emit(self, statistics: SolverStatistics) -> None:
+        self._statistics_listeners.emit(statistics)
 
-        chosen_items_list[capacities_size].extend(automatically_included_items)
-        return Result(
-            dp[capacities_size] + guaranteed_value,
-            chosen_items_list[capacities_size],
-            item_to_capacities_map,
-        )
+    def _solve(
+        self,
+        values: list[int],
+        weights: list[int],
+        capacity: int,
+        engine: SolverEngine,
+    ) -> tuple[int, list[int]]:
+        if engine == SolverEngine.NUMPY and knapsack.is_vectorization_available():
+            return knapsack.solve_vectorized(values, weights, capacity)
+        return knapsack.solve(values, weights, capacity)
+
+
+def _dp_cells(weights: list[int], capacity: int) -> int:
+    return sum(capacity - weight + 1 for weight in weights if weight <= capacity)
+
+
+def _keep_given_order(item: Item[T]) -> Comparable:
+    return 0
+
+
+def _solve_component(
+    items: list[Item[T]],
+    capacities: Sequence[T],
+    engine: SolverEngine,
+    matching: MatchingStrategy,
+    report: bool,
+) -> _ComponentSolution:
+    # module level and index based, so it can be shipped to worker processes
+    optimization_facade = OptimizationFacade()
+    statistics: list[SolverStatistics] = []
+    if report:
+        optimization_facade.add_statistics_listener(statistics.append)
+    result = optimization_facade.calculate(
+        items, TotalCapacity(list(capacities)), _keep_given_order, engine, matching
+    )
+    item_index = {id(item): index for index, item in enumerate(items)}
+    capacity_position = {
+        id(capacity): position for position, capacity in enumerate(capacities)
+    }
+    return (
+        result.profit,
+        [item_index[id(item)] for item in result.chosen_items],
+        {
+            item_index[id(item)]: [
+                capacity_position[id(capacity)] for capacity in chosen_capacities
+            ]
+            for item, chosen_capacities in result.item_to_capacities.items()
+        },
+        statistics,
+    )
 
-    def _match_capacities(
-        self, total_weight: TotalWeight[T], available_capacities: list[T]
-    ) -> list[T]:
-        result = []
-        for weight_component in total_weight.components:
-            matching_capacity = next(
-                (
-                    capacity
-                    for capacity in available_capacities
-                    if weight_component.is_satisfied_by(capacity)
-                ),
-                None,
-            )
 
-            if matching_capacity:
-                result.append(matching_capacity)
-            else:
-                return []
-        return result
+def _profits_with(
+    analysis: MarginalCapacityAnalysis[T], additional_capacities: list[T]
+) -> list[float]:
+    return [analysis.profit_with(capacity) for capacity in additional_capacities]
@@ -0,0 +1,6 @@
+from enum import StrEnum, auto
+
+
+class SolverEngine(StrEnum):
+    PURE_PYTHON = auto()
+    NUMPY = auto()
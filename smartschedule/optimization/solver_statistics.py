@@ -0,0 +1,55 @@
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Callable, TypeAlias
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SolverStatistics:
+    sorting: timedelta
+    matching: timedelta
+    solving: timedelta
+    items: int
+    capacities: int
+    considered_items: int
+    skipped_items: int
+    capacity_comparisons: int
+    dp_cells: int
+    # the longest list the solve held at once: items, DP rows or search nodes
+    peak_list_size: int
+
+    @property
+    def total(self) -> timedelta:
+        return self.sorting + self.matching + self.solving
+
+
+SolverStatisticsListener: TypeAlias = Callable[[SolverStatistics], None]
+
+
+class SolverStatisticsListeners:
+    """Listeners told about every solve of the facades sharing them.
+
+    A failing listener is logged and does not fail the solve.
+    """
+
+    def __init__(self) -> None:
+        self._listeners: tuple[SolverStatisticsListener, ...] = ()
+        self._lock = threading.Lock()
+
+    @property
+    def listening(self) -> bool:
+        return bool(self._listeners)
+
+    def add(self, listener: SolverStatisticsListener) -> None:
+        with self._lock:
+            self._listeners = (*self._listeners, listener)
+
+    def emit(self, statistics: SolverStatistics) -> None:
+        for listener in self._listeners:
+            try:
+                listener(statistics)
+            except Exception:
+                logger.exception("Error while reporting solver statistics")
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+from dataclasses import dataclass, field
+
+from smartschedule.optimization.capacity_dimension import CapacityDimension
+from smartschedule.optimization.item import Item
+from smartschedule.shared.typing_extensions import Comparable
+
+
+@dataclass(frozen=True)
+class _Entry[T: CapacityDimension]:
+    sort_key: Comparable
+    arrival: int
+    item: Item[T] = field(compare=False)
+
+    def __lt__(self, other: _Entry[T]) -> bool:
+        # reversed, so the heap root is the entry that sorts last
+        return (other.sort_key, other.arrival) < (self.sort_key, self.arrival)
+
+
+class TopItems[T: CapacityDimension]:
+    """Keeps the items that sort first, as a stable sort of all offered would."""
+
+    def __init__(self, max_items: int | None = None) -> None:
+        self._max_items = max_items
+        self._heap: list[_Entry[T]] = []
+        self._arrivals = itertools.count()
+        self._rejected = 0
+
+    @property
+    def rejected(self) -> int:
+        return self._rejected
+
+    def offer(self, item: Item[T], sort_key: Comparable) -> None:
+        entry = _Entry(sort_key, next(self._arrivals), item)
+        if self._max_items is None or len(self._heap) < self._max_items:
+            heapq.heappush(self._heap, entry)
+        elif self._max_items > 0 and self._heap[0] < entry:
+            heapq.heapreplace(self._heap, entry)
+            self._rejected += 1
+        else:
+            self._rejected += 1
+
+    def in_order(self) -> list[Item[T]]:
+        return [entry.item for entry in sorted(self._heap, reverse=True)]
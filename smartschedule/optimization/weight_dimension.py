@@ -1,4 +1,5 @@
 import abc
+from typing import Hashable
 
 from smartschedule.optimization.capacity_dimension import CapacityDimension
 
@@ -7,3 +8,8 @@ class WeightDimension[T: CapacityDimension](abc.ABC):
     @abc.abstractmethod
     def is_satisfied_by(self, capacity: T) -> bool:
         pass
+
+    def index_key(self) -> Hashable | None:
+        # Capacities that can satisfy this weight must list the same key
+        # in their index_keys. None means every capacity has to be checked.
+        return None
@@ -0,0 +1,194 @@
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Final, Iterable
+
+from smartschedule.allocation.demands import Demands
+from smartschedule.allocation.project_allocation_scheduled import (
+    ProjectAllocationScheduled,
+)
+from smartschedule.availability.resource_taken_over import ResourceTakenOver
+from smartschedule.risk.portfolio_replay_report import PortfolioReplayReport
+from smartschedule.risk.project_arrival import ProjectArrival
+from smartschedule.risk.replayed_week import ReplayedWeek
+from smartschedule.risk.risk_periodic_check_saga import RiskPeriodicCheckSaga
+from smartschedule.risk.risk_periodic_check_saga_step import RiskPeriodicCheckSagaStep
+from smartschedule.shared.timeslot.time_slot import TimeSlot
+from smartschedule.simulation.available_resource_capability import (
+    AvailableResourceCapability,
+)
+from smartschedule.simulation.demand import Demand
+from smartschedule.simulation.demands import Demands as SimulatedDemands
+from smartschedule.simulation.incremental_simulation import IncrementalSimulation
+from smartschedule.simulation.project_id import ProjectId
+from smartschedule.simulation.simulated_capabilities import SimulatedCapabilities
+from smartschedule.simulation.simulated_project import SimulatedProject
+from smartschedule.simulation.simulation_facade import SimulationFacade
+
+ReplayedEvent = ProjectArrival | ResourceTakenOver
+
+
+class PortfolioReplay:
+    """Replays the portfolio week by week, in memory.
+
+    Every week sagas run their weekly check, then events of the week are applied
+    to them and to one incremental solve kept for the whole replay. Projects
+    starting within the week are committed when the optimizer chose them, taking
+    the capabilities matched to them, and dropped otherwise.
+    """
+
+    WEEK: Final = timedelta(weeks=1)
+
+    def __init__(
+        self,
+        simulation_facade: SimulationFacade,
+        capabilities: SimulatedCapabilities,
+    ) -> None:
+        self._simulation_facade = simulation_facade
+        self._capabilities = capabilities
+
+    def replay(
+        self, events: Iterable[ReplayedEvent], start: datetime, weeks: int
+    ) -> PortfolioReplayReport:
+        simulation = self._simulation_facade.start_incremental_simulation(
+            [], self._capabilities
+        )
+        free = list(self._capabilities.capabilities)
+        committed: list[AvailableResourceCapability] = []
+        sagas: dict[ProjectId, RiskPeriodicCheckSaga] = {}
+        arrivals: dict[ProjectId, ProjectArrival] = {}
+        pending = sorted(events, key=lambda event: event.occurred_at, reverse=True)
+        realized_profit = 0.0
+        replayed_weeks = []
+        for week_number in range(weeks):
+            week = TimeSlot(
+                start + self.WEEK * week_number, start + self.WEEK * (week_number + 1)
+            )
+            steps: Counter[RiskPeriodicCheckSagaStep] = Counter()
+            for saga in sagas.values():
+                steps[saga.handle_weekly_check(week.from_)] += 1
+
+            while pending and pending[-1].occurred_at < week.to:
+                event = pending.pop()
+                if isinstance(event, ProjectArrival):
+                    project_id = ProjectId(event.project_id.id)
+                    arrivals[project_id] = event
+                    sagas[project_id] = self._start_saga(event)
+                    simulation.add_project(self._to_simulated_project(event))
+                else:
+                    for capability in self._taken_over(free, event):
+                        free.remove(capability)
+                        simulation.remove_capability(capability)
+                    for saga in sagas.values():
+                        steps[saga.handle(event)] += 1
+
+            realized_profit += self._commit_starting_within(
+                week, simulation, arrivals, sagas, free, committed, steps
+            )
+            for project_id in [
+                project_id
+                for project_id, saga in sagas.items()
+                if saga.deadline is not None and saga.deadline < week.to
+            ]:
+                del sagas[project_id]
+
+            del steps[RiskPeriodicCheckSagaStep.DO_NOTHING]
+            replayed_weeks.append(
+                ReplayedWeek(
+                    week,
+                    simulation.profit,
+                    realized_profit,
+                    self._utilization(week, free, committed),
+                    dict(steps),
+                )
+            )
+        return PortfolioReplayReport(replayed_weeks)
+
+    def _commit_starting_within(
+        self,
+        week: TimeSlot,
+        simulation: IncrementalSimulation,
+        arrivals: dict[ProjectId, ProjectArrival],
+        sagas: dict[ProjectId, RiskPeriodicCheckSaga],
+        free: list[AvailableResourceCapability],
+        committed: list[AvailableResourceCapability],
+        steps: Counter[RiskPeriodicCheckSagaStep],
+    ) -> float:
+        starting = [
+            project_id
+            for project_id in simulation.projects
+            if self._starts_at(arrivals[project_id]) < week.to
+        ]
+        if not starting:
+            return 0.0
+        # all commits of the week follow the same plan
+        chosen = simulation.chosen_projects()
+        realized_profit = 0.0
+        for project_id in starting:
+            simulation.remove_project(project_id)
+            arrival = arrivals.pop(project_id)
+            if project_id not in chosen:
+                continue
+            for capability in chosen[project_id]:
+                free.remove(capability)
+                committed.append(capability)
+                simulation.remove_capability(capability)
+            steps[sagas[project_id].set_missing_demands(Demands.none())] += 1
+            realized_profit += float(arrival.earnings.to_decimal())
+        return realized_profit
+
+    def _start_saga(self, arrival: ProjectArrival) -> RiskPeriodicCheckSaga:
+        saga = RiskPeriodicCheckSaga(
+            arrival.project_id, arrival.demands, arrival.earnings
+        )
+        saga.handle(
+            ProjectAllocationScheduled(
+                arrival.project_id,
+                TimeSlot(self._starts_at(arrival), arrival.deadline),
+                arrival.occurred_at,
+            )
+        )
+        return saga
+
+    def _to_simulated_project(self, arrival: ProjectArrival) -> SimulatedProject:
+        return SimulatedProject.with_fixed_value(
+            ProjectId(arrival.project_id.id),
+            arrival.earnings.to_decimal(),
+            SimulatedDemands(
+                [
+                    Demand(demand.capability, demand.time_slot)
+                    for demand in arrival.demands.all
+                ]
+            ),
+        )
+
+    def _starts_at(self, arrival: ProjectArrival) -> datetime:
+        return min(
+            (demand.time_slot.from_ for demand in arrival.demands.all),
+            default=arrival.deadline,
+        )
+
+    def _taken_over(
+        self, free: list[AvailableResourceCapability], event: ResourceTakenOver
+    ) -> list[AvailableResourceCapability]:
+        return [
+            capability
+            for capability in free
+            if capability.resource_id == event.resource_id.id
+            and capability.time_slot.overlaps(event.slot)
+        ]
+
+    def _utilization(
+        self,
+        week: TimeSlot,
+        free: list[AvailableResourceCapability],
+        committed: list[AvailableResourceCapability],
+    ) -> float:
+        # weeks are half open, capabilities merely touching one do not count
+        in_week = [
+            capability.time_slot.from_ < week.to
+            and capability.time_slot.to > week.from_
+            for capability in committed + free
+        ]
+        used = sum(in_week[: len(committed)])
+        available = sum(in_week)
+        return used / available if available else 0.0
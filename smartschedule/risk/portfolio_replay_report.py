@@ -0,0 +1,28 @@
+from collections import Counter
+from dataclasses import dataclass
+
+from smartschedule.risk.replayed_week import ReplayedWeek
+from smartschedule.risk.risk_periodic_check_saga_step import RiskPeriodicCheckSagaStep
+
+
+@dataclass(frozen=True)
+class PortfolioReplayReport:
+    weeks: list[ReplayedWeek]
+
+    @property
+    def profit_curve(self) -> list[float]:
+        return [week.realized_profit for week in self.weeks]
+
+    @property
+    def utilization_curve(self) -> list[float]:
+        return [week.utilization for week in self.weeks]
+
+    @property
+    def realized_profit(self) -> float:
+        return self.weeks[-1].realized_profit if self.weeks else 0.0
+
+    def steps(self) -> dict[RiskPeriodicCheckSagaStep, int]:
+        total: Counter[RiskPeriodicCheckSagaStep] = Counter()
+        for week in self.weeks:
+            total.update(week.steps)
+        return dict(total)
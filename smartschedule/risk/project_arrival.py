@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+from smartschedule.allocation.cashflow.earnings import Earnings
+from smartschedule.allocation.demands import Demands
+from smartschedule.allocation.project_allocations_id import ProjectAllocationsId
+
+
+@dataclass(frozen=True)
+class ProjectArrival:
+    project_id: ProjectAllocationsId
+    earnings: Earnings
+    demands: Demands
+    deadline: datetime
+    occurred_at: datetime
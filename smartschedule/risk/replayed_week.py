@@ -0,0 +1,13 @@
+from dataclasses import dataclass
+
+from smartschedule.risk.risk_periodic_check_saga_step import RiskPeriodicCheckSagaStep
+from smartschedule.shared.timeslot.time_slot import TimeSlot
+
+
+@dataclass(frozen=True)
+class ReplayedWeek:
+    week: TimeSlot
+    planned_profit: float
+    realized_profit: float
+    utilization: float
+    steps: dict[RiskPeriodicCheckSagaStep, int]
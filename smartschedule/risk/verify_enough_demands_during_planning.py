@@ -65,17 +65,17 @@ class VerifyEnoughDemandsDuringPlanning:
             self._same_priced_simulated_project(summary)
             for summary in project_summaries
         ]
-        result = self._simulation_facade.what_is_the_optimal_setup(
-            simulated_projects, SimulatedCapabilities(capabilities)
+        unsatisfiable_projects = self._simulation_facade.unsatisfiable_projects(
+            simulated_projects, SimulatedCapabilities(capabilities), fail_fast=True
         )
-        return len(result.chosen_items) != len(project_summaries)
+        return len(unsatisfiable_projects) > 0
 
     def _same_priced_simulated_project(self, card: ProjectCard) -> SimulatedProject:
         simulated_demands = [
             Demand(demand.capability, TimeSlot.empty()) for demand in card.demands.all
         ]
-        return SimulatedProject(
+        return SimulatedProject.with_fixed_value(
             ProjectId(card.project_id.id),
-            lambda: self.SAME_ARBITRARY_VALUE_FOR_EVERY_PROJECT,
+            self.SAME_ARBITRARY_VALUE_FOR_EVERY_PROJECT,
             Demands(simulated_demands),
         )
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Self
+from typing import Hashable, Iterable, Self
 from uuid import UUID
 
 from smartschedule.optimization.capacity_dimension import CapacityDimension
@@ -26,3 +26,6 @@ class AvailableResourceCapability(CapacityDimension):
 
     def performs(self, capability: Capability) -> bool:
         return self.capability_selector.can_perform(capability)
+
+    def index_keys(self) -> Iterable[Hashable]:
+        return self.capability_selector.capabilities
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Hashable
 
 from smartschedule.optimization.weight_dimension import WeightDimension
 from smartschedule.shared.capability.capability import Capability
@@ -25,3 +26,6 @@ class Demand(WeightDimension[AvailableResourceCapability]):
         return available_capability.performs(self.capability) and self.slot.within(
             available_capability.time_slot
         )
+
+    def index_key(self) -> Hashable:
+        return self.capability
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import abc
+from dataclasses import dataclass
+from random import Random
+
+
+class Distribution(abc.ABC):
+    @abc.abstractmethod
+    def sample(self, random: Random) -> float:
+        pass
+
+    @staticmethod
+    def fixed(value: float) -> Distribution:
+        return FixedDistribution(value)
+
+    @staticmethod
+    def uniform(low: float, high: float) -> Distribution:
+        return UniformDistribution(low, high)
+
+    @staticmethod
+    def triangular(low: float, mode: float, high: float) -> Distribution:
+        return TriangularDistribution(low, mode, high)
+
+    @staticmethod
+    def normal(mean: float, standard_deviation: float) -> Distribution:
+        return NormalDistribution(mean, standard_deviation)
+
+
+@dataclass(frozen=True)
+class FixedDistribution(Distribution):
+    value: float
+
+    def sample(self, random: Random) -> float:
+        return self.value
+
+
+@dataclass(frozen=True)
+class UniformDistribution(Distribution):
+    low: float
+    high: float
+
+    def sample(self, random: Random) -> float:
+        return random.uniform(self.low, self.high)
+
+
+@dataclass(frozen=True)
+class TriangularDistribution(Distribution):
+    low: float
+    mode: float
+    high: float
+
+    def sample(self, random: Random) -> float:
+        return random.triangular(self.low, self.high, self.mode)
+
+
+@dataclass(frozen=True)
+class NormalDistribution(Distribution):
+    mean: float
+    standard_deviation: float
+
+    def sample(self, random: Random) -> float:
+        return random.gauss(self.mean, self.standard_deviation)
@@ -0,0 +1,16 @@
+from datetime import datetime, timedelta, timezone
+
+from smartschedule.shared.timeslot.time_slot import TimeSlot
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+
+
+def to_epoch_bounds(slot: TimeSlot) -> tuple[int, int]:
+    return to_epoch_microseconds(slot.from_), to_epoch_microseconds(slot.to)
+
+
+def to_epoch_microseconds(moment: datetime) -> int:
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return (moment - EPOCH) // MICROSECOND
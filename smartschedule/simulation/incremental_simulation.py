@@ -0,0 +1,68 @@
+from typing import Callable, cast
+
+from smartschedule.optimization.incremental_optimization import (
+    IncrementalOptimization,
+)
+from smartschedule.optimization.item import Item
+from smartschedule.optimization.result import Result
+from smartschedule.simulation.available_resource_capability import (
+    AvailableResourceCapability,
+)
+from smartschedule.simulation.project_id import ProjectId
+from smartschedule.simulation.simulated_project import SimulatedProject
+
+
+class IncrementalSimulation:
+    """Keeps the optimal setup up to date as projects and capabilities come and go."""
+
+    def __init__(
+        self,
+        incremental_optimization: IncrementalOptimization[AvailableResourceCapability],
+        items: dict[ProjectId, Item[AvailableResourceCapability]],
+        to_item: Callable[[SimulatedProject], Item[AvailableResourceCapability]],
+    ) -> None:
+        self._incremental_optimization = incremental_optimization
+        self._items = items
+        self._to_item = to_item
+
+    @property
+    def profit(self) -> float:
+        return self._incremental_optimization.profit
+
+    @property
+    def result(self) -> Result[AvailableResourceCapability]:
+        return self._incremental_optimization.result
+
+    @property
+    def projects(self) -> list[ProjectId]:
+        return list(self._items)
+
+    def chosen_projects(
+        self,
+    ) -> dict[ProjectId, set[AvailableResourceCapability]]:
+        result = self.result
+        by_name = {str(project_id): project_id for project_id in self._items}
+        return {
+            by_name[item.name]: cast(
+                set[AvailableResourceCapability],
+                result.item_to_capacities.get(item, set()),
+            )
+            for item in result.chosen_items
+        }
+
+    def add_project(self, project: SimulatedProject) -> float:
+        item = self._to_item(project)
+        item_before = self._items.get(project.project_id)
+        self._items[project.project_id] = item
+        if item_before is None:
+            return self._incremental_optimization.add_item(item)
+        return self._incremental_optimization.replace_item(item_before, item)
+
+    def remove_project(self, project_id: ProjectId) -> float:
+        return self._incremental_optimization.remove_item(self._items.pop(project_id))
+
+    def add_capability(self, capability: AvailableResourceCapability) -> float:
+        return self._incremental_optimization.add_capacity(capability)
+
+    def remove_capability(self, capability: AvailableResourceCapability) -> float:
+        return self._incremental_optimization.remove_capacity(capability)
@@ -0,0 +1,28 @@
+from dataclasses import dataclass
+
+from smartschedule.simulation.project_id import ProjectId
+
+
+@dataclass(frozen=True)
+class MonteCarloResult:
+    profits: list[float]
+    selection_probability: dict[ProjectId, float]
+
+    @property
+    def trials(self) -> int:
+        return len(self.profits)
+
+    @property
+    def mean_profit(self) -> float:
+        return sum(self.profits) / len(self.profits) if self.profits else 0.0
+
+    def profit_percentile(self, percentile: float) -> float:
+        if not 0 <= percentile <= 100:
+            raise ValueError("Percentile must be between 0 and 100")
+        if not self.profits:
+            return 0.0
+        ordered = sorted(self.profits)
+        rank = (len(ordered) - 1) * percentile / 100
+        lower = int(rank)
+        upper = min(lower + 1, len(ordered) - 1)
+        return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
@@ -0,0 +1,63 @@
+from array import array
+from dataclasses import dataclass, replace
+from datetime import timedelta
+from random import Random
+
+from smartschedule.optimization.compact_problem import CompactProblem
+from smartschedule.optimization.optimization_facade import OptimizationFacade
+from smartschedule.optimization.solver_engine import SolverEngine
+from smartschedule.simulation.distribution import Distribution
+
+_MICROSECONDS_IN_DAY = timedelta(days=1) // timedelta(microseconds=1)
+
+TrialOutcome = tuple[float, list[int]]
+
+
+@dataclass(frozen=True)
+class MonteCarloTrials:
+    """The problem is compacted once, trials only resample values and slot bounds."""
+
+    problem: CompactProblem
+    values: list[Distribution]
+    delays: list[Distribution]
+    prolongations: list[Distribution]
+    engine: SolverEngine
+
+    def run(self, seeds: list[int]) -> list[TrialOutcome]:
+        # a plain facade, trials are never worth caching
+        optimization_facade = OptimizationFacade()
+        offsets = self.problem.demand_offsets.tolist()
+        starts = self.problem.demand_starts.tolist()
+        ends = self.problem.demand_ends.tolist()
+        outcomes = []
+        for seed in seeds:
+            random = Random(seed)
+            values = array("d")
+            trial_starts = array("q")
+            trial_ends = array("q")
+            for item, (value, delay, prolongation) in enumerate(
+                zip(self.values, self.delays, self.prolongations)
+            ):
+                values.append(value.sample(random))
+                shift = round(delay.sample(random) * _MICROSECONDS_IN_DAY)
+                extension = round(prolongation.sample(random) * _MICROSECONDS_IN_DAY)
+                for demand in range(offsets[item], offsets[item + 1]):
+                    start = starts[demand] + shift
+                    trial_starts.append(start)
+                    trial_ends.append(max(ends[demand] + shift + extension, start))
+            solution = optimization_facade.calculate_compact(
+                replace(
+                    self.problem,
+                    item_values=values,
+                    demand_starts=trial_starts,
+                    demand_ends=trial_ends,
+                ),
+                self.engine,
+            )
+            outcomes.append((solution.profit, solution.chosen_items))
+        return outcomes
+
+
+def run_trials(trials: MonteCarloTrials, seeds: list[int]) -> list[TrialOutcome]:
+    # module level, so it can be shipped to worker processes
+    return trials.run(seeds)
@@ -0,0 +1,17 @@
+from dataclasses import dataclass
+from decimal import Decimal
+
+from smartschedule.simulation.additional_priced_capability import (
+    AdditionalPricedCapability,
+)
+
+
+@dataclass(frozen=True)
+class ProcurementPlan:
+    capabilities: list[AdditionalPricedCapability]
+    net_profit: float
+    evaluations: int
+
+    @property
+    def total_price(self) -> Decimal:
+        return sum((capability.value for capability in self.capabilities), Decimal(0))
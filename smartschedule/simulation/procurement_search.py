@@ -0,0 +1,152 @@
+import heapq
+import itertools
+from decimal import Decimal
+
+from smartschedule.optimization.incremental_optimization import (
+    IncrementalOptimization,
+)
+from smartschedule.simulation.additional_priced_capability import (
+    AdditionalPricedCapability,
+)
+from smartschedule.simulation.available_resource_capability import (
+    AvailableResourceCapability,
+)
+from smartschedule.simulation.procurement_plan import ProcurementPlan
+
+
+class ProcurementSearch:
+    """Lazy greedy choice of capabilities to buy, improved by local search.
+
+    Buying more rarely makes another candidate worth more, so a gain evaluated
+    before the last purchase is an optimistic estimate, and a candidate is only
+    evaluated again when its estimate is the best one. Local search then swaps
+    a bought capability for another one, or buys a pair that only pays off
+    together. All evaluations run on one incremental solve, by adding
+    capacities and removing them again.
+    """
+
+    def __init__(
+        self,
+        incremental_optimization: IncrementalOptimization[AvailableResourceCapability],
+        candidates: list[AdditionalPricedCapability],
+        profit_deltas: list[float],
+        budget: Decimal,
+        max_capabilities: int | None = None,
+    ) -> None:
+        self._optimization = incremental_optimization
+        self._candidates = candidates
+        self._profit_deltas = profit_deltas
+        self._budget = budget
+        self._max_capabilities = (
+            len(candidates) if max_capabilities is None else max_capabilities
+        )
+        self._chosen: list[int] = []
+        self._evaluations = len(candidates)
+
+    def search(self, local_search_rounds: int = 2) -> ProcurementPlan:
+        profit_without = self._optimization.profit
+        self._choose_greedily()
+        for _ in range(local_search_rounds):
+            if (
+                not self._swap_first_improving()
+                and not self._buy_first_improving_pair()
+            ):
+                break
+        return ProcurementPlan(
+            [self._candidates[index] for index in self._chosen],
+            self._optimization.profit - profit_without - float(self._total_price()),
+            self._evaluations,
+        )
+
+    def _choose_greedily(self) -> None:
+        # gains are tagged with how many capabilities were bought when evaluated
+        estimates = [
+            (-(profit_delta - float(candidate.value)), index, 0)
+            for index, (candidate, profit_delta) in enumerate(
+                zip(self._candidates, self._profit_deltas)
+            )
+        ]
+        heapq.heapify(estimates)
+        while estimates and len(self._chosen) < self._max_capabilities:
+            negative_gain, index, bought = heapq.heappop(estimates)
+            candidate = self._candidates[index]
+            if candidate.value > self._budget - self._total_price():
+                continue
+            if bought == len(self._chosen):
+                if negative_gain >= 0:
+                    return
+                self._buy(index)
+                continue
+            gain = self._evaluate(candidate) - float(candidate.value)
+            heapq.heappush(estimates, (-gain, index, len(self._chosen)))
+
+    def _swap_first_improving(self) -> bool:
+        for chosen in list(self._chosen):
+            sold = self._candidates[chosen]
+            for index, candidate in enumerate(self._candidates):
+                if index in self._chosen:
+                    continue
+                if candidate.value - sold.value > self._budget - self._total_price():
+                    continue
+                self._evaluations += 1
+                profit_delta = self._optimization.remove_capacity(
+                    sold.available_resource_capability
+                ) + self._optimization.add_capacity(
+                    candidate.available_resource_capability
+                )
+                if profit_delta - float(candidate.value - sold.value) > 0:
+                    self._chosen.remove(chosen)
+                    self._chosen.append(index)
+                    return True
+                self._optimization.remove_capacity(
+                    candidate.available_resource_capability
+                )
+                self._optimization.add_capacity(sold.available_resource_capability)
+                # sold is bought again as the last one, as the solver sees it now
+                self._chosen.remove(chosen)
+                self._chosen.append(chosen)
+        return False
+
+    def _buy_first_improving_pair(self) -> bool:
+        if len(self._chosen) + 2 > self._max_capabilities:
+            return False
+        not_chosen = [
+            index for index in range(len(self._candidates)) if index not in self._chosen
+        ]
+        for first, second in itertools.combinations(not_chosen, 2):
+            pair = [self._candidates[first], self._candidates[second]]
+            price = pair[0].value + pair[1].value
+            if price > self._budget - self._total_price():
+                continue
+            self._evaluations += 1
+            profit_delta = sum(
+                self._optimization.add_capacity(candidate.available_resource_capability)
+                for candidate in pair
+            )
+            if profit_delta - float(price) > 0:
+                self._chosen.extend([first, second])
+                return True
+            for candidate in reversed(pair):
+                self._optimization.remove_capacity(
+                    candidate.available_resource_capability
+                )
+        return False
+
+    def _evaluate(self, candidate: AdditionalPricedCapability) -> float:
+        self._evaluations += 1
+        profit_delta = self._optimization.add_capacity(
+            candidate.available_resource_capability
+        )
+        self._optimization.remove_capacity(candidate.available_resource_capability)
+        return profit_delta
+
+    def _buy(self, index: int) -> None:
+        self._optimization.add_capacity(
+            self._candidates[index].available_resource_capability
+        )
+        self._chosen.append(index)
+
+    def _total_price(self) -> Decimal:
+        return sum(
+            (self._candidates[index].value for index in self._chosen), Decimal(0)
+        )
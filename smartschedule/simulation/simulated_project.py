@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 from dataclasses import dataclass
 from decimal import Decimal
 from typing import Callable
@@ -6,12 +8,26 @@ from smartschedule.simulation.demands import Demands
 from smartschedule.simulation.project_id import ProjectId
 
 
+@dataclass(frozen=True)
+class FixedValue:
+    value: Decimal
+
+    def __call__(self) -> Decimal:
+        return self.value
+
+
 @dataclass(frozen=True)
 class SimulatedProject:
     project_id: ProjectId
     value_getter: Callable[[], Decimal]
     missing_demands: Demands
 
+    @classmethod
+    def with_fixed_value(
+        cls, project_id: ProjectId, value: Decimal, missing_demands: Demands
+    ) -> SimulatedProject:
+        return cls(project_id, FixedValue(value), missing_demands)
+
     @property
     def value(self) -> Decimal:
         return self.value_getter()
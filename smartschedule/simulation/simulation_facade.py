@@ -1,7 +1,20 @@
+import itertools
+from concurrent.futures import Executor
+from datetime import timedelta
+from decimal import Decimal
+from random import Random
+from typing import Iterable
+
+from smartschedule.optimization.bounded_result import BoundedResult
 from smartschedule.optimization.capacity_dimension import CapacityDimension
+from smartschedule.optimization.compact_problem import CompactProblem
+from smartschedule.optimization.compact_problem_builder import CompactProblemBuilder
+from smartschedule.optimization.compact_solution import CompactSolution
 from smartschedule.optimization.item import Item
+from smartschedule.optimization.matching_strategy import MatchingStrategy
 from smartschedule.optimization.optimization_facade import OptimizationFacade
 from smartschedule.optimization.result import Result
+from smartschedule.optimization.solver_engine import SolverEngine
 from smartschedule.optimization.total_capacity import TotalCapacity
 from smartschedule.optimization.total_weight import TotalWeight
 from smartschedule.optimization.weight_dimension import WeightDimension
@@ -11,8 +24,21 @@ from smartschedule.simulation.additional_priced_capability import (
 from smartschedule.simulation.available_resource_capability import (
     AvailableResourceCapability,
 )
+from smartschedule.simulation.demands import Demands
+from smartschedule.simulation.epoch_bounds import to_epoch_bounds
+from smartschedule.simulation.incremental_simulation import IncrementalSimulation
+from smartschedule.simulation.monte_carlo_result import MonteCarloResult
+from smartschedule.simulation.monte_carlo_trials import (
+    MonteCarloTrials,
+    TrialOutcome,
+    run_trials,
+)
+from smartschedule.simulation.procurement_plan import ProcurementPlan
+from smartschedule.simulation.procurement_search import ProcurementSearch
+from smartschedule.simulation.project_id import ProjectId
 from smartschedule.simulation.simulated_capabilities import SimulatedCapabilities
 from smartschedule.simulation.simulated_project import SimulatedProject
+from smartschedule.simulation.uncertain_project import UncertainProject
 
 
 class SimulationFacade:
@@ -24,35 +50,299 @@ class SimulationFacade:
         projects_simulations: list[SimulatedProject],
         capabilities_without_new_one: SimulatedCapabilities,
         new_prices_capability: AdditionalPricedCapability,
+        engine: SolverEngine = SolverEngine.PURE_PYTHON,
+        matching: MatchingStrategy = MatchingStrategy.FIRST_FIT,
     ) -> float:
+        if matching == MatchingStrategy.FIRST_FIT:
+            incremental_optimization = self._optimization_facade.start_incremental(
+                self._to_items(projects_simulations),
+                self._to_capacity(capabilities_without_new_one),
+                lambda x: -x.value,
+                engine,
+            )
+            profit_delta = incremental_optimization.add_capacity(
+                new_prices_capability.available_resource_capability
+            )
+            return profit_delta - float(new_prices_capability.value)
+
+        # values are read once, both solves share the same items
+        items = self._to_items(projects_simulations)
         capabilities_with_new_resources = capabilities_without_new_one.add(
             new_prices_capability.available_resource_capability
         )
         result_without = self._optimization_facade.calculate(
-            self._to_items(projects_simulations),
+            items,
             self._to_capacity(capabilities_without_new_one),
             lambda x: -x.value,
+            engine,
+            matching,
         )
         result_with = self._optimization_facade.calculate(
-            self._to_items(projects_simulations),
+            items,
             self._to_capacity(capabilities_with_new_resources),
             lambda x: -x.value,
+            engine,
+            matching,
         )
         return (
             result_with.profit - float(new_prices_capability.value)
         ) - result_without.profit
 
+    def profits_after_buying_new_capabilities(
+        self,
+        projects_simulations: list[SimulatedProject],
+        capabilities_without_new_ones: SimulatedCapabilities,
+        new_priced_capabilities: list[AdditionalPricedCapability],
+        engine: SolverEngine = SolverEngine.PURE_PYTHON,
+        executor: Executor | None = None,
+    ) -> list[float]:
+        profit_deltas = self._optimization_facade.calculate_marginal_profits(
+            self._to_items(projects_simulations),
+            self._to_capacity(capabilities_without_new_ones),
+            [
+                new_priced_capability.available_resource_capability
+                for new_priced_capability in new_priced_capabilities
+            ],
+            lambda x: -x.value,
+            engine,
+            executor,
+        )
+        return [
+            profit_delta - float(new_priced_capability.value)
+            for profit_delta, new_priced_capability in zip(
+                profit_deltas, new_priced_capabilities
+            )
+        ]
+
+    def best_capabilities_to_buy(
+        self,
+        projects_simulations: list[SimulatedProject],
+        capabilities_without_new_ones: SimulatedCapabilities,
+        new_priced_capabilities: list[AdditionalPricedCapability],
+        budget: Decimal,
+        max_capabilities: int | None = None,
+        engine: SolverEngine = SolverEngine.PURE_PYTHON,
+        executor: Executor | None = None,
+        local_search_rounds: int = 2,
+    ) -> ProcurementPlan:
+        items = self._to_items(projects_simulations)
+        total_capacity = self._to_capacity(capabilities_without_new_ones)
+        # first estimates of all candidates, spread over the executor
+        profit_deltas = self._optimization_facade.calculate_marginal_profits(
+            items,
+            total_capacity,
+            [
+                new_priced_capability.available_resource_capability
+                for new_priced_capability in new_priced_capabilities
+            ],
+            lambda x: -x.value,
+            engine,
+            executor,
+        )
+        procurement_search = ProcurementSearch(
+            self._optimization_facade.start_incremental(
+                items, total_capacity, lambda x: -x.value, engine
+            ),
+            new_priced_capabilities,
+            profit_deltas,
+            budget,
+            max_capabilities,
+        )
+        return procurement_search.search(local_search_rounds)
+
+    def profit_after_changing_projects(
+        self,
+        projects_before: list[SimulatedProject],
+        projects_after: list[SimulatedProject],
+        total_capability: SimulatedCapabilities,
+        engine: SolverEngine = SolverEngine.PURE_PYTHON,
+    ) -> float:
+        items_before = self._to_items(projects_before)
+        incremental_optimization = self._optimization_facade.start_incremental(
+            items_before,
+            self._to_capacity(total_capability),
+            lambda x: -x.value,
+            engine,
+        )
+        profit_before = incremental_optimization.profit
+        not_changed = {
+            project.project_id: item
+            for project, item in zip(projects_before, items_before)
+        }
+        for project in projects_after:
+            item = self._to_item(project)
+            item_before = not_changed.pop(project.project_id, None)
+            if item_before is None:
+                incremental_optimization.add_item(item)
+            elif item_before != item:
+                incremental_optimization.replace_item(item_before, item)
+        for item_before in not_changed.values():
+            incremental_optimization.remove_item(item_before)
+        return incremental_optimization.profit - profit_before
+
+    def start_incremental_simulation(
+        self,
+        projects_simulations: list[SimulatedProject],
+        total_capability: SimulatedCapabilities,
+        engine: SolverEngine = SolverEngine.PURE_PYTHON,
+    ) -> IncrementalSimulation:
+        items = {
+            project.project_id: self._to_item(project)
+            for project in projects_simulations
+        }
+        return IncrementalSimulation(
+            self._optimization_facade.start_incremental(
+                list(items.values()),
+                self._to_capacity(total_capability),
+                lambda x: -x.value,
+                engine,
+            ),
+            items,
+            self._to_item,
+        )
+
     def what_is_the_optimal_setup(
         self,
         projects_simulations: list[SimulatedProject],
         total_capability: SimulatedCapabilities,
+        engine: SolverEngine = SolverEngine.PURE_PYTHON,
+        matching: MatchingStrategy = MatchingStrategy.FIRST_FIT,
     ) -> Result[AvailableResourceCapability]:
+        if matching == MatchingStrategy.FIRST_FIT:
+            problem = self._to_compact_problem_builder(
+                projects_simulations, total_capability
+            ).build()
+            solution = self._optimization_facade.calculate_compact(problem, engine)
+            return self._to_result(
+                problem, solution, projects_simulations, total_capability
+            )
         return self._optimization_facade.calculate(
             self._to_items(projects_simulations),
             self._to_capacity(total_capability),
             lambda x: -x.value,
+            engine,
+            matching,
+        )
+
+    def what_is_the_optimal_setup_in_parallel(
+        self,
+        projects_simulations: list[SimulatedProject],
+        total_capability: SimulatedCapabilities,
+        executor: Executor,
+        engine: SolverEngine = SolverEngine.PURE_PYTHON,
+        matching: MatchingStrategy = MatchingStrategy.FIRST_FIT,
+    ) -> Result[AvailableResourceCapability]:
+        return self._optimization_facade.calculate_decomposed(
+            self._to_items(projects_simulations),
+            self._to_capacity(total_capability),
+            lambda x: -x.value,
+            engine,
+            matching,
+            executor,
         )
 
+    def what_is_the_optimal_setup_streaming(
+        self,
+        projects_simulations: Iterable[SimulatedProject],
+        total_capability: SimulatedCapabilities,
+        max_projects: int | None = None,
+        engine: SolverEngine = SolverEngine.PURE_PYTHON,
+        matching: MatchingStrategy = MatchingStrategy.FIRST_FIT,
+    ) -> Result[AvailableResourceCapability]:
+        return self._optimization_facade.calculate_streaming(
+            (self._to_item(project) for project in projects_simulations),
+            self._to_capacity(total_capability),
+            lambda x: -x.value,
+            engine,
+            matching,
+            max_projects,
+        )
+
+    def what_is_the_optimal_setup_within(
+        self,
+        projects_simulations: list[SimulatedProject],
+        total_capability: SimulatedCapabilities,
+        time_budget: timedelta,
+    ) -> BoundedResult[AvailableResourceCapability]:
+        return self._optimization_facade.calculate_within(
+            self._to_items(projects_simulations),
+            self._to_capacity(total_capability),
+            time_budget,
+            lambda x: -x.value,
+        )
+
+    def simulate_under_uncertainty(
+        self,
+        uncertain_projects: list[UncertainProject],
+        total_capability: SimulatedCapabilities,
+        trials: int,
+        seed: int,
+        engine: SolverEngine = SolverEngine.PURE_PYTHON,
+        executor: Executor | None = None,
+        chunk_size: int = 250,
+    ) -> MonteCarloResult:
+        builder = CompactProblemBuilder()
+        for project in uncertain_projects:
+            self._add_compact_item(
+                builder, project.project_id, 0, project.missing_demands
+            )
+        for capability in total_capability.capabilities:
+            self._add_compact_capacity(builder, capability)
+        monte_carlo_trials = MonteCarloTrials(
+            builder.build(),
+            [project.value for project in uncertain_projects],
+            [project.delay for project in uncertain_projects],
+            [project.prolongation for project in uncertain_projects],
+            engine,
+        )
+
+        # seeds are drawn upfront, so outcomes do not depend on how trials are split
+        random = Random(seed)
+        seeds = [random.getrandbits(64) for _ in range(trials)]
+        chunks = [
+            seeds[start : start + chunk_size]
+            for start in range(0, len(seeds), chunk_size)
+        ]
+        outcomes: Iterable[list[TrialOutcome]]
+        if executor is None:
+            outcomes = map(run_trials, itertools.repeat(monte_carlo_trials), chunks)
+        else:
+            outcomes = executor.map(
+                run_trials, itertools.repeat(monte_carlo_trials), chunks
+            )
+
+        profits = []
+        selections = [0] * len(uncertain_projects)
+        for profit, chosen_items in itertools.chain.from_iterable(outcomes):
+            profits.append(profit)
+            for index in chosen_items:
+                selections[index] += 1
+        return MonteCarloResult(
+            profits,
+            {
+                project.project_id: selected / trials if trials else 0.0
+                for project, selected in zip(uncertain_projects, selections)
+            },
+        )
+
+    def unsatisfiable_projects(
+        self,
+        projects_simulations: list[SimulatedProject],
+        total_capability: SimulatedCapabilities,
+        fail_fast: bool = False,
+    ) -> list[ProjectId]:
+        feasibility = self._optimization_facade.check_feasibility(
+            self._to_items(projects_simulations),
+            self._to_capacity(total_capability),
+            fail_fast,
+        )
+        unsatisfiable = {item.name for item in feasibility.unsatisfiable_items}
+        return [
+            project.project_id
+            for project in projects_simulations
+            if str(project.project_id) in unsatisfiable
+        ]
+
     def _to_capacity(
         self, simulated_capabilities: SimulatedCapabilities
     ) -> TotalCapacity:
@@ -79,3 +369,75 @@ class SimulationFacade:
             float(simulated_project.value),
             TotalWeight(weights),
         )
+
+    def _to_compact_problem_builder(
+        self,
+        projects_simulations: list[SimulatedProject],
+        simulated_capabilities: SimulatedCapabilities,
+    ) -> CompactProblemBuilder:
+        builder = CompactProblemBuilder()
+        for project in projects_simulations:
+            self._add_compact_item(
+                builder,
+                project.project_id,
+                float(project.value),
+                project.missing_demands,
+            )
+        for capability in simulated_capabilities.capabilities:
+            self._add_compact_capacity(builder, capability)
+        return builder
+
+    def _add_compact_item(
+        self,
+        builder: CompactProblemBuilder,
+        project_id: ProjectId,
+        value: float,
+        missing_demands: Demands,
+    ) -> None:
+        builder.add_item(
+            str(project_id),
+            value,
+            (
+                (demand.capability, *to_epoch_bounds(demand.slot))
+                for demand in missing_demands.all
+            ),
+        )
+
+    def _add_compact_capacity(
+        self, builder: CompactProblemBuilder, capability: AvailableResourceCapability
+    ) -> None:
+        builder.add_capacity(
+            capability,
+            capability.capability_selector.capabilities,
+            *to_epoch_bounds(capability.time_slot),
+        )
+
+    def _to_result(
+        self,
+        problem: CompactProblem,
+        solution: CompactSolution,
+        projects_simulations: list[SimulatedProject],
+        simulated_capabilities: SimulatedCapabilities,
+    ) -> Result[AvailableResourceCapability]:
+        items = {}
+        for index in {*solution.chosen_items, *solution.item_to_capacities}:
+            weights: list[WeightDimension[AvailableResourceCapability]] = list(
+                projects_simulations[index].missing_demands.all
+            )
+            items[index] = Item(
+                problem.item_names[index],
+                problem.item_values[index],
+                TotalWeight(weights),
+            )
+        capabilities = simulated_capabilities.capabilities
+        item_to_capacities: dict[
+            Item[AvailableResourceCapability], set[CapacityDimension]
+        ] = {
+            items[index]: {capabilities[position] for position in positions}
+            for index, positions in solution.item_to_capacities.items()
+        }
+        return Result(
+            solution.profit,
+            [items[index] for index in solution.chosen_items],
+            item_to_capacities,
+        )
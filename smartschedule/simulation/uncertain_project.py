@@ -0,0 +1,16 @@
+from dataclasses import dataclass, field
+
+from smartschedule.simulation.demands import Demands
+from smartschedule.simulation.distribution import Distribution
+from smartschedule.simulation.project_id import ProjectId
+
+
+@dataclass(frozen=True)
+class UncertainProject:
+    """Delay shifts all demand slots, prolongation extends them - both in days."""
+
+    project_id: ProjectId
+    value: Distribution
+    missing_demands: Demands
+    delay: Distribution = field(default_factory=lambda: Distribution.fixed(0))
+    prolongation: Distribution = field(default_factory=lambda: Distribution.fixed(0))
@@ -0,0 +1,33 @@
+import json
+from pathlib import Path
+
+from benchmarks.optimization_benchmarks import main
+from benchmarks.synthetic_portfolio import SIZES, SyntheticPortfolioGenerator
+
+
+class TestSyntheticPortfolioGenerator:
+    def test_same_seed_generates_same_portfolio(self) -> None:
+        first = SyntheticPortfolioGenerator(7).generate(SIZES["tiny"])
+        second = SyntheticPortfolioGenerator(7).generate(SIZES["tiny"])
+
+        assert [p.project_id for p in first.projects] == [
+            p.project_id for p in second.projects
+        ]
+        assert first.capabilities == second.capabilities
+        assert first.candidates == second.candidates
+
+
+class TestOptimizationBenchmarks:
+    def test_writes_machine_readable_results(self, tmp_path: Path) -> None:
+        output = tmp_path / "results.json"
+
+        main(["--sizes", "tiny", "--repeats", "1", "--output", str(output)])
+
+        report = json.loads(output.read_text())
+        assert report["seed"] == 42
+        assert {result["benchmark"] for result in report["results"]} == {
+            "calculate",
+            "what_is_the_optimal_setup",
+            "profit_after_buying_new_capability",
+        }
+        assert all(result["min_seconds"] >= 0 for result in report["results"])
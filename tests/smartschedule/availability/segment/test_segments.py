@@ -7,6 +7,7 @@ from smartschedule.availability.segment.segment_in_minutes import SegmentInMinut
 from smartschedule.availability.segment.segments import (
     normalize_to_segment_boundaries,
     split,
+    split_to_bounds,
 )
 from smartschedule.availability.segment.slot_to_segments import slot_to_segments
 from smartschedule.shared.timeslot.time_slot import TimeSlot
@@ -25,6 +26,11 @@ class TestSegments:
                 slot_duration_in_minutes=self.FIFTEEN_MINUTES_SEGMENT_DURATION,
             )
 
+    def test_segments_of_the_same_length_are_equal(self) -> None:
+        assert SegmentInMinutes.of(1440) == SegmentInMinutes(1440, 1440)
+        assert SegmentInMinutes.of(1440).minutes == 1440
+        assert SegmentInMinutes.of(60) != SegmentInMinutes.of(120)
+
     @pytest.mark.parametrize("value", [15, 30, 45])
     def test_segment_can_be_created_with_number_being_multiply_of_default_slot_duration(
         self, value: int
@@ -107,3 +113,24 @@ class TestSegments:
             TimeSlot(datetime(2023, 9, 9), datetime(2023, 9, 9, 0, 30)),
             TimeSlot(datetime(2023, 9, 9, 0, 30), datetime(2023, 9, 9, 0, 59)),
         ]
+
+    def test_splitting_to_bounds_gives_the_same_segments(self) -> None:
+        start = datetime(2023, 9, 9, 0, 10)
+        end = datetime(2023, 9, 10, 3, 59)
+        time_slot = TimeSlot(start, end)
+        unit = SegmentInMinutes(45, self.FIFTEEN_MINUTES_SEGMENT_DURATION)
+
+        bounds = split_to_bounds(time_slot, unit)
+
+        assert [TimeSlot(from_, to) for from_, to in bounds] == split(time_slot, unit)
+
+    def test_normalizing_to_day_long_segments(self) -> None:
+        start = datetime(2023, 9, 9, 13, 10)
+        end = datetime(2023, 9, 12, 1, 5)
+        time_slot = TimeSlot(start, end)
+
+        segment = normalize_to_segment_boundaries(
+            time_slot, SegmentInMinutes(1440, self.FIFTEEN_MINUTES_SEGMENT_DURATION)
+        )
+
+        assert segment == TimeSlot(datetime(2023, 9, 9), datetime(2023, 9, 13))
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Final
 
 import pytest
@@ -58,3 +58,32 @@ class TestSlotToNormalizedSlod:
         normalized = slot_to_normalized_slot(TimeSlot(start, end), fifteen_minutes)
 
         assert normalized == TimeSlot(start, end)
+
+    @pytest.mark.parametrize(
+        "start, end",
+        [
+            (datetime(2023, 9, 9, 10), datetime(2023, 9, 9, 12)),
+            (datetime(2023, 9, 9, 0, 30), datetime(2023, 9, 9, 23, 15)),
+            (datetime(2023, 9, 9, 23), datetime(2023, 9, 10)),
+        ],
+    )
+    def test_slots_not_aligned_to_segments_share_one_grid(
+        self, start: datetime, end: datetime
+    ) -> None:
+        one_day = SegmentInMinutes(24 * 60, self.FIFTEEN_MINUTES_SEGMENT_DURATION)
+
+        normalized = slot_to_normalized_slot(TimeSlot(start, end), one_day)
+
+        assert normalized == TimeSlot(datetime(2023, 9, 9), datetime(2023, 9, 10))
+
+    def test_slots_keep_their_time_zone(self) -> None:
+        start = datetime(2023, 9, 9, 10, 10, tzinfo=timezone.utc)
+        end = datetime(2023, 9, 9, 11, 50, tzinfo=timezone.utc)
+        ninety_minutes = SegmentInMinutes(90, self.FIFTEEN_MINUTES_SEGMENT_DURATION)
+
+        normalized = slot_to_normalized_slot(TimeSlot(start, end), ninety_minutes)
+
+        assert normalized == TimeSlot(
+            datetime(2023, 9, 9, 9, tzinfo=timezone.utc),
+            datetime(2023, 9, 9, 12, tzinfo=timezone.utc),
+        )
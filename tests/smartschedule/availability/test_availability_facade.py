@@ -1,11 +1,15 @@
 from datetime import timedelta
-from typing import Any
+from typing import Any, Callable
 
+from lagom import Container
 from mockito import verify  # type: ignore
 from mockito.matchers import arg_that  # type: ignore
+from sqlalchemy.orm import Session
 
 from smartschedule.availability.availability_facade import AvailabilityFacade
+from smartschedule.availability.availability_index import AvailabilityIndex
 from smartschedule.availability.calendar import Calendar
+from smartschedule.availability.calendar_cache import CalendarCache
 from smartschedule.availability.owner import Owner
 from smartschedule.availability.resource_id import ResourceId
 from smartschedule.availability.resource_taken_over import ResourceTakenOver
@@ -221,3 +225,191 @@ class TestAvailabilityFacade:
             and event.slot == time_slot
             and event.previous_owners == {initial_owner}
         )
+
+    def test_answers_window_queries_from_index(
+        self, availability_facade: AvailabilityFacade
+    ) -> None:
+        resource_id = ResourceId.new_one()
+        one_day = TimeSlot.create_daily_time_slot_at_utc(2021, 1, 1)
+        morning = TimeSlot(one_day.from_, one_day.from_ + timedelta(hours=6))
+        evening = TimeSlot(one_day.to - timedelta(hours=6), one_day.to)
+        owner = Owner.new_one()
+        availability_facade.create_resource_slots(resource_id, one_day)
+
+        availability_facade.block(resource_id, morning, owner)
+
+        assert availability_facade.is_entirely_available(resource_id, evening)
+        assert not availability_facade.is_entirely_available(resource_id, one_day)
+        assert availability_facade.find_owners(resource_id, morning) == {owner}
+        assert availability_facade.find_owners(resource_id, one_day) == {
+            owner,
+            Owner.none(),
+        }
+
+    def test_index_is_shared_and_follows_committed_changes(
+        self,
+        container: Container,
+        session: Session,
+        session_factory: Callable[[], Session],
+    ) -> None:
+        container[AvailabilityIndex] = AvailabilityIndex(max_resources=16)
+        reader_session = session_factory()
+        reader_container = container.clone()
+        reader_container[Session] = reader_session
+        writer = container.resolve(AvailabilityFacade)
+        reader = reader_container.resolve(AvailabilityFacade)
+        resource_id = ResourceId.new_one()
+        one_day = TimeSlot.create_daily_time_slot_at_utc(2021, 1, 1)
+        writer.create_resource_slots(resource_id, one_day)
+        session.commit()
+        assert reader.is_entirely_available(resource_id, one_day)
+
+        writer.block(resource_id, one_day, Owner.new_one())
+        assert not writer.is_entirely_available(resource_id, one_day)
+        assert reader.is_entirely_available(resource_id, one_day)
+        session.commit()
+
+        assert not reader.is_entirely_available(resource_id, one_day)
+        reader_session.close()
+
+    def test_index_follows_releases(
+        self, availability_facade: AvailabilityFacade
+    ) -> None:
+        resource_id = ResourceId.new_one()
+        one_day = TimeSlot.create_daily_time_slot_at_utc(2021, 1, 1)
+        owner = Owner.new_one()
+        availability_facade.create_resource_slots(resource_id, one_day)
+        availability_facade.block(resource_id, one_day, owner)
+        assert not availability_facade.is_entirely_available(resource_id, one_day)
+
+        availability_facade.release(resource_id, one_day, owner)
+
+        assert availability_facade.is_entirely_available(resource_id, one_day)
+
+    def test_creates_availability_slots_of_many_resources_at_once(
+        self, availability_facade: AvailabilityFacade
+    ) -> None:
+        resource_ids = [ResourceId.new_one() for _ in range(3)]
+        one_day = TimeSlot.create_daily_time_slot_at_utc(2021, 1, 1)
+        parent_id = ResourceId.new_one()
+
+        availability_facade.create_resource_slots_in_bulk(
+            [(resource_id, one_day) for resource_id in resource_ids], parent_id
+        )
+
+        entire_month = TimeSlot.create_monthly_time_slot_at_utc(2021, 1)
+        calendars = availability_facade.load_calendars(set(resource_ids), entire_month)
+        for resource_id in resource_ids:
+            assert calendars.get(resource_id) == Calendar.with_available_slots(
+                resource_id, one_day
+            )
+            assert len(availability_facade.find(resource_id, one_day)) == 24
+        assert availability_facade.find_by_parent_id(
+            parent_id, one_day
+        ).is_entirely_with_parent_id(parent_id)
+
+    def test_creates_availability_slots_at_resource_granularity(
+        self, availability_facade: AvailabilityFacade
+    ) -> None:
+        device_id = ResourceId.new_one()
+        one_day = TimeSlot.create_daily_time_slot_at_utc(2021, 1, 1)
+        owner = Owner.new_one()
+
+        availability_facade.create_resource_slots(
+            device_id, one_day, segment=SegmentInMinutes.of(24 * 60)
+        )
+
+        assert len(availability_facade.find(device_id, one_day)) == 1
+        one_hour = TimeSlot(one_day.from_, one_day.from_ + timedelta(hours=1))
+        assert availability_facade.block(device_id, one_hour, owner)
+        assert availability_facade.find_owners(device_id, one_day) == {owner}
+
+    def test_requests_not_aligned_to_resource_segments_see_its_blockade(
+        self, availability_facade: AvailabilityFacade
+    ) -> None:
+        device_id = ResourceId.new_one()
+        three_days = TimeSlot(
+            TimeSlot.create_daily_time_slot_at_utc(2021, 1, 1).from_,
+            TimeSlot.create_daily_time_slot_at_utc(2021, 1, 3).to,
+        )
+        availability_facade.create_resource_slots(
+            device_id, three_days, segment=SegmentInMinutes.of(24 * 60)
+        )
+        second_day = TimeSlot.create_daily_time_slot_at_utc(2021, 1, 2)
+        late_morning = TimeSlot(
+            second_day.from_ + timedelta(hours=10),
+            second_day.from_ + timedelta(hours=12),
+        )
+        from_noon_to_noon = TimeSlot(
+            second_day.from_ - timedelta(hours=12),
+            second_day.from_ + timedelta(hours=12),
+        )
+
+        assert availability_facade.block(device_id, late_morning, Owner.new_one())
+
+        assert len(availability_facade.find(device_id, late_morning)) == 1
+        assert not availability_facade.is_entirely_available(
+            device_id, from_noon_to_noon
+        )
+        assert len(availability_facade.find(device_id, from_noon_to_noon)) == 2
+
+    def test_loads_calendars_of_resources_with_different_granularities(
+        self, availability_facade: AvailabilityFacade
+    ) -> None:
+        device_id = ResourceId.new_one()
+        person_id = ResourceId.new_one()
+        two_days = TimeSlot(
+            TimeSlot.create_daily_time_slot_at_utc(2021, 1, 1).from_,
+            TimeSlot.create_daily_time_slot_at_utc(2021, 1, 2).to,
+        )
+        availability_facade.create_resource_slots(
+            device_id, two_days, segment=SegmentInMinutes.of(24 * 60)
+        )
+        availability_facade.create_resource_slots(person_id, two_days)
+        first_day_morning = TimeSlot(
+            two_days.from_, two_days.from_ + timedelta(hours=13)
+        )
+
+        calendars = availability_facade.load_calendars(
+            {device_id, person_id}, first_day_morning
+        )
+
+        assert calendars.get(device_id) == Calendar.with_available_slots(
+            device_id, TimeSlot.create_daily_time_slot_at_utc(2021, 1, 1)
+        )
+        assert calendars.get(person_id) == Calendar.with_available_slots(
+            person_id, first_day_morning
+        )
+
+    def test_calendar_cache_is_shared_and_follows_committed_changes(
+        self,
+        container: Container,
+        session: Session,
+        session_factory: Callable[[], Session],
+    ) -> None:
+        container[CalendarCache] = CalendarCache(max_size=16)
+        reader_session = session_factory()
+        reader_container = container.clone()
+        reader_container[Session] = reader_session
+        writer = container.resolve(AvailabilityFacade)
+        reader = reader_container.resolve(AvailabilityFacade)
+        resource_id = ResourceId.new_one()
+        one_day = TimeSlot.create_daily_time_slot_at_utc(2021, 1, 1)
+        owner = Owner.new_one()
+        available = Calendar.with_available_slots(resource_id, one_day)
+        blocked = Calendar(resource_id, {owner: [one_day]})
+        writer.create_resource_slots(resource_id, one_day)
+        session.commit()
+        assert reader.load_calendar(resource_id, one_day) == available
+        assert writer.load_calendar(resource_id, one_day) == available
+
+        writer.block(resource_id, one_day, owner)
+        assert writer.load_calendar(resource_id, one_day) == blocked
+        assert reader.load_calendar(resource_id, one_day) == available
+        session.commit()
+
+        assert reader.load_calendar(resource_id, one_day) == blocked
+        statistics = container.resolve(CalendarCache).statistics()
+        assert (statistics.hits, statistics.misses) == (2, 2)
+        assert statistics.invalidations == 1
+        reader_session.close()
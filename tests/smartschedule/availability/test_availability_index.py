@@ -0,0 +1,122 @@
+from typing import Callable, Final
+
+from smartschedule.availability.availability_index import AvailabilityIndex
+from smartschedule.availability.owner import Owner
+from smartschedule.availability.resource_availability import ResourceAvailability
+from smartschedule.availability.resource_grouped_availability import (
+    ResourceGroupedAvailability,
+)
+from smartschedule.availability.resource_id import ResourceId
+from smartschedule.availability.segment.segment_in_minutes import SegmentInMinutes
+from smartschedule.shared.timeslot.time_slot import TimeSlot
+
+
+class StoredAvailabilities:
+    def __init__(self, resource_id: ResourceId, slot: TimeSlot) -> None:
+        self.availabilities = ResourceGroupedAvailability.of(
+            resource_id, slot
+        ).resource_availabilities
+        self.loads = 0
+        self.on_load: Callable[[], None] = lambda: None
+
+    def load(self, slot: TimeSlot) -> list[ResourceAvailability]:
+        self.loads += 1
+        self.on_load()
+        return [
+            availability
+            for availability in self.availabilities
+            if availability.segment.from_ >= slot.from_
+            and availability.segment.to <= slot.to
+        ]
+
+    def block(self, owner: Owner) -> None:
+        for availability in self.availabilities:
+            availability.block(owner)
+
+
+class TestAvailabilityIndex:
+    ONE_DAY: Final = TimeSlot.create_daily_time_slot_at_utc(2021, 1, 1)
+    HOUR: Final = SegmentInMinutes.default_segment()
+
+    def test_loads_window_once(self) -> None:
+        index = AvailabilityIndex(max_resources=8)
+        resource_id = ResourceId.new_one()
+        stored = StoredAvailabilities(resource_id, self.ONE_DAY)
+
+        for _ in range(3):
+            assert index.is_entirely_available(
+                resource_id, self.ONE_DAY, self.HOUR, stored.load
+            )
+
+        assert stored.loads == 1
+
+    def test_forgotten_window_is_loaded_again(self) -> None:
+        index = AvailabilityIndex(max_resources=8)
+        resource_id = ResourceId.new_one()
+        owner = Owner.new_one()
+        stored = StoredAvailabilities(resource_id, self.ONE_DAY)
+        index.is_entirely_available(resource_id, self.ONE_DAY, self.HOUR, stored.load)
+
+        stored.block(owner)
+        index.forget({resource_id: [self.ONE_DAY]})
+
+        assert index.owners(resource_id, self.ONE_DAY, self.HOUR, stored.load) == {
+            owner
+        }
+        assert stored.loads == 2
+
+    def test_load_racing_with_a_change_is_not_kept(self) -> None:
+        index = AvailabilityIndex(max_resources=8)
+        resource_id = ResourceId.new_one()
+        stored = StoredAvailabilities(resource_id, self.ONE_DAY)
+
+        def change_while_loading() -> None:
+            stored.on_load = lambda: None
+            index.forget({resource_id: [self.ONE_DAY]})
+
+        stored.on_load = change_while_loading
+        index.is_entirely_available(resource_id, self.ONE_DAY, self.HOUR, stored.load)
+        index.is_entirely_available(resource_id, self.ONE_DAY, self.HOUR, stored.load)
+
+        # the racing load, the load answering it again, and one more
+        assert stored.loads == 3
+
+    def test_keeps_bounded_number_of_resources(self) -> None:
+        index = AvailabilityIndex(max_resources=2)
+        resources = [ResourceId.new_one() for _ in range(3)]
+        stored = {
+            resource_id: StoredAvailabilities(resource_id, self.ONE_DAY)
+            for resource_id in resources
+        }
+
+        for resource_id in [*resources, resources[0]]:
+            index.is_entirely_available(
+                resource_id, self.ONE_DAY, self.HOUR, stored[resource_id].load
+            )
+
+        assert stored[resources[0]].loads == 2
+        assert stored[resources[2]].loads == 1
+
+    def test_too_long_windows_are_answered_without_being_kept(self) -> None:
+        index = AvailabilityIndex(max_resources=8, max_segments_per_resource=12)
+        resource_id = ResourceId.new_one()
+        stored = StoredAvailabilities(resource_id, self.ONE_DAY)
+
+        for _ in range(2):
+            assert index.is_entirely_available(
+                resource_id, self.ONE_DAY, self.HOUR, stored.load
+            )
+
+        assert stored.loads == 2
+
+    def test_keeps_nothing_unless_sized(self) -> None:
+        index = AvailabilityIndex()
+        resource_id = ResourceId.new_one()
+        stored = StoredAvailabilities(resource_id, self.ONE_DAY)
+
+        for _ in range(2):
+            index.is_entirely_available(
+                resource_id, self.ONE_DAY, self.HOUR, stored.load
+            )
+
+        assert stored.loads == 2
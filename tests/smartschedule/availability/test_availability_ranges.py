@@ -0,0 +1,151 @@
+from datetime import datetime, timedelta, timezone
+from typing import Final
+
+from smartschedule.availability.availability_ranges import AvailabilityRanges
+from smartschedule.availability.owner import Owner
+from smartschedule.availability.resource_availability import ResourceAvailability
+from smartschedule.availability.resource_availability_id import ResourceAvailabilityId
+from smartschedule.availability.resource_grouped_availability import (
+    ResourceGroupedAvailability,
+)
+from smartschedule.availability.resource_id import ResourceId
+from smartschedule.availability.segment.segment_in_minutes import SegmentInMinutes
+from smartschedule.shared.timeslot.time_slot import TimeSlot
+
+
+class TestAvailabilityRanges:
+    MIDNIGHT: Final = datetime(2021, 1, 1, tzinfo=timezone.utc)
+    RESOURCE_ID: Final = ResourceId.new_one()
+    PARENT_ID: Final = ResourceId.new_one()
+
+    def test_merges_contiguous_segments_with_the_same_state(self) -> None:
+        ranges = self._one_free_day()
+
+        assert [availability_range.slot for availability_range in ranges.ranges] == [
+            self._hours(0, 24)
+        ]
+
+    def test_splits_and_merges_back_ranges(self) -> None:
+        ranges = self._one_free_day()
+        owner = Owner.new_one()
+
+        blocked = ranges.overwritten_with(self._blocked(ranges, 6, 9, owner))
+        released = blocked.overwritten_with(self._released(blocked, 6, 9, owner))
+
+        assert [availability_range.slot for availability_range in blocked.ranges] == [
+            self._hours(0, 6),
+            self._hours(6, 9),
+            self._hours(9, 24),
+        ]
+        assert blocked.ranges[1].blockade.taken_by == owner
+        assert [availability_range.slot for availability_range in released.ranges] == [
+            self._hours(0, 24)
+        ]
+        assert released.ranges[0].version == 2
+
+    def test_segments_keep_the_state_of_their_range(self) -> None:
+        ranges = self._one_free_day()
+        owner = Owner.new_one()
+        ranges = ranges.overwritten_with(self._blocked(ranges, 6, 9, owner))
+
+        segments = ranges.to_segments(self._hours(5, 10))
+
+        assert [segment.segment for segment in segments] == [
+            self._hours(hour, hour + 1) for hour in range(5, 10)
+        ]
+        assert [segment.blocked_by() == owner for segment in segments] == [
+            False,
+            True,
+            True,
+            True,
+            False,
+        ]
+        assert all(segment.parent_id == self.PARENT_ID for segment in segments)
+
+    def test_segments_loaded_before_a_conflicting_write_are_stale(self) -> None:
+        ranges = self._one_free_day()
+        first = self._blocked(ranges, 6, 9, Owner.new_one())
+        second = self._blocked(ranges, 8, 10, Owner.new_one())
+
+        ranges = ranges.overwritten_with(first)
+
+        assert ranges.is_stale(second)
+
+    def test_disjoint_writes_to_one_range_both_succeed(self) -> None:
+        ranges = self._one_free_day()
+        first = self._blocked(ranges, 6, 9, Owner.new_one())
+        second = self._blocked(ranges, 20, 22, Owner.new_one())
+
+        ranges = ranges.overwritten_with(first)
+        assert not ranges.is_stale(second)
+        ranges = ranges.overwritten_with(second)
+
+        assert [availability_range.slot for availability_range in ranges.ranges] == [
+            self._hours(0, 6),
+            self._hours(6, 9),
+            self._hours(9, 20),
+            self._hours(20, 22),
+            self._hours(22, 24),
+        ]
+        assert ranges.is_stale(first)
+
+    def test_segments_keep_their_ids_between_loads_and_writes(self) -> None:
+        ranges = self._one_free_day()
+        ids = self._ids_of(ranges)
+
+        assert self._ids_of(ranges) == ids
+        blocked = ranges.overwritten_with(self._blocked(ranges, 6, 9, Owner.new_one()))
+        assert self._ids_of(blocked) == ids
+
+    def test_finds_segment_by_its_id(self) -> None:
+        ranges = self._one_free_day()
+        ranges = ranges.overwritten_with(self._blocked(ranges, 6, 9, Owner.new_one()))
+        segment = ranges.to_segments(self._hours(12, 13))[0]
+
+        found = [
+            availability_range.segment_with_id(
+                segment.id, SegmentInMinutes.default_segment()
+            )
+            for availability_range in ranges.ranges
+        ]
+
+        assert found == [None, None, segment]
+
+    def test_segments_outside_of_ranges_are_stale(self) -> None:
+        ranges = self._one_free_day()
+        segments = self._blocked(ranges, 0, 2, Owner.new_one())
+
+        assert AvailabilityRanges([]).is_stale(segments)
+
+    def _one_free_day(self) -> AvailabilityRanges:
+        return AvailabilityRanges.of(
+            ResourceGroupedAvailability.of(
+                self.RESOURCE_ID, self._hours(0, 24), self.PARENT_ID
+            ).resource_availabilities
+        )
+
+    def _blocked(
+        self, ranges: AvailabilityRanges, start: int, end: int, owner: Owner
+    ) -> list[ResourceAvailability]:
+        grouped = ResourceGroupedAvailability(
+            ranges.to_segments(self._hours(start, end))
+        )
+        assert grouped.block(owner)
+        return grouped.resource_availabilities
+
+    def _released(
+        self, ranges: AvailabilityRanges, start: int, end: int, owner: Owner
+    ) -> list[ResourceAvailability]:
+        grouped = ResourceGroupedAvailability(
+            ranges.to_segments(self._hours(start, end))
+        )
+        assert grouped.release(owner)
+        return grouped.resource_availabilities
+
+    def _ids_of(self, ranges: AvailabilityRanges) -> list[ResourceAvailabilityId]:
+        return [segment.id for segment in ranges.to_segments(self._hours(0, 24))]
+
+    def _hours(self, start: int, end: int) -> TimeSlot:
+        return TimeSlot(
+            self.MIDNIGHT + timedelta(hours=start), self.MIDNIGHT + timedelta(hours=end)
+        )
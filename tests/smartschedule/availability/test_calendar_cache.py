@@ -0,0 +1,101 @@
+from datetime import timedelta
+
+from smartschedule import container as container_module
+from smartschedule.availability.calendar import Calendar
+from smartschedule.availability.calendar_cache import CalendarCache
+from smartschedule.availability.resource_id import ResourceId
+from smartschedule.shared.timeslot.time_slot import TimeSlot
+
+
+class TestCalendarCache:
+    RESOURCE_ID = ResourceId.new_one()
+    FIRST_DAY = TimeSlot.create_daily_time_slot_at_utc(2021, 1, 1)
+    SECOND_DAY = TimeSlot.create_daily_time_slot_at_utc(2021, 1, 2)
+
+    def test_returns_put_calendar(self) -> None:
+        cache = CalendarCache(max_size=8)
+        calendar = Calendar.with_available_slots(self.RESOURCE_ID, self.FIRST_DAY)
+
+        cache.put(self.FIRST_DAY, calendar, cache.now())
+
+        assert cache.get(self.RESOURCE_ID, self.FIRST_DAY) is calendar
+        assert cache.get(self.RESOURCE_ID, self.SECOND_DAY) is None
+        statistics = cache.statistics()
+        assert (statistics.hits, statistics.misses) == (1, 1)
+        assert statistics.hit_rate == 0.5
+
+    def test_invalidates_only_overlapping_windows(self) -> None:
+        cache = CalendarCache(max_size=8)
+        other_resource_id = ResourceId.new_one()
+        cache.put(self.FIRST_DAY, Calendar.empty(self.RESOURCE_ID), cache.now())
+        cache.put(self.SECOND_DAY, Calendar.empty(self.RESOURCE_ID), cache.now())
+        cache.put(self.FIRST_DAY, Calendar.empty(other_resource_id), cache.now())
+
+        cache.invalidate(
+            self.RESOURCE_ID,
+            TimeSlot(self.FIRST_DAY.from_, self.FIRST_DAY.from_ + timedelta(hours=1)),
+        )
+
+        assert cache.get(self.RESOURCE_ID, self.FIRST_DAY) is None
+        assert cache.get(self.RESOURCE_ID, self.SECOND_DAY) is not None
+        assert cache.get(other_resource_id, self.FIRST_DAY) is not None
+        assert cache.statistics().invalidations == 1
+
+    def test_change_ending_where_window_starts_does_not_invalidate_it(self) -> None:
+        cache = CalendarCache(max_size=8)
+        cache.put(self.SECOND_DAY, Calendar.empty(self.RESOURCE_ID), cache.now())
+
+        cache.invalidate(self.RESOURCE_ID, self.FIRST_DAY)
+
+        assert cache.get(self.RESOURCE_ID, self.SECOND_DAY) is not None
+
+    def test_evicts_least_recently_used(self) -> None:
+        cache = CalendarCache(max_size=2)
+        third_day = TimeSlot.create_daily_time_slot_at_utc(2021, 1, 3)
+        cache.put(self.FIRST_DAY, Calendar.empty(self.RESOURCE_ID), cache.now())
+        cache.put(self.SECOND_DAY, Calendar.empty(self.RESOURCE_ID), cache.now())
+        cache.get(self.RESOURCE_ID, self.FIRST_DAY)
+
+        cache.put(third_day, Calendar.empty(self.RESOURCE_ID), cache.now())
+
+        assert cache.get(self.RESOURCE_ID, self.SECOND_DAY) is None
+        assert cache.get(self.RESOURCE_ID, self.FIRST_DAY) is not None
+        assert cache.statistics().evictions == 1
+        assert cache.statistics().size == 2
+
+    def test_invalidates_all_windows_of_resource(self) -> None:
+        cache = CalendarCache(max_size=8)
+        cache.put(self.FIRST_DAY, Calendar.empty(self.RESOURCE_ID), cache.now())
+        cache.put(self.SECOND_DAY, Calendar.empty(self.RESOURCE_ID), cache.now())
+
+        cache.invalidate_all_of(self.RESOURCE_ID)
+
+        assert cache.statistics().size == 0
+        assert cache.statistics().invalidations == 2
+
+    def test_does_not_keep_calendar_read_before_a_change(self) -> None:
+        cache = CalendarCache(max_size=8)
+        read_at = cache.now()
+
+        cache.forget({self.RESOURCE_ID: [self.FIRST_DAY]})
+        cache.put(self.SECOND_DAY, Calendar.empty(self.RESOURCE_ID), read_at)
+
+        assert cache.get(self.RESOURCE_ID, self.SECOND_DAY) is None
+
+    def test_keeps_nothing_unless_sized(self) -> None:
+        cache = CalendarCache()
+
+        cache.put(self.FIRST_DAY, Calendar.empty(self.RESOURCE_ID), cache.now())
+
+        assert cache.get(self.RESOURCE_ID, self.FIRST_DAY) is None
+        assert cache.statistics().size == 0
+
+    def test_container_keeps_calendars_only_when_asked_to(self) -> None:
+        plain = container_module.build().resolve(CalendarCache)
+        sized = container_module.build(calendar_cache_size=8).resolve(CalendarCache)
+
+        plain.put(self.FIRST_DAY, Calendar.empty(self.RESOURCE_ID), plain.now())
+        sized.put(self.FIRST_DAY, Calendar.empty(self.RESOURCE_ID), sized.now())
+
+        assert plain.get(self.RESOURCE_ID, self.FIRST_DAY) is None
+        assert sized.get(self.RESOURCE_ID, self.FIRST_DAY) is not None
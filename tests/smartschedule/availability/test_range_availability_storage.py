@@ -0,0 +1,155 @@
+from datetime import timedelta
+
+import pytest
+from lagom import Container
+from sqlalchemy.orm import Session
+
+from smartschedule.availability.availability_facade import AvailabilityFacade
+from smartschedule.availability.calendar import Calendar
+from smartschedule.availability.calendar_cache import CalendarCache
+from smartschedule.availability.owner import Owner
+from smartschedule.availability.range_resource_availability_read_model import (
+    RangeResourceAvailabilityReadModel,
+)
+from smartschedule.availability.range_resource_availability_repository import (
+    RangeResourceAvailabilityRepository,
+    availability_ranges,
+)
+from smartschedule.availability.resource_availability_read_model import (
+    ResourceAvailabilityReadModel,
+)
+from smartschedule.availability.resource_availability_repository import (
+    ResourceAvailabilityRepository,
+)
+from smartschedule.availability.resource_id import ResourceId
+from smartschedule.shared.timeslot.time_slot import TimeSlot
+
+
+@pytest.fixture()
+def range_repository(session: Session) -> RangeResourceAvailabilityRepository:
+    return RangeResourceAvailabilityRepository(session)
+
+
+@pytest.fixture()
+def range_availability_facade(
+    container: Container,
+    session: Session,
+    range_repository: RangeResourceAvailabilityRepository,
+) -> AvailabilityFacade:
+    container[ResourceAvailabilityRepository] = range_repository
+    container[ResourceAvailabilityReadModel] = RangeResourceAvailabilityReadModel(
+        session, container.resolve(CalendarCache)
+    )
+    return container.resolve(AvailabilityFacade)
+
+
+class TestRangeAvailabilityStorage:
+    ONE_DAY = TimeSlot.create_daily_time_slot_at_utc(2021, 1, 1)
+    MORNING = TimeSlot(ONE_DAY.from_, ONE_DAY.from_ + timedelta(hours=6))
+    EVENING = TimeSlot(ONE_DAY.to - timedelta(hours=6), ONE_DAY.to)
+
+    def test_stores_free_day_as_one_range(
+        self, range_availability_facade: AvailabilityFacade, session: Session
+    ) -> None:
+        resource_id = ResourceId.new_one()
+
+        range_availability_facade.create_resource_slots(resource_id, self.ONE_DAY)
+
+        assert self._ranges_of(session, resource_id) == 1
+        assert len(range_availability_facade.find(resource_id, self.ONE_DAY)) == 24
+
+    def test_splits_and_merges_ranges(
+        self, range_availability_facade: AvailabilityFacade, session: Session
+    ) -> None:
+        resource_id = ResourceId.new_one()
+        owner = Owner.new_one()
+        range_availability_facade.create_resource_slots(resource_id, self.ONE_DAY)
+
+        assert range_availability_facade.block(resource_id, self.MORNING, owner)
+        assert self._ranges_of(session, resource_id) == 2
+        calendar = range_availability_facade.load_calendar(resource_id, self.ONE_DAY)
+        assert calendar.taken_by(owner) == [self.MORNING]
+
+        assert range_availability_facade.release(resource_id, self.MORNING, owner)
+        assert self._ranges_of(session, resource_id) == 1
+        calendar = range_availability_facade.load_calendar(resource_id, self.ONE_DAY)
+        assert calendar == Calendar.with_available_slots(resource_id, self.ONE_DAY)
+
+    def test_calendar_is_cut_to_the_window(
+        self, range_availability_facade: AvailabilityFacade
+    ) -> None:
+        resource_id = ResourceId.new_one()
+        range_availability_facade.create_resource_slots(resource_id, self.ONE_DAY)
+
+        calendar = range_availability_facade.load_calendar(resource_id, self.EVENING)
+
+        assert calendar == Calendar.with_available_slots(resource_id, self.EVENING)
+
+    def test_detects_conflicting_writers(
+        self,
+        range_availability_facade: AvailabilityFacade,
+        range_repository: RangeResourceAvailabilityRepository,
+    ) -> None:
+        resource_id = ResourceId.new_one()
+        range_availability_facade.create_resource_slots(resource_id, self.ONE_DAY)
+        stale = range_availability_facade.find(resource_id, self.ONE_DAY)
+        range_availability_facade.block(resource_id, self.MORNING, Owner.new_one())
+
+        stale.block(Owner.new_one())
+
+        assert range_repository.save_checking_version(stale) is False
+
+    def test_disjoint_writers_of_one_range_both_succeed(
+        self,
+        range_availability_facade: AvailabilityFacade,
+        range_repository: RangeResourceAvailabilityRepository,
+    ) -> None:
+        resource_id = ResourceId.new_one()
+        range_availability_facade.create_resource_slots(resource_id, self.ONE_DAY)
+        morning = range_availability_facade.find(resource_id, self.MORNING)
+        evening = range_availability_facade.find(resource_id, self.EVENING)
+
+        morning.block(Owner.new_one())
+        evening.block(Owner.new_one())
+
+        assert range_repository.save_checking_version(morning) is True
+        assert range_repository.save_checking_version(evening) is True
+
+    def test_loads_segment_by_id_after_its_range_got_split(
+        self,
+        range_availability_facade: AvailabilityFacade,
+        range_repository: RangeResourceAvailabilityRepository,
+    ) -> None:
+        resource_id = ResourceId.new_one()
+        range_availability_facade.create_resource_slots(resource_id, self.ONE_DAY)
+        evening = range_availability_facade.find(resource_id, self.EVENING)
+        range_availability_facade.block(resource_id, self.MORNING, Owner.new_one())
+
+        expected = evening.resource_availabilities[2]
+
+        loaded = range_repository.load_by_id(expected.id)
+
+        assert loaded == expected
+        assert loaded.segment == expected.segment
+
+    def test_cant_block_already_blocked_part(
+        self, range_availability_facade: AvailabilityFacade
+    ) -> None:
+        resource_id = ResourceId.new_one()
+        range_availability_facade.create_resource_slots(resource_id, self.ONE_DAY)
+        range_availability_facade.block(resource_id, self.MORNING, Owner.new_one())
+
+        result = range_availability_facade.block(
+            resource_id, self.ONE_DAY, Owner.new_one()
+        )
+
+        assert result is False
+
+    def _ranges_of(self, session: Session, resource_id: ResourceId) -> int:
+        return len(
+            session.execute(
+                availability_ranges.select().filter(
+                    availability_ranges.c.resource_id == resource_id.id
+                )
+            ).all()
+        )
@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta, timezone
+from typing import Final
+
+from smartschedule.availability.owner import Owner
+from smartschedule.availability.resource_availability_index import (
+    ResourceAvailabilityIndex,
+)
+from smartschedule.shared.timeslot.time_slot import TimeSlot
+
+
+class TestResourceAvailabilityIndex:
+    HOUR: Final = timedelta(hours=1)
+    MIDNIGHT: Final = datetime(2021, 1, 1, tzinfo=timezone.utc)
+    FREE: Final = Owner.none()
+    OWNER: Final = Owner.new_one()
+    OTHER_OWNER: Final = Owner.new_one()
+
+    def test_window_is_free_only_when_all_segments_are_present_and_free(
+        self,
+    ) -> None:
+        index = ResourceAvailabilityIndex(self.MIDNIGHT, self.HOUR)
+        for hour in range(4):
+            index.put(self._hours(hour, hour + 1), self.FREE, False)
+
+        assert index.is_free(self._hours(0, 4))
+        assert not index.is_free(self._hours(0, 5))
+
+        index.put(self._hours(2, 3), self.OWNER, False)
+
+        assert index.is_free(self._hours(0, 2))
+        assert not index.is_free(self._hours(1, 3))
+
+    def test_disabled_segments_are_not_free(self) -> None:
+        index = ResourceAvailabilityIndex(self.MIDNIGHT, self.HOUR)
+        index.put(self._hours(0, 1), self.FREE, True)
+
+        assert not index.is_free(self._hours(0, 1))
+
+    def test_finds_owners_of_present_segments(self) -> None:
+        index = ResourceAvailabilityIndex(self.MIDNIGHT, self.HOUR)
+        index.put(self._hours(0, 1), self.FREE, False)
+        index.put(self._hours(1, 2), self.OWNER, False)
+        index.put(self._hours(3, 4), self.OTHER_OWNER, True)
+
+        assert index.owners(self._hours(0, 2)) == {self.FREE, self.OWNER}
+        assert index.owners(self._hours(1, 4)) == {self.OWNER, self.OTHER_OWNER}
+        assert index.owners(self._hours(4, 6)) == set()
+
+    def test_grows_in_both_directions(self) -> None:
+        index = ResourceAvailabilityIndex(self.MIDNIGHT, self.HOUR)
+        index.put(self._hours(0, 1), self.OWNER, False)
+
+        index.put(self._hours(-2, -1), self.OTHER_OWNER, False)
+        index.put(self._hours(10, 11), self.FREE, False)
+
+        assert index.owners(self._hours(-2, 11)) == {
+            self.FREE,
+            self.OWNER,
+            self.OTHER_OWNER,
+        }
+        assert index.owners(self._hours(0, 1)) == {self.OWNER}
+
+    def test_reports_span_of_unknown_segments(self) -> None:
+        index = ResourceAvailabilityIndex(self.MIDNIGHT, self.HOUR)
+        index.mark_known(self._hours(0, 2))
+        index.put(self._hours(5, 6), self.FREE, False)
+
+        assert index.unknown_within(self._hours(0, 2)) is None
+        assert index.unknown_within(self._hours(0, 8)) == self._hours(2, 8)
+        assert index.unknown_within(self._hours(-1, 1)) == self._hours(-1, 0)
+
+    def test_forgets_only_the_given_window(self) -> None:
+        index = ResourceAvailabilityIndex(self.MIDNIGHT, self.HOUR)
+        index.mark_known(self._hours(0, 4))
+
+        index.forget(self._hours(1, 2))
+        index.forget(self._hours(-5, -4))
+
+        assert index.unknown_within(self._hours(0, 4)) == self._hours(1, 2)
+        assert index.length_covering(self._hours(0, 4)) == 4
+
+    def test_naive_moments_are_taken_as_utc(self) -> None:
+        index = ResourceAvailabilityIndex(self.MIDNIGHT, self.HOUR)
+        naive_midnight = self.MIDNIGHT.replace(tzinfo=None)
+
+        index.put(
+            TimeSlot(naive_midnight, naive_midnight + self.HOUR), self.FREE, False
+        )
+
+        assert index.is_free(self._hours(0, 1))
+
+    def _hours(self, start: int, end: int) -> TimeSlot:
+        return TimeSlot(
+            self.MIDNIGHT + start * self.HOUR, self.MIDNIGHT + end * self.HOUR
+        )
@@ -6,6 +6,9 @@ from smartschedule.availability.resource_availability_id import ResourceAvailabi
 from smartschedule.availability.resource_availability_repository import (
     ResourceAvailabilityRepository,
 )
+from smartschedule.availability.resource_grouped_availability import (
+    ResourceGroupedAvailability,
+)
 from smartschedule.availability.resource_id import ResourceId
 from smartschedule.shared.timeslot.time_slot import TimeSlot
 
@@ -57,3 +60,29 @@ class TestResourceAvailabilityOptimisticLocking:
         assert results.count(False) > 0
         loaded = repository.load_by_id(resource_availability.id)
         assert loaded.version < 10
+
+    def test_conflict_on_one_segment_leaves_all_segments_untouched(
+        self, repository: ResourceAvailabilityRepository
+    ) -> None:
+        resource_id = ResourceId.new_one()
+        one_day = TimeSlot.create_daily_time_slot_at_utc(2021, 1, 1)
+        repository.save_new(ResourceGroupedAvailability.of(resource_id, one_day))
+        stale = ResourceGroupedAvailability(
+            repository.load_all_within_slot(resource_id, one_day)
+        )
+        concurrent = repository.load_by_id(stale.resource_availabilities[5].id)
+        concurrent.block(Owner.new_one())
+        repository.save_checking_version(concurrent)
+
+        owner = Owner.new_one()
+        stale.block(owner)
+        result = repository.save_checking_version(stale)
+
+        assert result is False
+        loaded = ResourceGroupedAvailability(
+            repository.load_all_within_slot(resource_id, one_day)
+        )
+        assert loaded.find_blocked_by(owner) == []
+        assert sorted(ra.version for ra in loaded.resource_availabilities) == [
+            0
+        ] * 23 + [1]
@@ -1,4 +1,5 @@
 from dataclasses import dataclass, field
+from typing import Hashable, Iterable
 from uuid import UUID, uuid4
 
 from smartschedule.optimization.capacity_dimension import CapacityDimension
@@ -13,6 +14,9 @@ class CapabilityCapacityDimension(CapacityDimension):
     capacity_name: str
     capacity_type: str
 
+    def index_keys(self) -> Iterable[Hashable] | None:
+        return [(self.capacity_name, self.capacity_type)]
+
 
 @dataclass(frozen=True)
 class CapabilityWeightDimension(WeightDimension[CapabilityCapacityDimension]):
@@ -24,6 +28,9 @@ class CapabilityWeightDimension(WeightDimension[CapabilityCapacityDimension]):
             capacity.capacity_name == self.name and capacity.capacity_type == self.type
         )
 
+    def index_key(self) -> Hashable:
+        return self.name, self.type
+
 
 @dataclass(frozen=True)
 class CapabilityTimedCapacityDimension(CapacityDimension):
@@ -0,0 +1,90 @@
+from datetime import timedelta
+
+from smartschedule.optimization.item import Item
+from smartschedule.optimization.optimization_facade import OptimizationFacade
+from smartschedule.optimization.total_capacity import TotalCapacity
+from smartschedule.optimization.total_weight import TotalWeight
+from tests.smartschedule.optimization.capability_capacity_dimension import (
+    CapabilityCapacityDimension,
+    CapabilityWeightDimension,
+)
+
+ITEMS = [
+    Item(
+        "Item1",
+        100,
+        TotalWeight.of(
+            CapabilityWeightDimension("JAVA", "Skill"),
+            CapabilityWeightDimension("JAVA", "Skill"),
+        ),
+    ),
+    Item("Item2", 60, TotalWeight.of(CapabilityWeightDimension("JAVA", "Skill"))),
+    Item("Item3", 60, TotalWeight.of(CapabilityWeightDimension("JAVA", "Skill"))),
+    Item("Item4", 10, TotalWeight.zero()),
+]
+
+
+def two_java_developers() -> TotalCapacity:
+    return TotalCapacity.of(
+        CapabilityCapacityDimension("anna", "JAVA", "Skill"),
+        CapabilityCapacityDimension("zbyniu", "JAVA", "Skill"),
+    )
+
+
+class TestAnytimeOptimization:
+    def test_improves_greedy_solution_and_proves_it_optimal(
+        self, optimization_facade: OptimizationFacade
+    ) -> None:
+        bounded = optimization_facade.calculate_within(
+            ITEMS, two_java_developers(), timedelta(seconds=10)
+        )
+
+        assert bounded.result.profit == 130
+        assert {item.name for item in bounded.result.chosen_items} == {
+            "Item2",
+            "Item3",
+            "Item4",
+        }
+        assert bounded.is_optimal()
+        assert bounded.optimality_gap == 0
+
+    def test_returns_best_result_so_far_with_bound_when_out_of_time(
+        self, optimization_facade: OptimizationFacade
+    ) -> None:
+        bounded = optimization_facade.calculate_within(
+            ITEMS, two_java_developers(), timedelta(0)
+        )
+
+        assert bounded.result.profit == 10
+        assert bounded.upper_bound == 130
+        assert not bounded.is_optimal()
+        assert bounded.optimality_gap == 120 / 130
+
+    def test_returns_incumbent_at_once_without_budget_on_large_problem(
+        self, optimization_facade: OptimizationFacade
+    ) -> None:
+        items = [
+            Item(
+                f"Item{i}",
+                i % 97 + 1,
+                TotalWeight.of(
+                    *(
+                        CapabilityWeightDimension(f"SKILL{(i + j) % 50}", "Skill")
+                        for j in range(3)
+                    )
+                ),
+            )
+            for i in range(10000)
+        ]
+        capacity = TotalCapacity.of(
+            *(
+                CapabilityCapacityDimension(f"person{i}", f"SKILL{i % 50}", "Skill")
+                for i in range(1000)
+            )
+        )
+
+        bounded = optimization_facade.calculate_within(items, capacity, timedelta(0))
+
+        # out of time before the greedy pass matched anything
+        assert bounded.result.profit == 0
+        assert bounded.upper_bound >= bounded.result.profit
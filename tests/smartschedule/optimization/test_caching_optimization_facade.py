@@ -0,0 +1,132 @@
+import pytest
+
+from smartschedule import container as container_module
+from smartschedule.optimization.caching_optimization_facade import (
+    CachingOptimizationFacade,
+)
+from smartschedule.optimization.compact_problem_builder import CompactProblemBuilder
+from smartschedule.optimization.item import Item
+from smartschedule.optimization.optimization_facade import OptimizationFacade
+from smartschedule.optimization.optimization_result_cache import (
+    OptimizationResultCache,
+)
+from smartschedule.optimization.total_capacity import TotalCapacity
+from smartschedule.optimization.total_weight import TotalWeight
+from tests.smartschedule.optimization.capability_capacity_dimension import (
+    CapabilityCapacityDimension,
+    CapabilityWeightDimension,
+)
+
+ITEM1 = Item("Item1", 100, TotalWeight.of(CapabilityWeightDimension("JAVA", "Skill")))
+ITEM2 = Item("Item2", 300, TotalWeight.of(CapabilityWeightDimension("JAVA", "Skill")))
+ANNA = CapabilityCapacityDimension("anna", "JAVA", "Skill")
+ZBYNIU = CapabilityCapacityDimension("zbyniu", "JAVA", "Skill")
+
+
+@pytest.fixture()
+def caching_facade() -> CachingOptimizationFacade:
+    return CachingOptimizationFacade(OptimizationResultCache(max_size=2))
+
+
+class TestCachingOptimizationFacade:
+    def test_same_problem_is_solved_once(
+        self, caching_facade: CachingOptimizationFacade
+    ) -> None:
+        first = caching_facade.calculate([ITEM1, ITEM2], TotalCapacity.of(ANNA, ZBYNIU))
+        second = caching_facade.calculate(
+            [ITEM1, ITEM2], TotalCapacity.of(ANNA, ZBYNIU)
+        )
+
+        assert second == first
+        statistics = caching_facade.cache.statistics()
+        assert (statistics.hits, statistics.misses) == (1, 1)
+        assert statistics.hit_rate == 0.5
+
+    def test_same_problem_in_different_order_is_solved_as_given(
+        self, caching_facade: CachingOptimizationFacade
+    ) -> None:
+        other_item1 = Item("Other item1", 100, ITEM1.total_weight)
+        problems = [
+            ([ITEM1, other_item1], TotalCapacity.of(ANNA)),
+            ([other_item1, ITEM1], TotalCapacity.of(ANNA)),
+            ([ITEM1], TotalCapacity.of(ANNA, ZBYNIU)),
+            ([ITEM1], TotalCapacity.of(ZBYNIU, ANNA)),
+        ]
+
+        for items, capacity in problems:
+            assert caching_facade.calculate(items, capacity) == (
+                OptimizationFacade().calculate(items, capacity)
+            )
+
+        assert caching_facade.cache.statistics().misses == 4
+
+    def test_callers_get_their_own_copy_of_cached_result(
+        self, caching_facade: CachingOptimizationFacade
+    ) -> None:
+        first = caching_facade.calculate([ITEM1, ITEM2], TotalCapacity.of(ANNA))
+        first.chosen_items.clear()
+        first.item_to_capacities.clear()
+
+        second = caching_facade.calculate([ITEM1, ITEM2], TotalCapacity.of(ANNA))
+
+        assert second.chosen_items == [ITEM2]
+        assert second.item_to_capacities == {ITEM2: {ANNA}}
+
+    def test_errors_of_sort_key_getter_are_not_swallowed(
+        self, caching_facade: CachingOptimizationFacade
+    ) -> None:
+        def broken_sort_key(item: Item[CapabilityCapacityDimension]) -> int:
+            raise TypeError("broken")
+
+        with pytest.raises(TypeError, match="broken"):
+            caching_facade.calculate([ITEM1], TotalCapacity.of(ANNA), broken_sort_key)
+
+    def test_different_sort_keys_are_different_problems(
+        self, caching_facade: CachingOptimizationFacade
+    ) -> None:
+        by_value = caching_facade.calculate([ITEM1, ITEM2], TotalCapacity.of(ANNA))
+        by_name = caching_facade.calculate(
+            [ITEM1, ITEM2], TotalCapacity.of(ANNA), lambda item: item.name
+        )
+
+        assert by_value.profit == 300
+        assert by_name.profit == 100
+        assert caching_facade.cache.statistics().misses == 2
+
+    def test_least_recently_used_results_are_evicted(
+        self, caching_facade: CachingOptimizationFacade
+    ) -> None:
+        caching_facade.calculate([ITEM1], TotalCapacity.of(ANNA))
+        caching_facade.calculate([ITEM2], TotalCapacity.of(ANNA))
+        caching_facade.calculate([ITEM1], TotalCapacity.of(ANNA))
+        caching_facade.calculate([ITEM1, ITEM2], TotalCapacity.of(ANNA))
+
+        caching_facade.calculate([ITEM1], TotalCapacity.of(ANNA))
+        caching_facade.calculate([ITEM2], TotalCapacity.of(ANNA))
+
+        statistics = caching_facade.cache.statistics()
+        assert statistics.evictions == 2
+        assert statistics.size == 2
+        assert (statistics.hits, statistics.misses) == (2, 4)
+
+    def test_compact_problems_are_cached_too(
+        self, caching_facade: CachingOptimizationFacade
+    ) -> None:
+        builder = CompactProblemBuilder()
+        builder.add_item("Java", 100, [("JAVA", 10, 20)])
+        builder.add_capacity("anna", ["JAVA"], 0, 30)
+
+        first = caching_facade.calculate_compact(builder.build())
+        second = caching_facade.calculate_compact(builder.build())
+
+        assert second == first
+        assert caching_facade.cache.statistics().hits == 1
+
+    def test_container_caches_results_only_when_asked_to(self) -> None:
+        plain = container_module.build().resolve(OptimizationFacade)
+        caching = container_module.build(optimization_cache_size=8).resolve(
+            OptimizationFacade
+        )
+
+        assert not isinstance(plain, CachingOptimizationFacade)
+        assert isinstance(caching, CachingOptimizationFacade)
@@ -0,0 +1,62 @@
+from dataclasses import dataclass
+
+from smartschedule.optimization.capacity_index import CapacityIndex
+from smartschedule.optimization.total_weight import TotalWeight
+from tests.smartschedule.optimization.capability_capacity_dimension import (
+    CapabilityCapacityDimension,
+    CapabilityWeightDimension,
+)
+
+
+@dataclass(frozen=True)
+class NotKeyedCapabilityCapacityDimension(CapabilityCapacityDimension):
+    def index_keys(self) -> None:
+        return None
+
+
+class TestCapacityIndex:
+    def test_matches_only_capacities_under_the_same_key(self) -> None:
+        java = CapabilityCapacityDimension("anna", "JAVA", "Skill")
+        python = CapabilityCapacityDimension("zbyniu", "PYTHON", "Skill")
+        index = CapacityIndex([java, python])
+
+        result = index.match(
+            TotalWeight.of(CapabilityWeightDimension("PYTHON", "Skill"))
+        )
+
+        assert result == [python]
+
+    def test_nothing_is_matched_when_one_of_components_is_not_satisfied(
+        self,
+    ) -> None:
+        java = CapabilityCapacityDimension("anna", "JAVA", "Skill")
+        index = CapacityIndex([java])
+
+        result = index.match(
+            TotalWeight.of(
+                CapabilityWeightDimension("JAVA", "Skill"),
+                CapabilityWeightDimension("PYTHON", "Skill"),
+            )
+        )
+
+        assert result == []
+
+    def test_removed_capacities_are_not_matched_anymore(self) -> None:
+        anna = CapabilityCapacityDimension("anna", "JAVA", "Skill")
+        zbyniu = CapabilityCapacityDimension("zbyniu", "JAVA", "Skill")
+        index = CapacityIndex([anna, zbyniu])
+        weight = TotalWeight.of(CapabilityWeightDimension("JAVA", "Skill"))
+
+        index.remove(index.match(weight))
+
+        assert index.match(weight) == [zbyniu]
+        index.remove([zbyniu])
+        assert index.match(weight) == []
+
+    def test_not_keyed_capacities_are_offered_in_original_order(self) -> None:
+        not_keyed = NotKeyedCapabilityCapacityDimension("anna", "JAVA", "Skill")
+        keyed = CapabilityCapacityDimension("zbyniu", "JAVA", "Skill")
+        index = CapacityIndex([not_keyed, keyed])
+        weight = TotalWeight.of(CapabilityWeightDimension("JAVA", "Skill"))
+
+        assert index.match(weight) == [not_keyed]
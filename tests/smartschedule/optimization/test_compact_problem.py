@@ -0,0 +1,70 @@
+from smartschedule.optimization.compact_problem_builder import CompactProblemBuilder
+from smartschedule.optimization.optimization_facade import OptimizationFacade
+
+
+class TestCompactProblem:
+    def test_chooses_most_profitable_items_that_fit(
+        self, optimization_facade: OptimizationFacade
+    ) -> None:
+        builder = CompactProblemBuilder()
+        builder.add_item("Java", 100, [("JAVA", 10, 20)])
+        builder.add_item("Python", 300, [("PYTHON", 10, 20), ("JAVA", 12, 14)])
+        builder.add_item("Rust", 200, [("RUST", 10, 20)])
+        builder.add_capacity("anna", ["JAVA"], 0, 30)
+        builder.add_capacity("zbyniu", ["PYTHON", "RUST"], 0, 30)
+
+        solution = optimization_facade.calculate_compact(builder.build())
+
+        assert solution.profit == 300
+        assert solution.chosen_items == [1]
+        assert solution.item_to_capacities == {1: [0, 1]}
+
+    def test_demand_must_be_within_capacity_bounds(
+        self, optimization_facade: OptimizationFacade
+    ) -> None:
+        builder = CompactProblemBuilder()
+        builder.add_item("Java", 100, [("JAVA", 10, 20)])
+        builder.add_capacity("anna", ["JAVA"], 11, 30)
+        builder.add_capacity("zbyniu", ["JAVA"], 0, 19)
+
+        solution = optimization_facade.calculate_compact(builder.build())
+
+        assert solution.profit == 0
+        assert solution.item_to_capacities == {}
+
+    def test_items_without_demands_are_always_chosen(
+        self, optimization_facade: OptimizationFacade
+    ) -> None:
+        builder = CompactProblemBuilder()
+        builder.add_item("Nothing", 50, [])
+        builder.add_item("Java", 100, [("JAVA", 10, 20)])
+
+        solution = optimization_facade.calculate_compact(builder.build())
+
+        assert solution.profit == 50
+        assert solution.chosen_items == [0]
+
+    def test_capacities_with_same_identity_are_consumed_together(
+        self, optimization_facade: OptimizationFacade
+    ) -> None:
+        builder = CompactProblemBuilder()
+        builder.add_item("Java", 300, [("JAVA", 10, 20)])
+        builder.add_item("Another Java", 100, [("JAVA", 10, 20)])
+        builder.add_capacity("anna", ["JAVA"], 0, 30)
+        builder.add_capacity("anna", ["JAVA"], 0, 30)
+
+        solution = optimization_facade.calculate_compact(builder.build())
+
+        assert solution.profit == 300
+        assert solution.item_to_capacities == {0: [0]}
+
+    def test_built_problem_does_not_change_when_builder_grows(self) -> None:
+        builder = CompactProblemBuilder()
+        builder.add_item("Java", 100, [("JAVA", 10, 20)])
+        problem = builder.build()
+
+        builder.add_capacity("anna", ["JAVA"], 0, 30)
+
+        assert problem.capacities_count == 0
+        assert builder.build().capacities_count == 1
+        assert problem.fingerprint() != builder.build().fingerprint()
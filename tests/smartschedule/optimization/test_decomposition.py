@@ -0,0 +1,96 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from smartschedule.optimization.decomposition import split_into_components
+from smartschedule.optimization.item import Item
+from smartschedule.optimization.optimization_facade import OptimizationFacade
+from smartschedule.optimization.total_capacity import TotalCapacity
+from smartschedule.optimization.total_weight import TotalWeight
+from tests.smartschedule.optimization.capability_capacity_dimension import (
+    CapabilityCapacityDimension,
+    CapabilityWeightDimension,
+)
+
+ITEMS = [
+    Item("Item1", 100, TotalWeight.of(CapabilityWeightDimension("JAVA", "Skill"))),
+    Item("Item2", 300, TotalWeight.of(CapabilityWeightDimension("JAVA", "Skill"))),
+    Item("Item3", 200, TotalWeight.of(CapabilityWeightDimension("PYTHON", "Skill"))),
+    Item("Item4", 50, TotalWeight.of(CapabilityWeightDimension("RUST", "Skill"))),
+    Item("Item5", 10, TotalWeight.zero()),
+]
+
+CAPACITY_DIMENSIONS = [
+    CapabilityCapacityDimension("anna", "JAVA", "Skill"),
+    CapabilityCapacityDimension("zbyniu", "PYTHON", "Skill"),
+    CapabilityCapacityDimension("leon", "JAVA", "Skill"),
+    CapabilityCapacityDimension("staszek", "PHP", "Skill"),
+]
+CAPACITIES = TotalCapacity.of(*CAPACITY_DIMENSIONS)
+
+
+class TestDecomposition:
+    def test_items_competing_for_the_same_capacities_are_in_one_component(
+        self,
+    ) -> None:
+        components = split_into_components(ITEMS, CAPACITY_DIMENSIONS)
+
+        assert [
+            (component.item_indices, component.capacity_positions)
+            for component in components
+        ] == [([0, 1], [0, 2]), ([2], [1])]
+
+    def test_decomposed_result_is_the_same_as_calculated_at_once(
+        self, optimization_facade: OptimizationFacade
+    ) -> None:
+        at_once = optimization_facade.calculate(ITEMS, CAPACITIES)
+
+        decomposed = optimization_facade.calculate_decomposed(ITEMS, CAPACITIES)
+
+        assert decomposed.profit == at_once.profit == 610
+        assert set(decomposed.chosen_items) == set(at_once.chosen_items)
+        assert decomposed.item_to_capacities == at_once.item_to_capacities
+
+    def test_components_can_be_solved_in_worker_processes(
+        self, optimization_facade: OptimizationFacade
+    ) -> None:
+        at_once = optimization_facade.calculate(ITEMS, CAPACITIES)
+
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            decomposed = optimization_facade.calculate_decomposed(
+                ITEMS, CAPACITIES, executor=executor
+            )
+
+        assert decomposed.profit == at_once.profit
+        assert set(decomposed.chosen_items) == set(at_once.chosen_items)
+        assert decomposed.item_to_capacities == at_once.item_to_capacities
+
+    def test_first_fit_reusing_a_capacity_is_limited_to_its_component(
+        self, optimization_facade: OptimizationFacade
+    ) -> None:
+        # first-fit gives both demands to anna, calculate lets that weight 2 item
+        # borrow the capacity count of zbyniu, the decomposed solve does not
+        items = [
+            Item(
+                "TwoJava",
+                100,
+                TotalWeight.of(
+                    CapabilityWeightDimension("JAVA", "Skill"),
+                    CapabilityWeightDimension("JAVA", "Skill"),
+                ),
+            ),
+            Item(
+                "Python",
+                10,
+                TotalWeight.of(CapabilityWeightDimension("PYTHON", "Skill")),
+            ),
+        ]
+        capacities = TotalCapacity.of(
+            CapabilityCapacityDimension("anna", "JAVA", "Skill"),
+            CapabilityCapacityDimension("zbyniu", "PYTHON", "Skill"),
+        )
+
+        at_once = optimization_facade.calculate(items, capacities)
+        decomposed = optimization_facade.calculate_decomposed(items, capacities)
+
+        assert at_once.profit == 100
+        assert decomposed.profit == 10
+        assert [item.name for item in decomposed.chosen_items] == ["Python"]
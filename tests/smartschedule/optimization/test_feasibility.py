@@ -0,0 +1,56 @@
+from smartschedule.optimization.item import Item
+from smartschedule.optimization.optimization_facade import OptimizationFacade
+from smartschedule.optimization.total_capacity import TotalCapacity
+from smartschedule.optimization.total_weight import TotalWeight
+from tests.smartschedule.optimization.capability_capacity_dimension import (
+    CapabilityCapacityDimension,
+    CapabilityWeightDimension,
+)
+
+JAVA_ITEM = Item(
+    "Java", 100, TotalWeight.of(CapabilityWeightDimension("JAVA", "Skill"))
+)
+PYTHON_ITEM = Item(
+    "Python", 100, TotalWeight.of(CapabilityWeightDimension("PYTHON", "Skill"))
+)
+RUST_ITEM = Item(
+    "Rust", 100, TotalWeight.of(CapabilityWeightDimension("RUST", "Skill"))
+)
+C_ITEM = Item("C", 100, TotalWeight.of(CapabilityWeightDimension("C", "Skill")))
+
+
+class TestFeasibility:
+    def test_is_feasible_when_every_item_can_be_satisfied_at_once(
+        self, optimization_facade: OptimizationFacade
+    ) -> None:
+        feasibility = optimization_facade.check_feasibility(
+            [JAVA_ITEM, PYTHON_ITEM, Item("Nothing", 100, TotalWeight.zero())],
+            TotalCapacity.of(
+                CapabilityCapacityDimension("anna", "PYTHON", "Skill"),
+                CapabilityCapacityDimension("zbyniu", "JAVA", "Skill"),
+            ),
+        )
+
+        assert feasibility.is_feasible()
+
+    def test_reports_items_that_cannot_be_satisfied(
+        self, optimization_facade: OptimizationFacade
+    ) -> None:
+        feasibility = optimization_facade.check_feasibility(
+            [JAVA_ITEM, RUST_ITEM, PYTHON_ITEM, C_ITEM],
+            TotalCapacity.of(CapabilityCapacityDimension("anna", "JAVA", "Skill")),
+        )
+
+        assert not feasibility.is_feasible()
+        assert feasibility.unsatisfiable_items == [RUST_ITEM, PYTHON_ITEM, C_ITEM]
+
+    def test_stops_at_first_unsatisfiable_item_when_failing_fast(
+        self, optimization_facade: OptimizationFacade
+    ) -> None:
+        feasibility = optimization_facade.check_feasibility(
+            [JAVA_ITEM, RUST_ITEM, PYTHON_ITEM, C_ITEM],
+            TotalCapacity.of(CapabilityCapacityDimension("anna", "JAVA", "Skill")),
+            fail_fast=True,
+        )
+
+        assert feasibility.unsatisfiable_items == [RUST_ITEM]
@@ -0,0 +1,95 @@
+from smartschedule.optimization.item import Item
+from smartschedule.optimization.optimization_facade import OptimizationFacade
+from smartschedule.optimization.total_capacity import TotalCapacity
+from smartschedule.optimization.total_weight import TotalWeight
+from tests.smartschedule.optimization.capability_capacity_dimension import (
+    CapabilityCapacityDimension,
+    CapabilityWeightDimension,
+)
+
+JAVA = CapabilityWeightDimension("JAVA", "Skill")
+PYTHON = CapabilityWeightDimension("PYTHON", "Skill")
+JAVA_ITEM = Item("Java", 100, TotalWeight.of(JAVA))
+PYTHON_ITEM = Item("Python", 300, TotalWeight.of(PYTHON))
+JAVA_AND_PYTHON_ITEM = Item("Java and Python", 350, TotalWeight.of(JAVA, PYTHON))
+ANNA = CapabilityCapacityDimension("anna", "JAVA", "Skill")
+ZBYNIU = CapabilityCapacityDimension("zbyniu", "PYTHON", "Skill")
+EWA = CapabilityCapacityDimension("ewa", "PYTHON", "Skill")
+
+
+class TestIncrementalOptimization:
+    def test_starts_with_same_result_as_calculate(
+        self, optimization_facade: OptimizationFacade
+    ) -> None:
+        items = [JAVA_ITEM, PYTHON_ITEM, JAVA_AND_PYTHON_ITEM]
+        capacity = TotalCapacity.of(ANNA, ZBYNIU)
+
+        incremental = optimization_facade.start_incremental(items, capacity)
+
+        assert incremental.profit == 350
+        assert incremental.result == optimization_facade.calculate(items, capacity)
+
+    def test_adding_capacity_gives_profit_delta(
+        self, optimization_facade: OptimizationFacade
+    ) -> None:
+        incremental = optimization_facade.start_incremental(
+            [JAVA_ITEM, PYTHON_ITEM, JAVA_AND_PYTHON_ITEM],
+            TotalCapacity.of(ANNA, ZBYNIU),
+        )
+
+        profit_delta = incremental.add_capacity(EWA)
+
+        assert profit_delta == 300
+        assert incremental.profit == 650
+        assert set(incremental.result.chosen_items) == {
+            PYTHON_ITEM,
+            JAVA_AND_PYTHON_ITEM,
+        }
+
+    def test_removing_capacity_gives_profit_delta(
+        self, optimization_facade: OptimizationFacade
+    ) -> None:
+        incremental = optimization_facade.start_incremental(
+            [JAVA_ITEM, PYTHON_ITEM, JAVA_AND_PYTHON_ITEM],
+            TotalCapacity.of(ANNA, ZBYNIU, EWA),
+        )
+
+        profit_delta = incremental.remove_capacity(ANNA)
+
+        assert profit_delta == -350
+        assert incremental.result.chosen_items == [PYTHON_ITEM]
+
+    def test_follows_added_removed_and_replaced_items(
+        self, optimization_facade: OptimizationFacade
+    ) -> None:
+        capacity = TotalCapacity.of(ANNA, ZBYNIU)
+        incremental = optimization_facade.start_incremental([JAVA_ITEM], capacity)
+        cheaper_python = Item("Python", 30, TotalWeight.of(PYTHON))
+        nothing: Item[CapabilityCapacityDimension] = Item(
+            "Nothing", 5, TotalWeight.zero()
+        )
+
+        assert incremental.add_item(PYTHON_ITEM) == 300
+        assert incremental.add_item(nothing) == 5
+        assert incremental.replace_item(PYTHON_ITEM, cheaper_python) == -270
+        assert incremental.remove_item(JAVA_ITEM) == -100
+        assert incremental.result == optimization_facade.calculate(
+            [cheaper_python, nothing], capacity
+        )
+
+    def test_removing_last_sorted_item_holding_capacity(
+        self, optimization_facade: OptimizationFacade
+    ) -> None:
+        capacity = TotalCapacity.of(
+            ANNA, CapabilityCapacityDimension("bob", "JAVA", "Skill")
+        )
+        cheaper_java = Item("Cheaper Java", 10, TotalWeight.of(JAVA))
+        incremental = optimization_facade.start_incremental(
+            [JAVA_ITEM, cheaper_java], capacity
+        )
+
+        assert incremental.remove_item(cheaper_java) == -10
+        assert incremental.profit == 100
+        assert incremental.result == optimization_facade.calculate(
+            [JAVA_ITEM], capacity
+        )
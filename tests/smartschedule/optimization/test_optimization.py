@@ -91,3 +91,34 @@ class TestOptimization:
         assert result.item_to_capacities[item3] == {c1} or {c2}
         assert result.item_to_capacities[item2] == {c1} or {c2}
         assert item1 not in result.item_to_capacities
+
+    def test_chosen_items_are_rebuilt_when_items_have_different_weights(
+        self, optimization_facade: OptimizationFacade
+    ) -> None:
+        item1 = Item(
+            "Item1",
+            500,
+            TotalWeight.of(
+                CapabilityWeightDimension("JAVA", "Skill"),
+                CapabilityWeightDimension("JAVA", "Skill"),
+                CapabilityWeightDimension("JAVA", "Skill"),
+            ),
+        )
+        item2 = Item(
+            "Item2", 300, TotalWeight.of(CapabilityWeightDimension("PYTHON", "Skill"))
+        )
+        item3 = Item(
+            "Item3", 250, TotalWeight.of(CapabilityWeightDimension("JAVA", "Skill"))
+        )
+        item4: Item[CapabilityCapacityDimension] = Item("Item4", 50, TotalWeight.zero())
+        capacities = TotalCapacity.of(
+            CapabilityCapacityDimension("anna", "JAVA", "Skill"),
+            CapabilityCapacityDimension("zbyniu", "JAVA", "Skill"),
+            CapabilityCapacityDimension("leon", "JAVA", "Skill"),
+            CapabilityCapacityDimension("staszek", "PYTHON", "Skill"),
+        )
+
+        result = optimization_facade.calculate([item1, item2, item3, item4], capacities)
+
+        assert result.profit == 850
+        assert result.chosen_items == [item1, item2, item4]
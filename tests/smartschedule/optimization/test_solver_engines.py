@@ -0,0 +1,84 @@
+import pytest
+
+from smartschedule.optimization import knapsack
+from smartschedule.optimization.item import Item
+from smartschedule.optimization.optimization_facade import OptimizationFacade
+from smartschedule.optimization.solver_engine import SolverEngine
+from smartschedule.optimization.total_capacity import TotalCapacity
+from smartschedule.optimization.total_weight import TotalWeight
+from tests.smartschedule.optimization.capability_capacity_dimension import (
+    CapabilityCapacityDimension,
+    CapabilityWeightDimension,
+)
+
+
+@pytest.fixture()
+def items() -> list[Item[CapabilityCapacityDimension]]:
+    return [
+        Item(
+            "Item1",
+            500,
+            TotalWeight.of(
+                CapabilityWeightDimension("JAVA", "Skill"),
+                CapabilityWeightDimension("JAVA", "Skill"),
+            ),
+        ),
+        Item("Item2", 300, TotalWeight.of(CapabilityWeightDimension("JAVA", "Skill"))),
+        Item("Item3", 250, TotalWeight.of(CapabilityWeightDimension("JAVA", "Skill"))),
+        Item(
+            "Item4", 100, TotalWeight.of(CapabilityWeightDimension("PYTHON", "Skill"))
+        ),
+        Item("Item5", 50, TotalWeight.zero()),
+    ]
+
+
+@pytest.fixture()
+def total_capacity() -> TotalCapacity:
+    return TotalCapacity.of(
+        CapabilityCapacityDimension("anna", "JAVA", "Skill"),
+        CapabilityCapacityDimension("zbyniu", "JAVA", "Skill"),
+        CapabilityCapacityDimension("leon", "JAVA", "Skill"),
+        CapabilityCapacityDimension("staszek", "PYTHON", "Skill"),
+    )
+
+
+class TestSolverEngines:
+    def test_numpy_engine_gives_the_same_result_as_pure_python(
+        self,
+        optimization_facade: OptimizationFacade,
+        items: list[Item[CapabilityCapacityDimension]],
+        total_capacity: TotalCapacity,
+    ) -> None:
+        pytest.importorskip("numpy")
+
+        pure_python = optimization_facade.calculate(
+            items, total_capacity, engine=SolverEngine.PURE_PYTHON
+        )
+        vectorized = optimization_facade.calculate(
+            items, total_capacity, engine=SolverEngine.NUMPY
+        )
+
+        assert vectorized.profit == pure_python.profit == 1100
+        assert vectorized.chosen_items == pure_python.chosen_items
+        assert vectorized.item_to_capacities == pure_python.item_to_capacities
+
+    def test_falls_back_to_pure_python_when_numpy_is_not_installed(
+        self,
+        optimization_facade: OptimizationFacade,
+        items: list[Item[CapabilityCapacityDimension]],
+        total_capacity: TotalCapacity,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr(knapsack, "numpy", None)
+
+        result = optimization_facade.calculate(
+            items, total_capacity, engine=SolverEngine.NUMPY
+        )
+
+        assert result.profit == 1100
+        assert [item.name for item in result.chosen_items] == [
+            "Item1",
+            "Item2",
+            "Item3",
+            "Item5",
+        ]
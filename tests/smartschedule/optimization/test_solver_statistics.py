@@ -0,0 +1,146 @@
+from datetime import timedelta
+
+from smartschedule import container as container_module
+from smartschedule.optimization.compact_problem_builder import CompactProblemBuilder
+from smartschedule.optimization.item import Item
+from smartschedule.optimization.matching_strategy import MatchingStrategy
+from smartschedule.optimization.optimization_facade import OptimizationFacade
+from smartschedule.optimization.solver_statistics import (
+    SolverStatistics,
+    SolverStatisticsListeners,
+)
+from smartschedule.optimization.total_capacity import TotalCapacity
+from smartschedule.optimization.total_weight import TotalWeight
+from tests.smartschedule.optimization.capability_capacity_dimension import (
+    CapabilityCapacityDimension,
+    CapabilityWeightDimension,
+)
+
+ITEMS = [
+    Item("Java", 100, TotalWeight.of(CapabilityWeightDimension("JAVA", "Skill"))),
+    Item("Rust", 200, TotalWeight.of(CapabilityWeightDimension("RUST", "Skill"))),
+    Item("Nothing", 50, TotalWeight.zero()),
+]
+CAPACITY = TotalCapacity.of(
+    CapabilityCapacityDimension("anna", "JAVA", "Skill"),
+    CapabilityCapacityDimension("zbyniu", "JAVA", "Skill"),
+)
+
+
+class TestSolverStatistics:
+    def test_reports_statistics_of_each_solve(
+        self, optimization_facade: OptimizationFacade
+    ) -> None:
+        reported: list[SolverStatistics] = []
+        optimization_facade.add_statistics_listener(reported.append)
+
+        optimization_facade.calculate(ITEMS, CAPACITY)
+
+        [statistics] = reported
+        assert statistics.items == 3
+        assert statistics.capacities == 2
+        assert statistics.considered_items == 1
+        assert statistics.skipped_items == 1
+        assert statistics.capacity_comparisons == 1
+        assert statistics.dp_cells == 2
+        assert statistics.peak_list_size == 3
+        assert statistics.total >= timedelta(0)
+
+    def test_counts_comparisons_of_bipartite_matching(
+        self, optimization_facade: OptimizationFacade
+    ) -> None:
+        reported: list[SolverStatistics] = []
+        optimization_facade.add_statistics_listener(reported.append)
+
+        optimization_facade.calculate(
+            ITEMS, CAPACITY, matching=MatchingStrategy.BIPARTITE
+        )
+
+        assert reported[0].capacity_comparisons == 2
+
+    def test_reports_statistics_of_compact_solve(
+        self, optimization_facade: OptimizationFacade
+    ) -> None:
+        reported: list[SolverStatistics] = []
+        optimization_facade.add_statistics_listener(reported.append)
+        builder = CompactProblemBuilder()
+        builder.add_item("Java", 100, [("JAVA", 10, 20)])
+        builder.add_item("Late Java", 100, [("JAVA", 30, 40)])
+        builder.add_capacity("anna", ["JAVA"], 0, 20)
+
+        optimization_facade.calculate_compact(builder.build())
+
+        assert reported[0].considered_items == 1
+        assert reported[0].skipped_items == 1
+        assert reported[0].capacity_comparisons == 1
+
+    def test_failing_listener_does_not_fail_the_solve(
+        self, optimization_facade: OptimizationFacade
+    ) -> None:
+        def failing(statistics: SolverStatistics) -> None:
+            raise RuntimeError("metrics pipeline is down")
+
+        reported: list[SolverStatistics] = []
+        optimization_facade.add_statistics_listener(failing)
+        optimization_facade.add_statistics_listener(reported.append)
+
+        result = optimization_facade.calculate(ITEMS, CAPACITY)
+
+        assert result.profit == 150
+        assert len(reported) == 1
+
+    def test_reports_statistics_of_every_component(
+        self, optimization_facade: OptimizationFacade
+    ) -> None:
+        reported: list[SolverStatistics] = []
+        optimization_facade.add_statistics_listener(reported.append)
+        python_item = Item(
+            "Python", 300, TotalWeight.of(CapabilityWeightDimension("PYTHON", "Skill"))
+        )
+        capacity = TotalCapacity.of(
+            *CAPACITY.capacities,
+            CapabilityCapacityDimension("ewa", "PYTHON", "Skill"),
+        )
+
+        optimization_facade.calculate_decomposed([*ITEMS, python_item], capacity)
+
+        assert sorted(statistics.considered_items for statistics in reported) == [
+            1,
+            1,
+        ]
+
+    def test_reports_statistics_of_time_budgeted_solve(
+        self, optimization_facade: OptimizationFacade
+    ) -> None:
+        reported: list[SolverStatistics] = []
+        optimization_facade.add_statistics_listener(reported.append)
+
+        optimization_facade.calculate_within(ITEMS, CAPACITY, timedelta(seconds=10))
+
+        [statistics] = reported
+        assert statistics.items == 3
+        assert statistics.considered_items == 2
+        assert statistics.skipped_items == 0
+        assert statistics.capacity_comparisons > 0
+
+    def test_reports_statistics_of_incremental_changes(
+        self, optimization_facade: OptimizationFacade
+    ) -> None:
+        reported: list[SolverStatistics] = []
+        optimization_facade.add_statistics_listener(reported.append)
+        incremental = optimization_facade.start_incremental(ITEMS[:1], CAPACITY)
+
+        incremental.add_item(ITEMS[1])
+
+        assert [statistics.items for statistics in reported] == [1, 2]
+        assert reported[-1].skipped_items == 1
+
+    def test_listeners_registered_in_container_follow_every_facade(self) -> None:
+        container = container_module.build()
+        reported: list[SolverStatistics] = []
+        container[SolverStatisticsListeners].add(reported.append)
+
+        for _ in range(2):
+            container.resolve(OptimizationFacade).calculate(ITEMS, CAPACITY)
+
+        assert len(reported) == 2
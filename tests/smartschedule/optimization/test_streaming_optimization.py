@@ -0,0 +1,69 @@
+from typing import Iterator
+
+from smartschedule.optimization.item import Item
+from smartschedule.optimization.optimization_facade import OptimizationFacade
+from smartschedule.optimization.total_capacity import TotalCapacity
+from smartschedule.optimization.total_weight import TotalWeight
+from tests.smartschedule.optimization.capability_capacity_dimension import (
+    CapabilityCapacityDimension,
+    CapabilityWeightDimension,
+)
+
+JAVA = CapabilityWeightDimension("JAVA", "Skill")
+PYTHON = CapabilityWeightDimension("PYTHON", "Skill")
+CAPACITY = TotalCapacity.of(
+    CapabilityCapacityDimension("anna", "JAVA", "Skill"),
+    CapabilityCapacityDimension("zbyniu", "JAVA", "Skill"),
+    CapabilityCapacityDimension("ewa", "PYTHON", "Skill"),
+)
+
+
+def items() -> Iterator[Item[CapabilityCapacityDimension]]:
+    yield Item("Java 1", 100, TotalWeight.of(JAVA))
+    yield Item("Rust", 1000, TotalWeight.of(CapabilityWeightDimension("RUST", "Skill")))
+    yield Item("Java 2", 200, TotalWeight.of(JAVA))
+    yield Item("Nothing", 50, TotalWeight.zero())
+    yield Item("Python", 300, TotalWeight.of(PYTHON))
+    yield Item("Java and Python", 250, TotalWeight.of(JAVA, PYTHON))
+
+
+class TestStreamingOptimization:
+    def test_gives_same_result_as_calculate_on_all_items(
+        self, optimization_facade: OptimizationFacade
+    ) -> None:
+        streamed = optimization_facade.calculate_streaming(items(), CAPACITY)
+        calculated = optimization_facade.calculate(list(items()), CAPACITY)
+
+        assert streamed.profit == calculated.profit == 650
+        assert set(streamed.chosen_items) == set(calculated.chosen_items)
+
+    def test_solves_only_items_that_sort_first(
+        self, optimization_facade: OptimizationFacade
+    ) -> None:
+        result = optimization_facade.calculate_streaming(items(), CAPACITY, max_items=3)
+
+        assert result.profit == 550
+        assert {item.name for item in result.chosen_items} == {
+            "Python",
+            "Java 2",
+            "Nothing",
+        }
+
+    def test_items_that_can_never_be_matched_do_not_take_a_place(
+        self, optimization_facade: OptimizationFacade
+    ) -> None:
+        result = optimization_facade.calculate_streaming(items(), CAPACITY, max_items=1)
+
+        assert {item.name for item in result.chosen_items} == {"Python", "Nothing"}
+
+    def test_keeps_given_order_for_equal_sort_keys(
+        self, optimization_facade: OptimizationFacade
+    ) -> None:
+        first = Item("First", 100, TotalWeight.of(PYTHON))
+        second = Item("Second", 100, TotalWeight.of(PYTHON))
+
+        result = optimization_facade.calculate_streaming(
+            iter([first, second]), CAPACITY, max_items=1
+        )
+
+        assert result.chosen_items == [first]
@@ -0,0 +1,206 @@
+from datetime import datetime, timedelta, timezone
+from random import Random
+from typing import Final
+from uuid import uuid4
+
+import pytest
+
+from smartschedule.allocation.cashflow.earnings import Earnings
+from smartschedule.allocation.demand import Demand
+from smartschedule.allocation.demands import Demands
+from smartschedule.allocation.project_allocations_id import ProjectAllocationsId
+from smartschedule.availability.resource_id import ResourceId
+from smartschedule.availability.resource_taken_over import ResourceTakenOver
+from smartschedule.optimization.optimization_facade import OptimizationFacade
+from smartschedule.risk.portfolio_replay import PortfolioReplay
+from smartschedule.risk.project_arrival import ProjectArrival
+from smartschedule.risk.risk_periodic_check_saga_step import RiskPeriodicCheckSagaStep
+from smartschedule.shared.capability.capability import Capability
+from smartschedule.shared.timeslot.time_slot import TimeSlot
+from smartschedule.simulation.available_resource_capability import (
+    AvailableResourceCapability,
+)
+from smartschedule.simulation.demand import Demand as SimulatedDemand
+from smartschedule.simulation.demands import Demands as SimulatedDemands
+from smartschedule.simulation.project_id import ProjectId
+from smartschedule.simulation.simulated_capabilities import SimulatedCapabilities
+from smartschedule.simulation.simulated_project import SimulatedProject
+from smartschedule.simulation.simulation_facade import SimulationFacade
+
+
+@pytest.fixture()
+def simulation_facade() -> SimulationFacade:
+    return SimulationFacade(OptimizationFacade())
+
+
+class TestPortfolioReplay:
+    JAVA: Final = Capability.skill("JAVA")
+    START: Final = datetime(2021, 1, 4, tzinfo=timezone.utc)
+    SECOND_WEEK: Final = TimeSlot(
+        datetime(2021, 1, 11, tzinfo=timezone.utc),
+        datetime(2021, 1, 18, tzinfo=timezone.utc),
+    )
+    DAY_IN_SECOND_WEEK: Final = TimeSlot.create_daily_time_slot_at_utc(2021, 1, 12)
+    RESOURCE: Final = ResourceId.new_one()
+
+    def test_commits_projects_chosen_when_they_start(
+        self, simulation_facade: SimulationFacade
+    ) -> None:
+        replay = PortfolioReplay(simulation_facade, self._one_java_in_second_week())
+
+        report = replay.replay(
+            [
+                self._java_project(Earnings(1000), self.START),
+                self._java_project(Earnings(500), self.START + timedelta(days=1)),
+            ],
+            self.START,
+            weeks=3,
+        )
+
+        assert [week.planned_profit for week in report.weeks] == [1000, 0, 0]
+        assert report.profit_curve == [0, 1000, 1000]
+        assert report.utilization_curve == [0, 1, 0]
+        assert report.realized_profit == 1000
+        assert report.steps() == {
+            RiskPeriodicCheckSagaStep.SUGGEST_REPLACEMENT: 1,
+            RiskPeriodicCheckSagaStep.NOTIFY_ABOUT_DEMANDS_SATISFIED: 1,
+        }
+
+    def test_drops_projects_losing_resources_taken_over(
+        self, simulation_facade: SimulationFacade
+    ) -> None:
+        replay = PortfolioReplay(simulation_facade, self._one_java_in_second_week())
+
+        report = replay.replay(
+            [
+                self._java_project(Earnings(1000), self.START),
+                ResourceTakenOver(
+                    self.RESOURCE,
+                    set(),
+                    self.DAY_IN_SECOND_WEEK,
+                    self.START + timedelta(days=2),
+                ),
+            ],
+            self.START,
+            weeks=2,
+        )
+
+        assert report.profit_curve == [0, 0]
+        assert report.utilization_curve == [0, 0]
+        assert report.weeks[0].steps == {
+            RiskPeriodicCheckSagaStep.NOTIFY_ABOUT_POSSIBLE_RISK: 1
+        }
+
+    def test_planned_profit_follows_full_solve_when_last_ranked_project_starts(
+        self, simulation_facade: SimulationFacade
+    ) -> None:
+        second_and_third_week = TimeSlot(
+            self.SECOND_WEEK.from_, self.SECOND_WEEK.to + timedelta(weeks=1)
+        )
+        first, second, spare = [
+            AvailableResourceCapability.with_capability(
+                uuid4(), self.JAVA, second_and_third_week
+            )
+            for _ in range(3)
+        ]
+        day_in_third_week = TimeSlot.create_daily_time_slot_at_utc(2021, 1, 19)
+        later = self._java_project(Earnings(1000), self.START, day_in_third_week)
+        sooner = self._java_project(Earnings(500), self.START)
+        replay = PortfolioReplay(
+            simulation_facade, SimulatedCapabilities([first, second, spare])
+        )
+
+        report = replay.replay([later, sooner], self.START, weeks=3)
+
+        # the sooner one is ranked last, it starts and leaves a capability spare
+        expected = [
+            simulation_facade.what_is_the_optimal_setup(
+                [self._simulated(project) for project in projects],
+                SimulatedCapabilities(capabilities),
+            ).profit
+            for projects, capabilities in [
+                ([later, sooner], [first, second, spare]),
+                ([later], [first, spare]),
+                ([], [spare]),
+            ]
+        ]
+        assert [week.planned_profit for week in report.weeks] == expected
+        assert expected == [1500, 1000, 0]
+        assert report.realized_profit == 1500
+
+    def test_replays_a_year_of_arrivals(
+        self, simulation_facade: SimulationFacade
+    ) -> None:
+        random = Random(7)
+        capabilities = SimulatedCapabilities(
+            [
+                AvailableResourceCapability.with_capability(
+                    uuid4(),
+                    self.JAVA,
+                    TimeSlot(
+                        self.START + timedelta(weeks=week),
+                        self.START + timedelta(weeks=week + 1),
+                    ),
+                )
+                for week in range(52)
+                for _ in range(3)
+            ]
+        )
+        events = []
+        for _ in range(300):
+            arrives = self.START + timedelta(days=random.randrange(0, 350))
+            starts = arrives + timedelta(days=random.randrange(1, 14))
+            slot = TimeSlot(starts, starts + timedelta(days=1))
+            events.append(
+                ProjectArrival(
+                    ProjectAllocationsId.new_one(),
+                    Earnings(random.randrange(100, 2000)),
+                    Demands.of(Demand(self.JAVA, slot)),
+                    slot.to,
+                    arrives,
+                )
+            )
+
+        report = PortfolioReplay(simulation_facade, capabilities).replay(
+            events, self.START, weeks=52
+        )
+
+        assert len(report.weeks) == 52
+        assert report.profit_curve == sorted(report.profit_curve)
+        assert report.realized_profit > 0
+        assert all(0 <= utilization <= 1 for utilization in report.utilization_curve)
+
+    def _one_java_in_second_week(self) -> SimulatedCapabilities:
+        return SimulatedCapabilities(
+            [
+                AvailableResourceCapability.with_capability(
+                    self.RESOURCE.id, self.JAVA, self.SECOND_WEEK
+                )
+            ]
+        )
+
+    def _java_project(
+        self,
+        earnings: Earnings,
+        arrives: datetime,
+        needed: TimeSlot = DAY_IN_SECOND_WEEK,
+    ) -> ProjectArrival:
+        return ProjectArrival(
+            ProjectAllocationsId.new_one(),
+            earnings,
+            Demands.of(Demand(self.JAVA, needed)),
+            needed.to,
+            arrives,
+        )
+
+    def _simulated(self, arrival: ProjectArrival) -> SimulatedProject:
+        return SimulatedProject.with_fixed_value(
+            ProjectId(arrival.project_id.id),
+            arrival.earnings.to_decimal(),
+            SimulatedDemands(
+                [
+                    SimulatedDemand(demand.capability, demand.time_slot)
+                    for demand in arrival.demands.all
+                ]
+            ),
+        )
@@ -0,0 +1,38 @@
+import pickle
+from decimal import Decimal
+
+from smartschedule.optimization.optimization_facade import OptimizationFacade
+from smartschedule.simulation.demands import Demands
+from smartschedule.simulation.project_id import ProjectId
+from smartschedule.simulation.simulated_capabilities import SimulatedCapabilities
+from smartschedule.simulation.simulated_project import SimulatedProject
+from smartschedule.simulation.simulation_facade import SimulationFacade
+
+
+class TestSimulatedProject:
+    def test_simulation_reads_value_once(self) -> None:
+        reads = []
+
+        def expensive_value() -> Decimal:
+            reads.append(1)
+            return Decimal(100)
+
+        project = SimulatedProject(ProjectId.new_one(), expensive_value, Demands.of([]))
+        simulation_facade = SimulationFacade(OptimizationFacade())
+
+        result = simulation_facade.what_is_the_optimal_setup(
+            [project], SimulatedCapabilities([])
+        )
+
+        assert result.profit == 100
+        assert len(reads) == 1
+
+    def test_project_with_fixed_value_can_be_sent_to_other_processes(self) -> None:
+        project = SimulatedProject.with_fixed_value(
+            ProjectId.new_one(), Decimal(100), Demands.of([])
+        )
+
+        copy = pickle.loads(pickle.dumps(project))
+
+        assert copy.value == Decimal(100)
+        assert copy.project_id == project.project_id
@@ -1,8 +1,12 @@
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
 from decimal import Decimal
+from typing import Iterator
 from uuid import UUID, uuid4
 
 import pytest
 
+from smartschedule.optimization.matching_strategy import MatchingStrategy
 from smartschedule.optimization.optimization_facade import OptimizationFacade
 from smartschedule.shared.capability.capability import Capability
 from smartschedule.shared.timeslot.time_slot import TimeSlot
@@ -14,8 +18,12 @@ from smartschedule.simulation.available_resource_capability import (
 )
 from smartschedule.simulation.demand import Demand
 from smartschedule.simulation.demands import Demands
+from smartschedule.simulation.distribution import Distribution
 from smartschedule.simulation.project_id import ProjectId
+from smartschedule.simulation.simulated_capabilities import SimulatedCapabilities
+from smartschedule.simulation.simulated_project import SimulatedProject
 from smartschedule.simulation.simulation_facade import SimulationFacade
+from smartschedule.simulation.uncertain_project import UncertainProject
 from tests.smartschedule.simulation.available_capabilities_factory import (
     SimulatedCapabilitiesFactory,
 )
@@ -257,6 +265,75 @@ class TestSimulationScenarios:
         # We get 40 from project 2 and lose 3 for buying Staszek
         assert buying_staszek_profit == 37
 
+    def test_evaluates_many_capabilities_to_buy_at_once(
+        self,
+        project_1_id: ProjectId,
+        project_2_id: ProjectId,
+        jan_1_time_slot: TimeSlot,
+        staszek_id: UUID,
+        simulation_facade: SimulationFacade,
+    ) -> None:
+        simulated_projects = [
+            SimulatedProjectFactory.build(
+                project_id=project_1_id,
+                value=Decimal(100),
+                missing_demands=Demands(
+                    [Demand.demand_for(Capability.skill("JAVA-MID"), jan_1_time_slot)]
+                ),
+            ),
+            SimulatedProjectFactory.build(
+                project_id=project_2_id,
+                value=Decimal(40),
+                missing_demands=Demands(
+                    [Demand.demand_for(Capability.skill("JAVA-MID"), jan_1_time_slot)]
+                ),
+            ),
+        ]
+
+        simulated_availability = SimulatedCapabilitiesFactory.build(
+            num_capabilities=1,
+            capabilities__0__resource_id=staszek_id,
+            capabilities__0__brings=Capability.skill("JAVA-MID"),
+            capabilities__0__time_slot=jan_1_time_slot,
+        )
+
+        candidates = [
+            AdditionalPricedCapability(
+                Decimal(9999),
+                AvailableResourceCapability.with_capability(
+                    uuid4(), Capability.skill("JAVA-MID"), jan_1_time_slot
+                ),
+            ),
+            AdditionalPricedCapability(
+                Decimal(3),
+                AvailableResourceCapability.with_capability(
+                    uuid4(), Capability.skill("JAVA-MID"), jan_1_time_slot
+                ),
+            ),
+            AdditionalPricedCapability(
+                Decimal(1),
+                AvailableResourceCapability.with_capability(
+                    uuid4(), Capability.skill("PYTHON"), jan_1_time_slot
+                ),
+            ),
+        ]
+
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            profits = simulation_facade.profits_after_buying_new_capabilities(
+                simulated_projects,
+                simulated_availability,
+                candidates,
+                executor=executor,
+            )
+
+        assert profits == [
+            simulation_facade.profit_after_buying_new_capability(
+                simulated_projects, simulated_availability, candidate
+            )
+            for candidate in candidates
+        ]
+        assert profits == [-9959, 37, -1]
+
     def test_takes_into_account_simulation_capabilities(
         self,
         staszek_id: UUID,
@@ -300,3 +377,284 @@ class TestSimulationScenarios:
 
         assert result.profit == 99
         assert len(result.chosen_items) == 1
+
+    def test_generalist_is_left_for_demands_only_they_can_satisfy(
+        self,
+        staszek_id: UUID,
+        leon_id: UUID,
+        simulation_facade: SimulationFacade,
+        jan_1_time_slot: TimeSlot,
+        project_1_id: ProjectId,
+        project_2_id: ProjectId,
+    ) -> None:
+        simulated_projects = [
+            SimulatedProjectFactory.build(
+                project_id=project_1_id,
+                value=Decimal(99),
+                missing_demands=Demands(
+                    [Demand.demand_for(Capability.skill("JAVA-MID"), jan_1_time_slot)]
+                ),
+            ),
+            SimulatedProjectFactory.build(
+                project_id=project_2_id,
+                value=Decimal(9),
+                missing_demands=Demands(
+                    [Demand.demand_for(Capability.skill("PYTHON"), jan_1_time_slot)]
+                ),
+            ),
+        ]
+
+        simulated_availability = SimulatedCapabilitiesFactory.build(
+            num_capabilities=2,
+            capabilities__0__resource_id=staszek_id,
+            capabilities__0__brings={
+                Capability.skill("JAVA-MID"),
+                Capability.skill("PYTHON"),
+            },
+            capabilities__0__time_slot=jan_1_time_slot,
+            capabilities__1__resource_id=leon_id,
+            capabilities__1__brings=Capability.skill("JAVA-MID"),
+            capabilities__1__time_slot=jan_1_time_slot,
+        )
+
+        first_fit = simulation_facade.what_is_the_optimal_setup(
+            simulated_projects, simulated_availability
+        )
+        bipartite = simulation_facade.what_is_the_optimal_setup(
+            simulated_projects,
+            simulated_availability,
+            matching=MatchingStrategy.BIPARTITE,
+        )
+
+        assert first_fit.profit == 99
+        assert bipartite.profit == 108
+        assert {
+            item.name: {capacity.resource_id for capacity in capacities}  # type: ignore[attr-defined]
+            for item, capacities in bipartite.item_to_capacities.items()
+        } == {str(project_1_id): {leon_id}, str(project_2_id): {staszek_id}}
+
+    def test_optimal_setup_within_time_budget_reports_bound(
+        self,
+        staszek_id: UUID,
+        simulation_facade: SimulationFacade,
+        jan_1_time_slot: TimeSlot,
+        project_1_id: ProjectId,
+        project_2_id: ProjectId,
+    ) -> None:
+        simulated_projects = [
+            SimulatedProjectFactory.build(
+                project_id=project_1_id,
+                value=Decimal(9),
+                missing_demands=Demands(
+                    [Demand.demand_for(Capability.skill("JAVA-MID"), jan_1_time_slot)]
+                ),
+            ),
+            SimulatedProjectFactory.build(
+                project_id=project_2_id,
+                value=Decimal(99),
+                missing_demands=Demands(
+                    [Demand.demand_for(Capability.skill("JAVA-MID"), jan_1_time_slot)]
+                ),
+            ),
+        ]
+
+        simulated_availability = SimulatedCapabilitiesFactory.build(
+            num_capabilities=1,
+            capabilities__0__resource_id=staszek_id,
+            capabilities__0__brings=Capability.skill("JAVA-MID"),
+            capabilities__0__time_slot=jan_1_time_slot,
+        )
+
+        bounded = simulation_facade.what_is_the_optimal_setup_within(
+            simulated_projects, simulated_availability, timedelta(seconds=1)
+        )
+
+        assert bounded.result.profit == 99
+        assert bounded.is_optimal()
+
+    def test_finds_projects_that_cannot_be_satisfied(
+        self,
+        staszek_id: UUID,
+        simulation_facade: SimulationFacade,
+        jan_1_time_slot: TimeSlot,
+        project_1_id: ProjectId,
+        project_2_id: ProjectId,
+    ) -> None:
+        simulated_projects = [
+            SimulatedProjectFactory.build(
+                project_id=project_1_id,
+                value=Decimal(9),
+                missing_demands=Demands(
+                    [Demand.demand_for(Capability.skill("JAVA-MID"), jan_1_time_slot)]
+                ),
+            ),
+            SimulatedProjectFactory.build(
+                project_id=project_2_id,
+                value=Decimal(99),
+                missing_demands=Demands(
+                    [Demand.demand_for(Capability.skill("RUST"), jan_1_time_slot)]
+                ),
+            ),
+        ]
+
+        simulated_availability = SimulatedCapabilitiesFactory.build(
+            num_capabilities=1,
+            capabilities__0__resource_id=staszek_id,
+            capabilities__0__brings=Capability.skill("JAVA-MID"),
+            capabilities__0__time_slot=jan_1_time_slot,
+        )
+
+        unsatisfiable = simulation_facade.unsatisfiable_projects(
+            simulated_projects, simulated_availability
+        )
+
+        assert unsatisfiable == [project_2_id]
+
+    def test_streams_projects_keeping_only_most_valuable_ones(
+        self,
+        staszek_id: UUID,
+        leon_id: UUID,
+        simulation_facade: SimulationFacade,
+        jan_1_time_slot: TimeSlot,
+    ) -> None:
+        def simulated_projects() -> Iterator[SimulatedProject]:
+            for value in range(1, 100):
+                yield SimulatedProjectFactory.build(
+                    value=Decimal(value),
+                    missing_demands=Demands(
+                        [
+                            Demand.demand_for(
+                                Capability.skill("JAVA-MID"), jan_1_time_slot
+                            )
+                        ]
+                    ),
+                )
+
+        simulated_availability = SimulatedCapabilitiesFactory.build(
+            num_capabilities=2,
+            capabilities__0__resource_id=staszek_id,
+            capabilities__0__brings=Capability.skill("JAVA-MID"),
+            capabilities__0__time_slot=jan_1_time_slot,
+            capabilities__1__resource_id=leon_id,
+            capabilities__1__brings=Capability.skill("JAVA-MID"),
+            capabilities__1__time_slot=jan_1_time_slot,
+        )
+
+        result = simulation_facade.what_is_the_optimal_setup_streaming(
+            simulated_projects(), simulated_availability, max_projects=2
+        )
+
+        assert result.profit == 99 + 98
+        assert len(result.chosen_items) == 2
+
+    def test_simulates_projects_with_uncertain_values_and_delays(
+        self,
+        project_1_id: ProjectId,
+        project_2_id: ProjectId,
+        jan_1_time_slot: TimeSlot,
+        staszek_id: UUID,
+        simulation_facade: SimulationFacade,
+    ) -> None:
+        java_on_jan_1 = Demands(
+            [Demand.demand_for(Capability.skill("JAVA-MID"), jan_1_time_slot)]
+        )
+        uncertain_projects = [
+            UncertainProject(
+                project_1_id,
+                Distribution.uniform(100, 200),
+                java_on_jan_1,
+                delay=Distribution.uniform(0, 60),
+            ),
+            UncertainProject(project_2_id, Distribution.fixed(50), java_on_jan_1),
+        ]
+        simulated_availability = SimulatedCapabilitiesFactory.build(
+            num_capabilities=1,
+            capabilities__0__resource_id=staszek_id,
+            capabilities__0__brings=Capability.skill("JAVA-MID"),
+            capabilities__0__time_slot=TimeSlot.create_monthly_time_slot_at_utc(
+                2021, 1
+            ),
+        )
+
+        result = simulation_facade.simulate_under_uncertainty(
+            uncertain_projects, simulated_availability, trials=400, seed=7
+        )
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            in_parallel = simulation_facade.simulate_under_uncertainty(
+                uncertain_projects,
+                simulated_availability,
+                trials=400,
+                seed=7,
+                executor=executor,
+                chunk_size=70,
+            )
+
+        assert in_parallel == result
+        assert result.trials == 400
+        assert 0.4 < result.selection_probability[project_1_id] < 0.6
+        assert result.selection_probability[project_2_id] == pytest.approx(
+            1 - result.selection_probability[project_1_id]
+        )
+        assert result.profit_percentile(0) == 50
+        assert 100 <= result.profit_percentile(90) <= 200
+
+    def test_chooses_capabilities_to_buy_within_budget(
+        self,
+        project_1_id: ProjectId,
+        project_2_id: ProjectId,
+        jan_1_time_slot: TimeSlot,
+        simulation_facade: SimulationFacade,
+    ) -> None:
+        simulated_projects = [
+            SimulatedProjectFactory.build(
+                project_id=project_1_id,
+                value=Decimal(100),
+                missing_demands=Demands(
+                    [
+                        Demand.demand_for(Capability.skill("JAVA"), jan_1_time_slot),
+                        Demand.demand_for(Capability.skill("PYTHON"), jan_1_time_slot),
+                    ]
+                ),
+            ),
+            SimulatedProjectFactory.build(
+                project_id=project_2_id,
+                value=Decimal(50),
+                missing_demands=Demands(
+                    [Demand.demand_for(Capability.skill("RUST"), jan_1_time_slot)]
+                ),
+            ),
+        ]
+
+        def priced(skill: str, price: int) -> AdditionalPricedCapability:
+            return AdditionalPricedCapability(
+                Decimal(price),
+                AvailableResourceCapability.with_capability(
+                    uuid4(), Capability.skill(skill), jan_1_time_slot
+                ),
+            )
+
+        java, python = priced("JAVA", 20), priced("PYTHON", 30)
+        candidates = [priced("RUST", 60), java, priced("JAVA", 200), python]
+
+        plan = simulation_facade.best_capabilities_to_buy(
+            simulated_projects,
+            SimulatedCapabilities.none(),
+            candidates,
+            budget=Decimal(100),
+            max_capabilities=3,
+        )
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            plan_in_parallel = simulation_facade.best_capabilities_to_buy(
+                simulated_projects,
+                SimulatedCapabilities.none(),
+                candidates,
+                budget=Decimal(100),
+                max_capabilities=3,
+                executor=executor,
+            )
+
+        assert plan.capabilities == [java, python]
+        assert plan.net_profit == 50
+        assert plan.total_price == 50
+        assert plan.evaluations > len(candidates)
+        assert plan_in_parallel == plan